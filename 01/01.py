@@ -1,4 +1,7 @@
-import sys
+import io
+import string
+
+from aoc.parallel import sum_lines
 
 digit_strings = {
     **{str(d): d for d in [1, 2, 3, 4, 5, 6, 7, 8, 9]},
@@ -13,7 +16,13 @@ digit_strings = {
     'nine': 9,
 }
 
+
 def line_number(line: str) -> int:
+    digits = [d for d in line if d in string.digits]
+    return int(digits[0] + digits[-1])
+
+
+def line_number_with_words(line: str) -> int:
     first = min(
         (pos, digit, text)
         for text, digit in digit_strings.items()
@@ -26,4 +35,10 @@ def line_number(line: str) -> int:
     )
     return first[1] * 10 + last[1]
 
-print(sum(map(line_number, sys.stdin)))
+
+def part_one(stream: io.TextIOBase):
+    return sum_lines(stream, line_number)
+
+
+def part_two(stream: io.TextIOBase):
+    return sum_lines(stream, line_number_with_words)
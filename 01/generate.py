@@ -0,0 +1,29 @@
+"""
+Calibration documents: lines of junk letters with digits and digit words mixed in.
+Every line has at least one digit so both parts can solve it.
+"""
+import io
+import random
+import string
+
+LINES = 1000
+WORDS = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+
+
+def generate_line(rng: random.Random) -> str:
+    pieces = [rng.choice(string.digits[1:])]
+    for _ in range(rng.randint(2, 12)):
+        kind = rng.random()
+        if kind < 0.2:
+            pieces.append(rng.choice(string.digits[1:]))
+        elif kind < 0.4:
+            pieces.append(rng.choice(WORDS))
+        else:
+            pieces.append(''.join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 5))))
+    rng.shuffle(pieces)
+    return ''.join(pieces)
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    for _ in range(round(LINES * scale)):
+        out.write(generate_line(rng) + '\n')
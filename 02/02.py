@@ -1,11 +1,13 @@
 import dataclasses
 import enum
+import io
 import operator
 import re
-import sys
 from functools import reduce
 from typing import Iterable, List, Dict
 
+from aoc.parallel import sum_lines
+
 
 class Colour(str, enum.Enum):
     RED = 'red'
@@ -13,7 +15,7 @@ class Colour(str, enum.Enum):
     BLUE = 'blue'
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Game:
     number: int
     draws: List[Dict[Colour, int]]
@@ -67,37 +69,27 @@ def power(game) -> int:
     return reduce(operator.mul, counts.values())
 
 
-def part_one():
-    contents = {
-        Colour.RED: 12,
-        Colour.GREEN: 13,
-        Colour.BLUE: 14,
-    }
+contents = {
+    Colour.RED: 12,
+    Colour.GREEN: 13,
+    Colour.BLUE: 14,
+}
 
-    games = list(map(parse_line, sys.stdin))
 
-    result = sum(
-        game.number for game in games
-        if is_possible(game, contents)
-    )
-    print(result)
+def possible_game_number(line: str) -> int:
+    game = parse_line(line)
+    return game.number if is_possible(game, contents) else 0
+
 
+def line_power(line: str) -> int:
+    return power(parse_line(line))
 
-def part_two():
-    games = list(map(parse_line, sys.stdin))
-    result = sum(map(power, games))
-    print(result)
 
+def part_one(stream: io.TextIOBase):
+    result = sum_lines(stream, possible_game_number)
+    return result
 
-if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
 
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+def part_two(stream: io.TextIOBase):
+    result = sum_lines(stream, line_power)
+    return result
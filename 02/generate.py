@@ -0,0 +1,19 @@
+"""
+Cube games: `Game N: ` followed by draws of up to three distinct colours.
+"""
+import io
+import random
+
+GAMES = 100
+COLOURS = ['red', 'green', 'blue']
+
+
+def generate_draw(rng: random.Random) -> str:
+    colours = rng.sample(COLOURS, k=rng.randint(1, 3))
+    return ', '.join(f'{rng.randint(1, 20)} {colour}' for colour in colours)
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    for number in range(1, round(GAMES * scale) + 1):
+        draws = '; '.join(generate_draw(rng) for _ in range(rng.randint(1, 6)))
+        out.write(f'Game {number}: {draws}\n')
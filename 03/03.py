@@ -1,124 +1,117 @@
 import io
 import dataclasses
-import operator
-import sys
-import string
-from functools import reduce
-from typing import Optional, Tuple, List
+import numpy
 
+from aoc.grid import Grid
+from aoc.integers import parse_integers
+from aoc.records import Records
 
-@dataclasses.dataclass
+
+@dataclasses.dataclass(slots=True)
 class Part:
-    symbol: int
+    symbol: str
     x: int
     y: int
+    index: int
 
 
-@dataclasses.dataclass
+class Parts(Records[Part]):
+    record = Part
+
+
+@dataclasses.dataclass(slots=True)
 class Number:
     number: int
     x1: int
     x2: int
     y: int
 
-    def is_adjacent(self, part: Part) -> bool:
-        return (
-            (self.x1 - 1) <= part.x
-            and (self.x2 + 1) >= part.x
-            and (self.y - 1) <= part.y
-            and (self.y + 1) >= part.y
-        )
+
+class Numbers(Records[Number]):
+    record = Number
 
 
 @dataclasses.dataclass
-class peekable:
-    stream: io.TextIOBase
-    _next: Optional[str] = None
-
-    def next(self):
-        if self._next is not None:
-            value = self._next
-            self._next = None
-            return value
-        return self.stream.read(1)
-
-    def peek(self):
-        if self._next is None:
-            self._next = self.stream.read(1)
-        return self._next
-
-    def __bool__(self):
-        return self.peek() != ''
-
-
-def parse_schematic(stream: io.TextIOBase) -> Tuple[List[Number], List[Part]]:
-    x = 0
-    y = 0
-    numbers = []
-    parts = []
-
-    chars = peekable(stream)
-    while chars:
-        char = chars.next()
-        x += 1
-        if char == '\n':
-            x = 0
-            y += 1
-            continue
-        elif char == '.':
-            continue
-        elif char in string.digits:
-            x1 = x
-            digits = char
-            while chars.peek() in string.digits:
-                digits += chars.next()
-                x += 1
-            part_number = Number(
-                number=int(digits),
-                x1=x1,
-                x2=x,
-                y=y
-            )
-            numbers.append(part_number)
-            continue
-        else:
-            part = Part(symbol=char, x=x, y=y)
-            parts.append(part)
-    return numbers, parts
-
-
-def part_one():
-    numbers, parts = parse_schematic(sys.stdin)
-    part_numbers = [
-        number for number in numbers
-        if any(number.is_adjacent(part) for part in parts)
-    ]
-    print(sum(p.number for p in part_numbers))
-
-
-def part_two():
-    numbers, parts = parse_schematic(sys.stdin)
-    result = 0
-    for part in parts:
-        if part.symbol != '*':
-            continue
-        part_numbers = [number for number in numbers if number.is_adjacent(part)]
-        if len(part_numbers) != 2:
-            continue
-        result += reduce(operator.mul, (p.number for p in part_numbers))
-
-    print(result)
-
-
-if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
-
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+class Schematic:
+    grid: Grid
+    numbers: Numbers
+    parts: Parts
+    # Which number covers each cell of the grid by flat index,
+    # as an index in to `numbers`, or -1 for cells without a number
+    number_ids: numpy.ndarray
+
+    def adjacent_numbers(self, parts: Parts) -> numpy.ndarray:
+        """
+        Indices of the numbers touching each part, with one row per part.
+        Each number is in a row once, sorted after any -1s filling the row.
+        """
+        ids = self.number_ids[parts.index[:, None] + numpy.array(self.grid.neighbours8)]
+        ids.sort(axis=1)
+        ids[:, 1:][ids[:, 1:] == ids[:, :-1]] = -1
+        ids.sort(axis=1)
+        return ids
+
+
+def parse_schematic(stream: io.TextIOBase) -> Schematic:
+    grid = Grid.load(stream, border=ord('.'))
+    is_digit = (grid.data >= ord('0')) & (grid.data <= ord('9'))
+    is_part = ~is_digit & (grid.data != ord('.'))
+
+    # The border means numbers always start and stop within a row
+    integers = parse_integers(grid.data, signed=False)
+    is_last = is_digit.copy()
+    is_last[:-1] &= ~is_digit[1:]
+    starts = integers.positions
+    ys, x1s = grid.positions(starts)
+    numbers = Numbers(
+        number=integers.values,
+        x1=x1s,
+        x2=x1s + numpy.flatnonzero(is_last) - starts,
+        y=ys,
+    )
+    # Count the numbers started so far along every cell of each run of digits
+    is_first = numpy.zeros(len(grid.data), dtype=bool)
+    is_first[starts] = True
+    number_ids = numpy.where(is_digit, numpy.cumsum(is_first) - 1, -1)
+
+    indices = numpy.flatnonzero(is_part)
+    ys, xs = grid.positions(indices)
+    parts = Parts(
+        symbol=grid.data[indices].view('S1').astype('U1'),
+        x=xs,
+        y=ys,
+        index=indices,
+    )
+    return Schematic(grid, numbers, parts, number_ids)
+
+
+def sum_part_numbers(schematic: Schematic, ids: numpy.ndarray) -> int:
+    """The sum of every number touching a part, given the numbers touching every part."""
+    part_numbers = numpy.unique(ids[ids >= 0])
+    return int(schematic.numbers.number[part_numbers].sum())
+
+
+def sum_gear_ratios(schematic: Schematic, ids: numpy.ndarray) -> int:
+    """The sum of the gear ratios, given the numbers touching every `*` part."""
+    pairs = ids[numpy.count_nonzero(ids >= 0, axis=1) == 2]
+    numbers = schematic.numbers.number
+    return int(numpy.sum(numbers[pairs[:, -1]] * numbers[pairs[:, -2]]))
+
+
+def part_one(stream: io.TextIOBase):
+    schematic = parse_schematic(stream)
+    return sum_part_numbers(schematic, schematic.adjacent_numbers(schematic.parts))
+
+
+def part_two(stream: io.TextIOBase):
+    schematic = parse_schematic(stream)
+    gears = schematic.parts[schematic.parts.symbol == '*']
+    return sum_gear_ratios(schematic, schematic.adjacent_numbers(gears))
+
+
+def solve_both(stream: io.TextIOBase):
+    # Gears are parts too, so their numbers are rows of the numbers touching every part
+    schematic = parse_schematic(stream)
+    ids = schematic.adjacent_numbers(schematic.parts)
+    is_gear = schematic.parts.symbol == '*'
+    return sum_part_numbers(schematic, ids), sum_gear_ratios(schematic, ids[is_gear])
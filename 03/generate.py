@@ -0,0 +1,32 @@
+"""
+Engine schematics: a square grid of `.` with part numbers and symbols scattered about.
+The grid has `scale` times the cells of a real 140 x 140 schematic.
+"""
+import io
+import math
+import random
+
+SIZE = 140
+SYMBOLS = '*#+$/=%@&-'
+
+
+def generate_row(rng: random.Random, width: int) -> str:
+    cells = []
+    while len(cells) < width:
+        kind = rng.random()
+        if kind < 0.08:
+            number = str(rng.randint(1, 999))
+            cells.extend(number)
+            cells.append('.')
+        elif kind < 0.12:
+            cells.append(rng.choice(SYMBOLS))
+        else:
+            cells.append('.')
+    # A number running off the end of the row is cut short, which is still valid
+    return ''.join(cells[:width])
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    size = max(1, round(SIZE * math.sqrt(scale)))
+    for _ in range(size):
+        out.write(generate_row(rng, size) + '\n')
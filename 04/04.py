@@ -1,20 +1,23 @@
 import dataclasses
 import io
-import re
-import operator
-import sys
-from functools import reduce
-from typing import Optional, Tuple, List, Set
+from typing import Iterator, List
 
+import numpy
 
-@dataclasses.dataclass
+from aoc import streams
+from aoc.grid import find_newline, read_buffer
+from aoc.integers import parse_integers
+from aoc.records import Records
+
+
+@dataclasses.dataclass(slots=True)
 class Card:
     number: int
-    winning_numbers: Set[int]
-    numbers_you_have: Set[int]
+    winning_numbers: List[int]
+    numbers_you_have: List[int]
 
     def matches(self) -> int:
-        return len(self.winning_numbers & self.numbers_you_have)
+        return len(set(self.winning_numbers).intersection(self.numbers_you_have))
 
     def score(self) -> int:
         matches = self.matches()
@@ -23,6 +26,17 @@ class Card:
         return int(2 ** (matches - 1))
 
 
+class Cards(Records[Card]):
+    record = Card
+
+    def matches(self) -> numpy.ndarray:
+        """Matches for every card at once."""
+        return card_matches(self.winning_numbers, self.numbers_you_have)
+
+    def scores(self) -> numpy.ndarray:
+        return match_scores(self.matches())
+
+
 class CopyTracker:
     def __init__(self):
         self.buffer = []
@@ -40,53 +54,78 @@ class CopyTracker:
             else:
                 self.buffer[index] += copies
 
+    def count(self, matches: numpy.ndarray) -> int:
+        """Count the cards, copies included, for each card's matches in turn."""
+        total_cards = 0
+        for card_matches in matches.tolist():
+            count = self.pop()
+            self.add_matches(card_matches, count)
+            total_cards += count
+        return total_cards
+
+
+def parse_card_table(
+    data: numpy.ndarray,
+) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """
+    The card numbers, and the winning numbers and numbers you have
+    as 2-D arrays with one row per card, from whole lines of input bytes.
+    """
+    integers = parse_integers(data, signed=False)
+    if len(integers.values) == 0:
+        empty = numpy.zeros((0, 0), dtype=numpy.int64)
+        return empty[:, 0], empty, empty
+    # Each card has its number, then the winning numbers up to the '|',
+    # then the numbers you have. All cards have as many numbers as the first.
+    bar = data[:find_newline(data)].tobytes().index(b'|')
+    winning_count = int(numpy.searchsorted(integers.positions, bar)) - 1
+    cards = integers.rows()
+    return cards[:, 0], cards[:, 1:1 + winning_count], cards[:, 1 + winning_count:]
+
 
-CARD_RE = re.compile(r'Card +(\d+): ')
+def cards_from_buffer(buffer) -> Cards:
+    numbers, winning, have = parse_card_table(numpy.frombuffer(buffer, dtype=numpy.uint8))
+    return Cards(number=numbers, winning_numbers=winning, numbers_you_have=have)
 
-def parse_card(line: str) -> Card:
-    card_match = CARD_RE.match(line)
-    if card_match is None:
-        raise ValueError(f"Invalid line: {line!r}")
-    card_number = int(card_match[1])
-    line = line[card_match.end():]
-    winning_numbers_string, numbers_you_have_string = line.split('|', 2)
-    winning_numbers = set(map(int, winning_numbers_string.split()))
-    numbers_you_have = set(map(int, numbers_you_have_string.split()))
-    return Card(card_number, winning_numbers, numbers_you_have)
 
+def parse_cards(stream: io.TextIOBase) -> Cards:
+    return cards_from_buffer(read_buffer(stream))
 
-def parse_cards(stream: io.TextIOBase):
-    for line in stream:
-        yield parse_card(line.rstrip('\n'))
 
+def card_blocks(stream: io.TextIOBase) -> Iterator[Cards]:
+    """The cards a block of lines at a time, so pipes can be solved as they are read."""
+    for buffer in streams.buffers(stream):
+        yield cards_from_buffer(buffer)
 
-def part_one():
-    cards = parse_cards(sys.stdin)
-    result = sum(card.score() for card in cards)
-    print(result)
+
+def match_scores(matches: numpy.ndarray) -> numpy.ndarray:
+    return numpy.where(matches > 0, 1 << numpy.maximum(matches - 1, 0), 0)
+
+
+def card_matches(winning: numpy.ndarray, have: numpy.ndarray) -> numpy.ndarray:
+    """Matches for every card at once."""
+    # Numbers are unique within each list,
+    # so after sorting both lists together a match is a repeated number
+    numbers = numpy.sort(numpy.concatenate([winning, have], axis=1), axis=1)
+    return numpy.count_nonzero(numbers[:, 1:] == numbers[:, :-1], axis=1)
+
+
+def part_one(stream: io.TextIOBase):
+    return sum(int(cards.scores().sum()) for cards in card_blocks(stream))
+
+
+def part_two(stream: io.TextIOBase):
+    copies = CopyTracker()
+    # Copies only ever carry forwards, so each block can be counted as it arrives
+    return sum(copies.count(cards.matches()) for cards in card_blocks(stream))
 
 
-def part_two():
-    cards = parse_cards(sys.stdin)
+def solve_both(stream: io.TextIOBase):
+    # Both parts start from the matches on every card
     copies = CopyTracker()
-    total_cards = 0
-    for card in cards:
-        count = copies.pop()
-        matches = card.matches()
-        copies.add_matches(matches, count)
-        total_cards += count
-    print(total_cards)
-
-
-if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
-
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+    total_score = total_cards = 0
+    for cards in card_blocks(stream):
+        matches = cards.matches()
+        total_score += int(match_scores(matches).sum())
+        total_cards += copies.count(matches)
+    return total_score, total_cards
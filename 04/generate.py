@@ -0,0 +1,29 @@
+"""
+Scratchcards with ten winning numbers and twenty-five numbers you have.
+Cards never win copies of cards past the end of the table.
+"""
+import io
+import random
+
+CARDS = 202
+WINNING = 10
+HAVE = 25
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    cards = round(CARDS * scale)
+    width = len(str(cards))
+    for number in range(1, cards + 1):
+        # Most cards win little, so the copy counts stay within reason
+        matches = min(int(rng.expovariate(0.5)), WINNING, cards - number)
+        numbers = rng.sample(range(1, 100), k=WINNING + HAVE - matches)
+        winning = numbers[:WINNING]
+        have = winning[:matches] + numbers[WINNING:]
+        rng.shuffle(have)
+        out.write(
+            f'Card {number:>{width}}: '
+            + ' '.join(f'{n:2d}' for n in winning)
+            + ' | '
+            + ' '.join(f'{n:2d}' for n in have)
+            + '\n'
+        )
@@ -2,15 +2,23 @@ import dataclasses
 import io
 import itertools
 import logging
-import logging.config
 import re
-import sys
-from typing import Tuple, List, Dict
+from functools import reduce
+from typing import Iterable, Tuple, List, Dict
+
+import numpy
+
+from aoc import trace
+from aoc.cache import cached_parse
+from aoc.grid import read_buffer
+from aoc.integers import parse_integers
+from aoc.variants import variant
 
 logger = logging.getLogger(__name__)
+TRACING = trace.active(__name__)
 
 
-@dataclasses.dataclass(order=True)
+@dataclasses.dataclass(order=True, slots=True)
 class Range:
     start: int
     stop: int
@@ -98,6 +106,19 @@ class RangeMap:
         self.name = name
         self.ranges = ranges
 
+    def __getitem__(self, value: int) -> int:
+        for source, dest in self.ranges:
+            if value in source:
+                return source.convert(dest, value)
+        return value
+
+    def invert(self, value: int) -> int:
+        """Map a value from a destination range back to its source."""
+        for source, dest in self.ranges:
+            if value in dest:
+                return dest.convert(source, value)
+        return value
+
     def __str__(self):
         maps = ''.join(f'\n    ({source} -> {dest})' for source, dest in self.ranges)
         return f'{self.name}: [{maps}]'
@@ -106,29 +127,33 @@ class RangeMap:
         return f'<RangeMap {self}>'
 
 
-SEEDS_RE = re.compile('seeds: ')
-MAP_NAME_RE = re.compile(r'(\w+)-to-(\w+) map:')
+MAP_NAME_RE = re.compile(rb'^(\w+)-to-(\w+) map:', re.MULTILINE)
 
 
+@cached_parse(version=2)
 def parse_almanac(stream: io.TextIOBase) -> Tuple[List[int], Dict[str, RangeMap]]:
-    seeds_line = stream.readline()
-    match = SEEDS_RE.match(seeds_line)
-    seeds = list(map(int, seeds_line[match.end():].split()))
-    assert stream.readline() == '\n'
+    buffer = read_buffer(stream)
+    data = numpy.frombuffer(buffer, dtype=numpy.uint8)
+    integers = parse_integers(data, signed=False)
 
-    range_maps = {}
-    while (map_name_line := stream.readline()):
-        map_name_match = MAP_NAME_RE.match(map_name_line)
-        map_name = (map_name_match[1], map_name_match[2])
-        ranges = []
+    # The seeds come before the first map,
+    # and each map has every integer up to the next map
+    headers = list(MAP_NAME_RE.finditer(buffer))
+    bounds = numpy.searchsorted(
+        integers.positions, [match.start() for match in headers] + [len(data)])
+    seeds = integers.values[:bounds[0]].tolist()
 
-        while (range_line := stream.readline()) not in {'', '\n'}:
-            dest_start, source_start, length = map(int, range_line.split())
-            ranges.append((
+    range_maps = {}
+    for header, start, stop in zip(headers, bounds[:-1], bounds[1:]):
+        map_name = (header[1].decode(), header[2].decode())
+        ranges = [
+            (
                 Range.from_start_length(source_start, length),
                 Range.from_start_length(dest_start, length),
-            ))
-
+            )
+            for dest_start, source_start, length
+            in integers.values[start:stop].reshape(-1, 3).tolist()
+        ]
         range_maps[map_name] = RangeMap(f'{map_name[0]}-to-{map_name[1]}', ranges)
 
     return seeds, range_maps
@@ -152,7 +177,14 @@ transitions = [
 ]
 
 
-def part_two():
+def seed_ranges(seeds: List[int]) -> List[Range]:
+    return [
+        Range.from_start_length(start, length)
+        for start, length in grouper(seeds, 2)
+    ]
+
+
+def lowest_location(value_ranges: Iterable[Range], maps: Dict[str, RangeMap]) -> int:
     """
     Start with the seeds as the current value ranges.
 
@@ -165,19 +197,14 @@ def part_two():
     The value ranges are now the location ranges for all seeds.
     Find the minimum starting value for the value ranges for the answer.
     """
-    seeds, maps = parse_almanac(sys.stdin)
-
-    # Start with all seed ranges
-    value_ranges = [
-        Range.from_start_length(start, length)
-        for start, length in grouper(seeds, 2)
-    ]
-    logger.info("Seed ranges: %s", ', '.join(map(str, value_ranges)))
+    value_ranges = list(value_ranges)
 
     for transition in pairwise(transitions):
         range_map = maps[transition]
-        logger.info("Processing transition %s", range_map.name)
-        logger.info("%s", range_map)
+        if TRACING:
+            trace.event(
+                'lowest_location.transition', "%s with %d value ranges",
+                range_map.name, len(value_ranges))
         # For each range map, map overlaps with the current unmapped value
         # ranges to destination ranges.
         # Keep separate records of unmapped and remapped ranges to avoid
@@ -187,6 +214,10 @@ def part_two():
             next_values = []
             for r in value_ranges:
                 unmapped_r, remapped_r = r.remap(source, dest)
+                if TRACING:
+                    trace.count('lowest_location.remaps')
+                    if len(unmapped_r) + len(remapped_r) > 1:
+                        trace.count('lowest_location.splits')
                 next_values.extend(unmapped_r)
                 remapped_ranges.extend(remapped_r)
             value_ranges = next_values
@@ -198,8 +229,63 @@ def part_two():
     # The ranges are now all location ranges. Find the minimum start value to
     # find the closest location
     min_value = min(value_range.start for value_range in value_ranges)
-    print(min_value)
+    return min_value
+
+
+@variant('one', 'lookup')
+def part_one(stream: io.TextIOBase):
+    seeds, maps = parse_almanac(stream)
+    final_values = []
+    for value in seeds:
+        for transition in pairwise(transitions):
+            range_map = maps[transition]
+            value = range_map[value]
+        final_values.append(value)
+
+    return min(final_values)
+
+
+@variant('one', 'range-remap')
+def part_one_range_remap(stream: io.TextIOBase):
+    seeds, maps = parse_almanac(stream)
+    return lowest_location(
+        [Range.from_start_length(seed, 1) for seed in seeds], maps)
+
 
+@variant('two', 'range-remap')
+def part_two(stream: io.TextIOBase):
+    seeds, maps = parse_almanac(stream)
+    return lowest_location(seed_ranges(seeds), maps)
 
-logging.basicConfig(level=logging.WARNING)
-part_two()
+
+@variant('two', 'brute-force')
+def part_two_brute_force(stream: io.TextIOBase):
+    """
+    Look up the location of every seed in every seed range.
+    Only feasible for the example input.
+    """
+    seeds, maps = parse_almanac(stream)
+    range_maps = [maps[transition] for transition in pairwise(transitions)]
+    return min(
+        reduce(lambda value, range_map: range_map[value], range_maps, seed)
+        for seed_range in seed_ranges(seeds)
+        for seed in range(seed_range.start, seed_range.stop + 1)
+    )
+
+
+@variant('two', 'reverse-search')
+def part_two_reverse_search(stream: io.TextIOBase):
+    """
+    Count up from location 0, mapping each location back to a seed,
+    until one of them lands in a seed range.
+    Only feasible when the answer is small.
+    """
+    seeds, maps = parse_almanac(stream)
+    ranges = seed_ranges(seeds)
+    range_maps = [maps[transition] for transition in pairwise(transitions)][::-1]
+    for location in itertools.count():
+        if location % 1_000_000 == 0:
+            logger.info("Trying location %d", location)
+        seed = reduce(lambda value, range_map: range_map.invert(value), range_maps, location)
+        if any(seed in seed_range for seed_range in ranges):
+            return location
@@ -0,0 +1,51 @@
+"""
+Almanacs with seven maps, each a shuffled partition of the 32 bit number line.
+Source ranges never overlap within a map, and neither do destination ranges.
+Some pieces are left out of each map so they pass through unchanged.
+"""
+import io
+import random
+
+SEED_PAIRS = 10
+RANGES_PER_MAP = 35
+LIMIT = 2 ** 32
+
+transitions = [
+    'seed', 'soil', 'fertilizer', 'water', 'light',
+    'temperature', 'humidity', 'location',
+]
+
+
+def generate_map(rng: random.Random, count: int) -> list[tuple[int, int, int]]:
+    cuts = sorted(rng.sample(range(1, LIMIT), k=count * 2))
+    pieces = [
+        (start, stop - start)
+        for start, stop in zip([0] + cuts, cuts + [LIMIT])
+    ]
+    order = list(range(len(pieces)))
+    rng.shuffle(order)
+    dest_starts = {}
+    dest = 0
+    for index in order:
+        dest_starts[index] = dest
+        dest += pieces[index][1]
+
+    mapped = rng.sample(range(len(pieces)), k=count)
+    return [
+        (dest_starts[index], pieces[index][0], pieces[index][1])
+        for index in mapped
+    ]
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    seeds = []
+    for _ in range(max(1, round(SEED_PAIRS * scale))):
+        start = rng.randrange(LIMIT)
+        seeds.extend([start, rng.randint(1, min(LIMIT - start, 2 ** 28))])
+    out.write('seeds: ' + ' '.join(map(str, seeds)) + '\n')
+
+    count = max(1, round(RANGES_PER_MAP * scale))
+    for source, dest in zip(transitions, transitions[1:]):
+        out.write(f'\n{source}-to-{dest} map:\n')
+        for dest_start, source_start, length in generate_map(rng, count):
+            out.write(f'{dest_start} {source_start} {length}\n')
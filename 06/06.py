@@ -1,24 +1,18 @@
 import logging
-import dataclasses
 import io
 import math
-import re
 import operator
-import sys
 from functools import reduce
-from typing import Optional, Tuple, List, Set
+from typing import Tuple, List
+
+from aoc.integers import load_integers
 
 logger = logging.getLogger(__name__)
 
 
 def parse_races_one(stream: io.TextIOBase) -> List[Tuple[int, int]]:
-    time_line = stream.readline()
-    assert time_line.startswith('Time: ')
-    times = list(map(int, time_line[5:].split()))
-    distance_line = stream.readline()
-    assert distance_line.startswith('Distance: ')
-    distances = list(map(int, distance_line[9:].split()))
-    assert len(times) == len(distances)
+    # One line of times, then one line of distances
+    times, distances = load_integers(stream, signed=False).rows().tolist()
     return list(zip(times, distances))
 
 
@@ -45,26 +39,12 @@ def calculate_options(race):
     return options
 
 
-def part_one():
-    races = parse_races_one(sys.stdin)
+def part_one(stream: io.TextIOBase):
+    races = parse_races_one(stream)
     options = [calculate_options(race) for race in races]
-    print(reduce(operator.mul, options, 1))
-
-
-def part_two():
-    race = parse_races_two(sys.stdin)
-    print(calculate_options(race))
-
+    return reduce(operator.mul, options, 1)
 
-if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
 
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+def part_two(stream: io.TextIOBase):
+    race = parse_races_two(stream)
+    return calculate_options(race)
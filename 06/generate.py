@@ -0,0 +1,21 @@
+"""
+Boat races that can always be won.
+Part two joins every number together and solves it with floats,
+so its answer is only exact for a handful of races.
+"""
+import io
+import random
+
+RACES = 4
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    times = []
+    distances = []
+    for _ in range(max(1, round(RACES * scale))):
+        time = rng.randint(7, 99)
+        # The best possible distance is (time / 2) ** 2; the record is below that.
+        distances.append(rng.randint(1, time * time // 4 - 1))
+        times.append(time)
+    out.write('Time:     ' + ' '.join(f'{t:4d}' for t in times) + '\n')
+    out.write('Distance: ' + ' '.join(f'{d:4d}' for d in distances) + '\n')
@@ -3,12 +3,13 @@ import collections
 import enum
 import dataclasses
 import io
-import math
-import re
-import operator
-import sys
-from functools import reduce, cached_property
-from typing import Optional, Tuple, List, Set, Any
+from typing import Tuple, Any
+
+import numpy
+
+from aoc.grid import read_buffer
+from aoc.integers import NEWLINE, parse_integers
+from aoc.records import Records
 
 logger = logging.getLogger(__name__)
 
@@ -22,72 +23,178 @@ class HandType(enum.IntEnum):
     four_of_a_kind = 6
     five_of_a_kind = 7
 
-
-@dataclasses.dataclass
-class Hand:
-    cards: str
-    bid: int
-
-    @cached_property
-    def hand_type(self) -> HandType:
-        counts = sorted(collections.Counter(self.cards).values(), reverse=True)
+    @classmethod
+    def from_counts(cls, counts: collections.Counter) -> "HandType":
+        counts = sorted(counts.values(), reverse=True)
         if counts == [5]:
-            return HandType.five_of_a_kind
+            return cls.five_of_a_kind
         if counts == [4, 1]:
-            return HandType.four_of_a_kind
+            return cls.four_of_a_kind
         if counts == [3, 2]:
-            return HandType.full_house
+            return cls.full_house
         if counts == [3, 1, 1]:
-            return HandType.three_of_a_kind
+            return cls.three_of_a_kind
         if counts == [2, 2, 1]:
-            return HandType.two_pair
+            return cls.two_pair
         if counts == [2, 1, 1, 1]:
-            return HandType.one_pair
-        return HandType.high_card
+            return cls.one_pair
+        return cls.high_card
 
-    @cached_property
-    def card_ranks(self) -> Tuple[int, int, int, int, int]:
-        return tuple(card_order[c] for c in self.cards)
 
-    def __lt__(self, other: Any) -> bool:
-        if not isinstance(other, Hand):
-            return NotImplemented
-        return (self.hand_type, self.card_ranks) < (other.hand_type, other.card_ranks)
+# Hand types by the counts of the two most common cards
+hand_types = numpy.zeros((6, 6), dtype=numpy.int64)
+for first in range(1, 6):
+    for second in range(0 if first == 5 else 1, min(first, 5 - first) + 1):
+        counts = [count for count in [first, second] + [1] * (5 - first - second) if count]
+        hand_types[first, second] = HandType.from_counts(collections.Counter(dict(enumerate(counts))))
 
 
-card_order = {
-    card: rank for rank, card in enumerate(reversed('AKQJT98765432'))
-}
-
-
-def parse_hands(stream: io.TextIOBase) -> List[Hand]:
-    hands = []
-    for line in stream:
-        cards, bid = line.split()
-        hands.append(Hand(cards, int(bid)))
-    return hands
+@dataclasses.dataclass(slots=True)
+class Hand:
+    cards: str
+    bid: int
 
+    card_order = {
+        card: rank for rank, card in enumerate(reversed('AKQJT98765432'))
+    }
 
+    @property
+    def hand_type(self) -> HandType:
+        return HandType.from_counts(collections.Counter(self.cards))
 
-def part_one():
-    hands = parse_hands(sys.stdin)
-    sorted_hands = sorted(hands)
-    print(sum(i * hand.bid for i, hand in enumerate(sorted_hands, start=1)))
+    @property
+    def card_ranks(self) -> Tuple[int, int, int, int, int]:
+        return tuple(self.card_order[c] for c in self.cards)
 
+    def __lt__(self, other: Any) -> bool:
+        if not isinstance(other, Hand):
+            return NotImplemented
+        return (self.hand_type, self.card_ranks) < (other.hand_type, other.card_ranks)
 
-def part_two():
-    pass
 
+@dataclasses.dataclass(slots=True)
+class JokerHand(Hand):
+    card_order = {
+        card: rank for rank, card in enumerate(reversed('AKQT98765432J'))
+    }
 
-if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+    @property
+    def hand_type(self) -> HandType:
+        # Count common cards
+        counts = collections.Counter(self.cards)
+        if 'J' in counts and counts.keys():
+            # If there is a joker in the deck, remove it and put its count
+            # towards the highest card total. Hands are ordered such that
+            # having more of one card is always the best option, so adding
+            # jokers to the highest remaining card total will always give the
+            # best hand.
+            total_j = counts.pop('J')
+            if not counts:
+                # ... except if the hand was five jokers, at which point
+                # `counts` is now empty.
+                counts['J'] = total_j
+            else:
+                max_card = max(counts.items(), key=lambda x: x[1])[0]
+                counts[max_card] += total_j
+
+        return HandType.from_counts(counts)
+
+
+class Hands(Records[Hand]):
+    record = Hand
+
+    def card_ranks(self) -> numpy.ndarray:
+        ranks = numpy.zeros(256, dtype=numpy.int64)
+        for card, rank in self.record.card_order.items():
+            ranks[ord(card)] = rank
+        # Each character of a numpy string is a 32-bit code point
+        return ranks[self.cards.view(numpy.uint32).reshape(-1, 5)]
+
+    def card_counts(self, ranks: numpy.ndarray) -> numpy.ndarray:
+        """How many of each card rank are in each hand."""
+        bins = ranks + 13 * numpy.arange(len(ranks))[:, None]
+        return numpy.bincount(bins.ravel(), minlength=13 * len(ranks)).reshape(-1, 13)
+
+    def top_counts(self, counts: numpy.ndarray) -> numpy.ndarray:
+        """How many of the two most common cards are in each hand."""
+        return numpy.sort(counts, axis=1)[:, :-3:-1]
+
+    def sort_keys(self) -> numpy.ndarray:
+        """A number for every hand that sorts like the hands do."""
+        ranks = self.card_ranks()
+        return sort_keys(ranks, self.top_counts(self.card_counts(ranks)))
+
+
+class JokerHands(Hands):
+    record = JokerHand
+
+    def top_counts(self, counts: numpy.ndarray) -> numpy.ndarray:
+        # Jokers rank lowest, and always join the most common other card
+        jokers = counts[:, 0].copy()
+        counts[:, 0] = 0
+        top = super().top_counts(counts)
+        top[:, 0] += jokers
+        return top
+
+
+def sort_keys(ranks: numpy.ndarray, top: numpy.ndarray) -> numpy.ndarray:
+    """Hand types from the top two counts, then the card ranks in order, as one number."""
+    keys = hand_types[top[:, 0], top[:, 1]]
+    for column in range(5):
+        keys = keys * 13 + ranks[:, column]
+    return keys
+
+
+def parse_hands(stream: io.TextIOBase, hands_class: type[Hands] = Hands) -> Hands:
+    data = numpy.frombuffer(read_buffer(stream), dtype=numpy.uint8)
+    line_starts = numpy.concatenate([[0], numpy.flatnonzero(data == NEWLINE) + 1])
+    line_starts = line_starts[line_starts < len(data)]
+    cards = data[line_starts[:, None] + numpy.arange(5)]
+    # Cards can be digits too, but the bid is always last on the line
+    integers = parse_integers(data, signed=False)
+    bids = integers.values[integers.line_starts[1:] - 1]
+    return hands_class(cards=cards.astype(numpy.uint32).view('U5').ravel(), bid=bids)
+
+
+def winnings(bids: numpy.ndarray, keys: numpy.ndarray) -> int:
+    order = numpy.argsort(keys, kind='stable')
+    return int(numpy.sum(numpy.arange(1, len(bids) + 1) * bids[order]))
+
+
+def total_winnings(hands: Hands) -> int:
+    return winnings(hands.bid, hands.sort_keys())
+
+
+def part_one(stream: io.TextIOBase):
+    hands = parse_hands(stream)
+    return total_winnings(hands)
+
+
+def part_two(stream: io.TextIOBase):
+    hands = parse_hands(stream, JokerHands)
+    return total_winnings(hands)
+
+
+def solve_both(stream: io.TextIOBase):
+    """
+    The same hands and bids, only scored differently.
+    Jokers only move J to the lowest rank and add its count to the most common card,
+    so the card ranks and counts are worked out once and adjusted for jokers.
+    """
+    hands = parse_hands(stream)
+    ranks = hands.card_ranks()
+    counts = hands.card_counts(ranks)
+    top = hands.top_counts(counts)
+
+    joker = Hand.card_order['J']
+    # Every card below J moves up one to make room for J at the bottom
+    joker_ranks = numpy.where(ranks == joker, 0, ranks + (ranks < joker))
+    jokers = counts[:, joker].copy()
+    counts[:, joker] = 0
+    joker_top = hands.top_counts(counts)
+    joker_top[:, 0] += jokers
 
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+    return (
+        winnings(hands.bid, sort_keys(ranks, top)),
+        winnings(hands.bid, sort_keys(joker_ranks, joker_top)),
+    )
@@ -0,0 +1,16 @@
+"""
+Camel Cards hands with bids.
+"""
+import io
+import random
+
+HANDS = 1000
+CARDS = 'AKQJT98765432'
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    for _ in range(round(HANDS * scale)):
+        # Draw from a few favoured cards so pairs and better hands turn up
+        favoured = rng.sample(CARDS, k=rng.randint(1, 5))
+        hand = ''.join(rng.choice(favoured) for _ in range(5))
+        out.write(f'{hand} {rng.randint(1, 1000)}\n')
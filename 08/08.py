@@ -3,8 +3,9 @@ import itertools
 import math
 import io
 import re
-import sys
-from typing import Tuple, List, Dict, Iterable
+
+from aoc.cycles import find_cycle
+from aoc.kernel import kernel
 
 logger = logging.getLogger(__name__)
 
@@ -31,51 +32,117 @@ def parse_map(
     return turns, nodes
 
 
-def navigate(
-    start: str,
-    turns: list[int],
-    nodes: dict[str, tuple[str, str]]
-) -> Iterable[str]:
+def steps_to_node(
+    start: str, target: str,
+    turns: list[int], nodes: dict[str, tuple[str, str]],
+) -> int:
     node = start
-    for turn in itertools.cycle(turns):
+    for steps, turn in enumerate(itertools.cycle(turns), start=1):
         node = nodes[node][turn]
-        yield node
-
+        if node == target:
+            return steps
+
+
+def node_arrays(
+    start: str, target: str,
+    turns: list[int], nodes: dict[str, tuple[str, str]],
+) -> tuple:
+    """
+    Number every node, and find the numbers of the nodes to its left and right.
+    Only the kernel needs numpy, so only import it here.
+    """
+    import numpy
+    ids = {node: index for index, node in enumerate(nodes)}
+    lefts = numpy.array([ids[left] for left, _ in nodes.values()], dtype=numpy.int64)
+    rights = numpy.array([ids[right] for _, right in nodes.values()], dtype=numpy.int64)
+    return ids[start], ids[target], numpy.array(turns, dtype=numpy.int64), lefts, rights
+
+
+@kernel(python=steps_to_node, prepare=node_arrays)
+def steps_to(start, target, turns, lefts, rights) -> int:
+    """Steps taken to get from the start node to the target node, following the turns."""
+    node = start
+    steps = 0
+    while True:
+        node = rights[node] if turns[steps % len(turns)] else lefts[node]
+        steps += 1
+        if node == target:
+            return steps
+
+
+def part_one(stream: io.TextIOBase):
+    turns, nodes = parse_map(stream)
+    return int(steps_to('AAA', 'ZZZ', turns, nodes))
+
+
+def crt(a1: int, m1: int, a2: int, m2: int) -> tuple[int, int] | None:
+    """
+    Combine `x = a1 (mod m1)` and `x = a2 (mod m2)` in to one congruence `x = a (mod m)`,
+    or None if there is no solution. The moduli need not be coprime.
+    """
+    gcd = math.gcd(m1, m2)
+    if (a2 - a1) % gcd:
+        return None
+    lcm = m1 // gcd * m2
+    k = (a2 - a1) // gcd * pow(m1 // gcd, -1, m2 // gcd) % (m2 // gcd)
+    return (a1 + m1 * k) % lcm, lcm
+
+
+def ghosts_meet(turns: list[int], nodes: dict[str, tuple[str, str]]) -> int:
+    """
+    Each ghost walks through (node, turn) states, which must eventually cycle.
+    Once in its cycle a ghost is on an end node at a fixed set of steps
+    modulo its cycle length.
+    Combine those congruences for every ghost to find the first step
+    where every ghost is on an end node at once.
+    """
+    starts = [node for node in nodes.keys() if node.endswith('A')]
+    ends = {node for node in nodes.keys() if node.endswith('Z')}
 
-def part_one():
-    turns, nodes = parse_map(sys.stdin)
-    step, node = next(
-        (step, node)
-        for step, node in enumerate(navigate('AAA', turns, nodes), start=1)
-        if node == 'ZZZ'
+    def step(state: tuple[str, int]) -> tuple[str, int]:
+        node, turn = state
+        return nodes[node][turns[turn]], (turn + 1) % len(turns)
+
+    cycles = [find_cycle((start, 0), step) for start in starts]
+    settled = max(cycle.start for cycle in cycles)
+
+    # Ghosts could all meet before the last one has settled in to its cycle
+    states = [(start, 0) for start in starts]
+    for steps in range(1, settled):
+        states = list(map(step, states))
+        if all(node in ends for node, _ in states):
+            return steps
+
+    # Every step in each cycle where the ghost is on an end node
+    solutions = [(0, 1)]
+    for cycle in cycles:
+        logger.info("Cycle of length %d from step %d", cycle.length, cycle.start)
+        state = cycle.state
+        end_steps = []
+        for offset in range(cycle.length):
+            if state[0] in ends:
+                end_steps.append(cycle.start + offset)
+            state = step(state)
+        solutions = [
+            combined
+            for a, m in solutions
+            for end_step in end_steps
+            if (combined := crt(a, m, end_step, cycle.length)) is not None
+        ]
+
+    # Find the earliest solution at or after the point all ghosts are in their cycles
+    return min(
+        a if a >= settled else a + -(-(settled - a) // m) * m
+        for a, m in solutions
     )
-    print(step)
 
 
-def part_two():
-    turns, nodes = parse_map(sys.stdin)
-    starts = [node for node in nodes.keys() if node.endswith('A')]
-    ends = {node for node in nodes.keys() if node.endswith('Z')}
-    cycle_lengths = []
-    for start in starts:
-        steps = next(
-            step for step, node in enumerate(navigate(start, turns, nodes), start=1)
-            if node in ends and step % len(turns) == 0
-        )
-        cycle_lengths.append(steps // len(turns))
-
-    print(math.lcm(*cycle_lengths) * len(turns))
-
-
-if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
-
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+def part_two(stream: io.TextIOBase):
+    turns, nodes = parse_map(stream)
+    return ghosts_meet(turns, nodes)
+
+
+def solve_both(stream: io.TextIOBase):
+    # Parsing the map is most of part one
+    turns, nodes = parse_map(stream)
+    return int(steps_to('AAA', 'ZZZ', turns, nodes)), ghosts_meet(turns, nodes)
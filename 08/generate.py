@@ -0,0 +1,66 @@
+"""
+Desert maps with one ghost path per start node.
+
+Each path visits its own nodes in a fixed order and loops back after reaching
+its end node, a whole number of passes through the turns.
+The other branch of each node points at some node on the same path,
+but is never taken.
+Ghost zero walks from `AAA` to `ZZZ` for part one.
+"""
+import io
+import random
+import string
+
+NODES = 700
+GHOSTS = 6
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+CHARACTERS = string.ascii_uppercase + string.digits
+# Only start nodes end in 'A' and only end nodes end in 'Z'
+LAST_CHARACTERS = CHARACTERS.replace('A', '').replace('Z', '')
+
+
+def node_names(rng: random.Random, count: int) -> list[str]:
+    length = 3
+    while len(CHARACTERS) ** (length - 1) * len(LAST_CHARACTERS) < count * 4:
+        length += 1
+    seen = set()
+    names = []
+    while len(names) < count:
+        name = ''.join(rng.choices(CHARACTERS, k=length - 1)) + rng.choice(LAST_CHARACTERS)
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    cycles = rng.sample(PRIMES, k=GHOSTS)
+    turn_count = max(1, round(NODES * scale / sum(cycles)))
+    turns = rng.choices([0, 1], k=turn_count)
+
+    path_lengths = [cycle * turn_count for cycle in cycles]
+    names = iter(node_names(rng, sum(path_lengths) - GHOSTS))
+    prefixes = iter(node_names(rng, GHOSTS - 1))
+
+    nodes = {}
+    for ghost, length in enumerate(path_lengths):
+        if ghost == 0:
+            start, end = 'AAA', 'ZZZ'
+        else:
+            prefix = next(prefixes)
+            start, end = prefix + 'A', prefix + 'Z'
+        # Positions 1 through `length` on this path, reached on that step
+        path = [next(names) for _ in range(length - 1)] + [end]
+        for position, node in enumerate([start] + path):
+            following = path[position % length]
+            decoy = rng.choice(path)
+            branches = [decoy, decoy]
+            branches[turns[position % turn_count]] = following
+            nodes[node] = tuple(branches)
+
+    out.write(''.join('LR'[turn] for turn in turns) + '\n\n')
+    order = list(nodes)
+    rng.shuffle(order)
+    for node in order:
+        left, right = nodes[node]
+        out.write(f'{node} = ({left}, {right})\n')
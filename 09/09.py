@@ -1,64 +1,69 @@
 import logging
-import itertools
-import dataclasses
 import io
-import math
-import re
-import operator
+from typing import Iterator
+
 import numpy
-import sys
-from functools import reduce
-from typing import Optional, Tuple, List, Set, Iterable
+
+from aoc import streams
+from aoc.integers import load_integers, parse_integers
 
 logger = logging.getLogger(__name__)
 
 
-def parse_report(stream: io.TextIOBase) -> Iterable[list[int]]:
-    for line in stream:
-        yield list(map(int, line.split()))
-
-
-def predict_next(line: list[int]) -> int:
-    diff_stack = [numpy.array(line)]
-    while True:
-        line = diff_stack[0]
-        differences = line[1:] - line[:-1]
-        if numpy.all(differences == 0):
-            break
-        diff_stack.insert(0, differences)
-    value = 0
-    for line in diff_stack:
-        value = line[-1] + value
-    return value
-
-
-def part_one():
-    report = parse_report(sys.stdin)
-    next_values = []
-    for line in report:
-        next_value = predict_next(line)
-        next_values.append(next_value)
-    print(sum(next_values))
-
-
-def part_two():
-    report = parse_report(sys.stdin)
-    next_values = []
-    for line in report:
-        next_value = predict_next(line[::-1])
-        next_values.append(next_value)
-    print(sum(next_values))
-
-
-if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
-
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+def parse_report(stream: io.TextIOBase) -> list[numpy.ndarray]:
+    """The report with one row per line, in one array for each length of line."""
+    return load_integers(stream).row_groups()
+
+
+def report_blocks(stream: io.TextIOBase) -> Iterator[numpy.ndarray]:
+    """
+    The report a block of lines at a time,
+    split up further wherever lines differ in length.
+    Every line is extrapolated on its own,
+    so pipes can be solved as they are read.
+    """
+    for buffer in streams.buffers(stream):
+        yield from parse_integers(numpy.frombuffer(buffer, dtype=numpy.uint8)).row_groups()
+
+
+def extrapolate(report: numpy.ndarray) -> int:
+    """The sum of the next value of every line, working on all lines at once."""
+    total = 0
+    while report.size and report.any():
+        total += int(report[:, -1].sum())
+        report = numpy.diff(report, axis=1)
+    return total
+
+
+def part_one(stream: io.TextIOBase):
+    return sum(extrapolate(report) for report in report_blocks(stream))
+
+
+def part_two(stream: io.TextIOBase):
+    return sum(extrapolate(report[:, ::-1]) for report in report_blocks(stream))
+
+
+def extrapolate_both(report: numpy.ndarray) -> tuple[int, int]:
+    """
+    The sums of the next and previous values of every line.
+    Each previous value is the first value less the previous difference,
+    so the first values of each row of differences add up with alternating signs.
+    """
+    next_total = previous_total = 0
+    sign = 1
+    while report.size and report.any():
+        next_total += int(report[:, -1].sum())
+        previous_total += sign * int(report[:, 0].sum())
+        sign = -sign
+        report = numpy.diff(report, axis=1)
+    return next_total, previous_total
+
+
+def solve_both(stream: io.TextIOBase):
+    # Both parts walk the same rows of differences, from opposite ends
+    next_total = previous_total = 0
+    for report in report_blocks(stream):
+        next_values, previous_values = extrapolate_both(report)
+        next_total += next_values
+        previous_total += previous_values
+    return next_total, previous_total
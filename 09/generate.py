@@ -0,0 +1,24 @@
+"""
+OASIS reports: each line is a polynomial with small integer coefficients
+sampled at consecutive points, so repeated differences always reach zero.
+"""
+import io
+import random
+
+LINES = 200
+VALUES = 21
+MAX_DEGREE = 6
+
+
+def generate_line(rng: random.Random) -> list[int]:
+    coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(0, MAX_DEGREE) + 1)]
+    offset = rng.randint(-10, 10)
+    return [
+        sum(c * (x + offset) ** power for power, c in enumerate(coefficients))
+        for x in range(VALUES)
+    ]
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    for _ in range(round(LINES * scale)):
+        out.write(' '.join(map(str, generate_line(rng))) + '\n')
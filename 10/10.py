@@ -1,26 +1,31 @@
+import array
 import logging
 import io
-import itertools
 import enum
-import sys
-import numpy.typing
+import numpy
 from functools import cached_property
 
+from aoc.graph import Graph, bfs
+from aoc.grid import Grid
+from aoc.kernel import kernel
+from aoc.variants import variant
+
 logger = logging.getLogger(__name__)
 
 
-Maze = numpy.typing.NDArray[numpy.char]
-Location = tuple[int, ...]
+Maze = Grid
+# A flat index in to the maze
+Location = int
 
 
 class Direction(enum.Enum):
-    up = [-1, 0]
-    down = [1, 0]
-    left = [0, -1]
-    right = [0, 1]
+    up = (-1, 0)
+    down = (1, 0)
+    left = (0, -1)
+    right = (0, 1)
 
-    def step(self, location: Location) -> Location:
-        return tuple(numpy.array(location) + self.value)
+    def offset(self, maze: Maze) -> int:
+        return maze.offset(*self.value)
 
     @cached_property
     def flipped(self) -> "Direction":
@@ -47,92 +52,172 @@ transitions_from_next = {
 }
 
 
+# Tiles with an opening on each side
+openings = {
+    direction: [ord(tile) for tile, tile_dirs in transitions.items() if direction in tile_dirs]
+    for direction in Direction
+}
+
+
+def pipe_graph(maze: Maze) -> Graph:
+    """Edges between every pair of neighbouring pipes that connect to each other."""
+    directions = {direction.offset(maze): direction for direction in Direction}
+
+    def connected(sources: numpy.ndarray, targets: numpy.ndarray, offset: int) -> numpy.ndarray:
+        direction = directions[offset]
+        return (
+            numpy.isin(sources, openings[direction])
+            & numpy.isin(targets, openings[direction.flipped])
+        )
+    return Graph.from_grid(maze, connected)
+
+
 def parse_maze(stream: io.TextIOBase) -> Maze:
-    maze: Maze = numpy.array([list(line.strip()) for line in stream])
-    return maze
+    return Grid.load(stream, border=ord('.'))
 
 
 def find_start(maze: Maze) -> Location:
-    return tuple(numpy.argwhere(maze == 'S')[0])
+    return maze.find_first(ord('S'))
 
 
 def classify_start(maze: Maze, start: Location) -> str:
-    valid_directions = set()
-    if start[0] != 0:
-        if maze[Direction.up.step(start)] in {'|', 'F', '7'}:
-            valid_directions.add(Direction.up)
-    if start[1] != 0:
-        if maze[Direction.left.step(start)] in {'-', 'F', 'L'}:
-            valid_directions.add(Direction.left)
-    if start[0] != maze.shape[0]:
-        if maze[Direction.down.step(start)] in {'|', 'J', 'L'}:
-            valid_directions.add(Direction.down)
-    if start[1] != maze.shape[1]:
-        if maze[Direction.right.step(start)] in {'-', 'J', '7'}:
-            valid_directions.add(Direction.right)
+    connecting_tiles = {
+        Direction.up: {'|', 'F', '7'},
+        Direction.left: {'-', 'F', 'L'},
+        Direction.down: {'|', 'J', 'L'},
+        Direction.right: {'-', 'J', '7'},
+    }
+    valid_directions = {
+        direction for direction, tiles in connecting_tiles.items()
+        if chr(maze.cells[start + direction.offset(maze)]) in tiles
+    }
     return next(
         tile for tile, tile_dirs in transitions.items()
         if tile_dirs == valid_directions
     )
 
 
-def part_one():
-    maze = parse_maze(sys.stdin)
-    start = find_start(maze)
-    start_tile = classify_start(maze, start)
-    maze[start] = start_tile
+@variant('one', 'walk')
+def part_one(stream: io.TextIOBase):
+    maze = parse_maze(stream)
+    return furthest_distance(find_loop(maze))
 
-    loop_walker = step_loop(maze, start)
-    loop_cells = [start] + list(itertools.takewhile(lambda x: x != start, loop_walker))
-    assert len(loop_cells) % 2 == 0
-    print(len(loop_cells) // 2)
 
-
-def step_loop(maze: Maze, start: Location) -> Location:
+@variant('one', 'graph')
+def part_one_graph(stream: io.TextIOBase):
+    """
+    Search outwards from the start along connected pipes.
+    The far side of the loop is the furthest point from the start.
+    Slower than walking the loop, as the search has to track visited cells.
+    """
+    maze = parse_maze(stream)
+    start = find_start(maze)
+    start_tile = classify_start(maze, start)
+    maze.cells[start] = ord(start_tile)
+    return int(bfs(pipe_graph(maze), [start]).max())
+
+
+def walk_loop_lists(
+    cells: numpy.ndarray, start: Location, direction: int,
+    offsets: numpy.ndarray, turns: numpy.ndarray,
+) -> numpy.ndarray:
+    directions = turns.shape[1]
+    cells, offsets, turns = cells.tobytes(), offsets.tolist(), turns.ravel().tolist()
+    # Plain machine integers, so a long loop doesn't make an int object per step
+    locations = array.array('q')
     location = start
-    # Pick an arbitrary start direction from the available directions
-    direction = next(iter(transitions[maze[start]]))
-
     while True:
-        location = direction.step(location)
-        yield location
-        if maze[location] == 'S':
+        location += offsets[direction]
+        locations.append(location)
+        if location == start:
             break
-        direction = transitions_from_next[maze[location]][direction]
+        direction = turns[cells[location] * directions + direction]
+    return numpy.frombuffer(locations, dtype=numpy.int64)
+
+
+@kernel(python=walk_loop_lists)
+def walk_loop(
+    cells: numpy.ndarray, start: Location, direction: int,
+    offsets: numpy.ndarray, turns: numpy.ndarray,
+) -> numpy.ndarray:
+    """
+    Every location around the loop, starting one step from the start
+    in the given direction and ending back at the start.
+    Directions are indexes in to `offsets`,
+    and `turns[tile, direction]` is the direction to leave a tile
+    entered going in that direction.
+    """
+    locations = numpy.empty(len(cells), dtype=numpy.intp)
+    count = 0
+    location = start
+    while True:
+        location += offsets[direction]
+        locations[count] = location
+        count += 1
+        if location == start:
+            break
+        direction = turns[cells[location], direction]
+    return locations[:count]
+
+
+def step_loop(maze: Maze, start: Location) -> numpy.ndarray:
+    """
+    Walk around the loop from the start, returning every location in turn.
+    The start must already be replaced with its real tile.
+    """
+    directions = list(Direction)
+    offsets = numpy.array([direction.offset(maze) for direction in directions], dtype=numpy.intp)
+    # Which way to step next, by the tile stepped on to and the step taken to get there
+    turns = numpy.zeros((256, len(directions)), dtype=numpy.intp)
+    for tile, tile_turns in transitions_from_next.items():
+        for incoming, outgoing in tile_turns.items():
+            turns[ord(tile), directions.index(incoming)] = directions.index(outgoing)
 
+    # Pick an arbitrary start direction from the available directions
+    direction = directions.index(next(iter(transitions[chr(maze.cells[start])])))
+    return walk_loop(maze.data, start, direction, offsets, turns)
 
-def part_two():
-    maze = parse_maze(sys.stdin)
+
+def find_loop(maze: Maze) -> numpy.ndarray:
+    """
+    Every location around the loop.
+    The start is replaced with its real tile first.
+    """
     start = find_start(maze)
     start_tile = classify_start(maze, start)
-    maze[start] = start_tile
-
-    loop_walker = step_loop(maze, start)
-    loop_cells = numpy.array([start] + list(
-        itertools.takewhile(lambda x: x != start, loop_walker)
-    ))
-
-    transitions = numpy.zeros(maze.shape, dtype=int)
-    transition_indices = numpy.array([c for c in loop_cells if maze[*c] in '|F7'])
-    print(transition_indices)
-    transitions[*transition_indices.T] = 1
-    print(transitions)
-
-    transition_count = numpy.cumsum(transitions, axis=1)
-    transition_count[*loop_cells.T] = 0
-    print(transition_count)
-    print(numpy.count_nonzero(transition_count % 2 == 1))
-
-
-if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
-
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+    maze.cells[start] = ord(start_tile)
+    return step_loop(maze, start)
+
+
+def furthest_distance(loop_cells: numpy.ndarray) -> int:
+    loop_length = len(loop_cells)
+    assert loop_length % 2 == 0
+    return loop_length // 2
+
+
+def count_enclosed(maze: Maze, loop_cells: numpy.ndarray) -> int:
+    # Count the loop crossings to the left of every cell.
+    # Cells with an odd count are inside the loop.
+    transitions = numpy.zeros(maze.data.shape, dtype=int)
+    crossings = loop_cells[numpy.isin(maze.data[loop_cells], list(b'|F7'))]
+    transitions[crossings] = 1
+    logger.debug("Transitions:\n%s", maze.unflatten(transitions))
+
+    transition_count = numpy.cumsum(maze.unflatten(transitions), axis=1)
+    on_loop = numpy.zeros(maze.data.shape, dtype=bool)
+    on_loop[loop_cells] = True
+    transition_count[maze.unflatten(on_loop)] = 0
+    logger.debug("Transition counts:\n%s", transition_count)
+    return numpy.count_nonzero(transition_count % 2 == 1)
+
+
+def part_two(stream: io.TextIOBase):
+    maze = parse_maze(stream)
+    return count_enclosed(maze, find_loop(maze))
+
+
+def solve_both(stream: io.TextIOBase):
+    # Both parts start by walking the same loop
+    maze = parse_maze(stream)
+    loop_cells = find_loop(maze)
+    return furthest_distance(loop_cells), count_enclosed(maze, loop_cells)
@@ -0,0 +1,88 @@
+"""
+Pipe mazes with a single loop.
+
+A random spanning tree over a coarse grid is drawn with thick cells,
+and the loop traces the outline of that shape.
+A tree has no holes, so its outline is one simple closed loop.
+Every tile off the loop is random junk,
+except around the start where it is cleared so the start can be classified.
+"""
+import io
+import math
+import random
+
+import numpy
+
+SIZE = 140
+JUNK = numpy.frombuffer(b'|-LJ7F.', dtype=numpy.uint8)
+
+# Tile for each combination of (up, down, left, right) outline edges at a corner
+TILES = {
+    (True, True, False, False): ord('|'),
+    (False, False, True, True): ord('-'),
+    (True, False, False, True): ord('L'),
+    (True, False, True, False): ord('J'),
+    (False, True, True, False): ord('7'),
+    (False, True, False, True): ord('F'),
+}
+
+
+def spanning_tree_shape(rng: numpy.random.Generator, height: int, width: int) -> numpy.ndarray:
+    """
+    A binary tree maze: every node links either up or left.
+    Nodes sit on even cells and links on the cells between them.
+    """
+    shape = numpy.zeros((2 * height - 1, 2 * width - 1), dtype=bool)
+    shape[::2, ::2] = True
+    link_up = rng.random((height, width)) < 0.5
+    link_up[:, 0] = True
+    link_up[0, :] = False
+    link_left = ~link_up
+    link_left[0, 0] = False
+    shape[1::2, ::2] = link_up[1:, :]
+    shape[::2, 1::2] = link_left[:, 1:]
+    return shape
+
+
+def outline(shape: numpy.ndarray) -> numpy.ndarray:
+    """Tile the outline of a shape, with one tile per cell corner."""
+    padded = numpy.pad(shape, 1)
+    # The four cells touching each corner
+    up_left = padded[:-1, :-1]
+    up_right = padded[:-1, 1:]
+    down_left = padded[1:, :-1]
+    down_right = padded[1:, 1:]
+    up = up_left != up_right
+    down = down_left != down_right
+    left = up_left != down_left
+    right = up_right != down_right
+
+    tiles = numpy.zeros(up.shape, dtype=numpy.uint8)
+    for (u, d, l, r), tile in TILES.items():
+        tiles[(up == u) & (down == d) & (left == l) & (right == r) & (up | down | left | right)] = tile
+    return tiles
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    np_rng = numpy.random.default_rng(rng.getrandbits(64))
+    size = max(8, round(SIZE * math.sqrt(scale)))
+    coarse = size // 4
+
+    # Doubling the tree cells gives the loop some inside to enclose
+    shape = spanning_tree_shape(np_rng, coarse, coarse)
+    shape = shape.repeat(2, axis=0).repeat(2, axis=1)
+    tiles = outline(shape)
+    on_loop = tiles != 0
+
+    maze = JUNK[np_rng.integers(len(JUNK), size=tiles.shape)]
+    maze[on_loop] = tiles[on_loop]
+
+    candidates = numpy.argwhere(on_loop[1:-1, 1:-1]) + 1
+    y, x = candidates[np_rng.integers(len(candidates))]
+    for dy, dx in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+        if not on_loop[y + dy, x + dx]:
+            maze[y + dy, x + dx] = ord('.')
+    maze[y, x] = ord('S')
+
+    for row in maze:
+        out.write(row.tobytes().decode() + '\n')
@@ -1,68 +1,80 @@
 import logging
 import io
 import numpy
-import sys
+
+from aoc.grid import Grid
 
 logger = logging.getLogger(__name__)
 
 
-def parse_galaxy(stream: io.TextIOBase) -> numpy.ndarray:
-    return numpy.array(
-        [list(line.strip()) for line in stream],
-        dtype='S1',
+def parse_galaxy(stream: io.TextIOBase) -> Grid:
+    return Grid.load(stream, border=ord('.'))
+
+
+def galaxy_positions(galaxy: Grid) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Row and column of every galaxy before expanding,
+    and how many empty rows and columns come before each galaxy.
+    """
+    rows, columns = galaxy.positions(galaxy.find(ord('#')))
+    empty_space = galaxy.mask(ord('.'))
+    empty_rows = numpy.cumsum(numpy.all(empty_space, axis=1))
+    empty_columns = numpy.cumsum(numpy.all(empty_space, axis=0))
+    return (
+        numpy.column_stack([rows, columns]),
+        numpy.column_stack([empty_rows[rows], empty_columns[columns]]),
     )
 
 
 def expand_galaxy(
-    galaxy: numpy.ndarray,
+    galaxy: Grid,
     expansion_factor: int = 1,
-):
-    galaxy_locations = numpy.argwhere(galaxy == b'#')
-    empty_space = galaxy == b'.'
-    row_expansion = (expansion_factor - 1) * numpy.cumsum(numpy.all(empty_space, axis=0))
-    column_expansion = (expansion_factor - 1) * numpy.cumsum(numpy.all(empty_space, axis=1))
-    expanded_galaxy_locations = numpy.array([
-        [column + column_expansion[column], row + row_expansion[row]]
-        for column, row in galaxy_locations
-    ])
-    return expanded_galaxy_locations
+) -> numpy.ndarray:
+    """Row and column of every galaxy, after expanding the empty rows and columns."""
+    positions, empty = galaxy_positions(galaxy)
+    return positions + (expansion_factor - 1) * empty
+
 
+def sum_distances(locations: numpy.ndarray) -> numpy.ndarray:
+    """
+    The sum of the distances between every pair of locations, for each column.
+    Sorted, the i-th of n values is at least each of the i values before it
+    and at most each of the n - i - 1 values after it,
+    so it is added i times and taken away n - i - 1 times.
+    """
+    count = len(locations)
+    weights = 2 * numpy.arange(count, dtype=numpy.int64) - count + 1
+    return weights @ numpy.sort(locations, axis=0)
 
 
 def compute_distances(
-    galaxy: numpy.ndarray,
+    galaxy: Grid,
     expansion_factor: int,
-) -> numpy.ndarray:
-    galaxy_locations = expand_galaxy(galaxy, expansion_factor)
-    total_distance = 0
-    for source in range(len(galaxy_locations)):
-        source_location = galaxy_locations[source]
-        dest_locations = galaxy_locations[source + 1:]
-        total_distance += numpy.sum(numpy.abs(dest_locations - source_location))
-    return total_distance
+) -> int:
+    return int(numpy.sum(sum_distances(expand_galaxy(galaxy, expansion_factor))))
 
 
-def part_one():
-    galaxy = parse_galaxy(sys.stdin)
+def part_one(stream: io.TextIOBase):
+    galaxy = parse_galaxy(stream)
     total_distance = compute_distances(galaxy, 2)
-    print(total_distance)
+    return total_distance
 
 
-def part_two():
-    galaxy = parse_galaxy(sys.stdin)
+def part_two(stream: io.TextIOBase):
+    galaxy = parse_galaxy(stream)
     total_distance = compute_distances(galaxy, 1_000_000)
-    print(total_distance)
-
+    return total_distance
 
-if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
 
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+def solve_both(stream: io.TextIOBase):
+    """
+    Expanding only ever pushes galaxies further apart,
+    so every distance is the distance before expanding
+    plus the empty rows and columns crossed times one less than the factor.
+    Sum both of those once, then scale the empty space for each part.
+    """
+    galaxy = parse_galaxy(stream)
+    positions, empty = galaxy_positions(galaxy)
+    sums = sum_distances(numpy.column_stack([positions, empty]))
+    distance, crossed = int(numpy.sum(sums[:2])), int(numpy.sum(sums[2:]))
+    return distance + crossed, distance + 999_999 * crossed
@@ -0,0 +1,24 @@
+"""
+Galaxy images: sparse `#` galaxies with a few entirely empty rows and columns.
+"""
+import io
+import math
+import random
+
+import numpy
+
+SIZE = 140
+GALAXY_DENSITY = 0.025
+EMPTY_FRACTION = 0.05
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    np_rng = numpy.random.default_rng(rng.getrandbits(64))
+    size = max(1, round(SIZE * math.sqrt(scale)))
+    galaxies = np_rng.random((size, size)) < GALAXY_DENSITY
+    galaxies[np_rng.random(size) < EMPTY_FRACTION, :] = False
+    galaxies[:, np_rng.random(size) < EMPTY_FRACTION] = False
+
+    image = numpy.where(galaxies, ord('#'), ord('.')).astype(numpy.uint8)
+    for row in image:
+        out.write(row.tobytes().decode() + '\n')
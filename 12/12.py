@@ -1,12 +1,15 @@
 import enum
-import functools
 import io
 import logging
-import numpy
-import sys
-from typing import Iterable, Callable
+from typing import Iterable
+
+from aoc import trace
+from aoc.kernel import kernel
+from aoc.memo import Scope, memoize, scope
+from aoc.parallel import sum_lines
 
 logger = logging.getLogger(__name__)
+TRACING = trace.active(__name__)
 
 
 class Condition(str, enum.Enum):
@@ -18,54 +21,28 @@ class Condition(str, enum.Enum):
         return self.value
 
 
+# Conditions as bytes, for the kernel
+WORKING = ord(Condition.WORKING)
+BROKEN = ord(Condition.BROKEN)
+
+
+def parse_line(line: str) -> tuple[list[Condition], list[int]]:
+    springs, groups = line.split()
+    return (
+        list(map(Condition, springs)),
+        list(map(int, groups.split(','))),
+    )
+
+
 def parse_report(
     stream: io.TextIOBase,
 ) -> Iterable[tuple[list[Condition], list[int]]]:
     for line in stream:
-        springs, groups = line.split()
-        yield (
-            list(map(Condition, springs)),
-            list(map(int, groups.split(','))),
-        )
-
-
-class memoize:
-    def __new__(
-        cls,
-        fn: Callable | None = None,
-        /,
-        **kwargs,
-    ):
-        if fn is None:
-            return lambda fn: cls(fn, **kwargs)
-        else:
-            print("Making regular memoized")
-            return super().__new__(cls)
-
-    def __init__(self, fn: Callable, /, *, key: Callable = lambda *a: tuple(a)):
-        self.fn = fn
-        self.key = key
-        self.cache = {}
-
-    def __call__(self, *args):
-        key = self.key(*args)
-        if key in self.cache:
-            return self.cache[key]
-        else:
-            out = self.fn(*args, self)
-            self.cache[key] = out
-            return out
+        yield parse_line(line)
 
-    def copy(self):
-        return memoize(self.fn, key=self.key)
 
-
-@memoize(key=lambda cs, gs: (tuple(tuple(c) for c in cs), tuple(gs)))
-def test_combinations(
-    chunks: list[list[Condition]],
-    counts: list[int],
-    test_combinations: Callable,
-) -> int:
+@memoize(key=lambda cs, gs: (tuple(tuple(c) for c in cs), tuple(gs)), scope=Scope.LINE)
+def test_combinations(chunks: list[list[Condition]], counts: list[int]) -> int:
 
     if len(counts) == 0:
         # No more expected groups!
@@ -86,14 +63,14 @@ def test_combinations(
         # This is not a working combination.
         return 0
 
-    logger.info("%s %s", chunks, counts)
-
     chunk = chunks[0]
     count = counts[0]
 
-    logger.info(
-        "  Trying to fit %s springs in %s",
-        count, chunk)
+    if TRACING:
+        trace.count('test_combinations.calls')
+        trace.event(
+            'test_combinations.fit', "Trying to fit %s springs in %s, then %s in %s",
+            count, chunk, counts[1:], chunks[1:])
 
     working_combinations = 0
 
@@ -155,48 +132,83 @@ def count_combinations(springs: list[list[Condition]], groups: list[int]):
         if chunk != ''
     ]
 
-    return test_combinations.copy()(chunks, groups)
-
-
-def part_one():
-    total_working_combinations = 0
-    for springs, expected_groups in parse_report(sys.stdin):
-        logger.debug("--------------")
-        logger.info("%s %s", springs, expected_groups)
-        working_combinations = count_combinations(springs, expected_groups)
-        total_working_combinations += working_combinations
-        logger.info("Working combinations: %s", working_combinations)
-    print(total_working_combinations)
+    # Lines share almost no sub-problems, so don't keep them around
+    with scope(Scope.LINE):
+        return test_combinations(chunks, groups)
+
+
+def spring_arrays(springs: list[Condition], groups: list[int]) -> tuple:
+    """
+    The springs as bytes and the groups as integers,
+    with the kernel's tables to fill in.
+    Only the kernel needs numpy, so only import it here.
+    """
+    import numpy
+    springs = numpy.frombuffer(''.join(springs).encode(), dtype=numpy.uint8)
+    groups = numpy.array(groups, dtype=numpy.int64)
+    run = numpy.zeros(len(springs) + 1, dtype=numpy.int64)
+    ways = numpy.zeros((len(springs) + 1, len(groups) + 1), dtype=numpy.int64)
+    return springs, groups, run, ways
+
+
+@kernel(python=count_combinations, prepare=spring_arrays)
+def count_arrangements(springs, groups, run, ways) -> int:
+    """
+    The same count as `count_combinations`, as a table instead of a recursion.
+    `ways[i, j]` is the number of ways to fit `groups[j:]` in to `springs[i:]`,
+    filled in from the end of the line backwards.
+    `run[i]` is how many springs from `i` on could all be working.
+    Both start out as zeros.
+    """
+    length = len(springs)
+    group_count = len(groups)
+
+    for i in range(length - 1, -1, -1):
+        if springs[i] != BROKEN:
+            run[i] = run[i + 1] + 1
+
+    ways[length, group_count] = 1
+    for i in range(length - 1, -1, -1):
+        spring = springs[i]
+        for j in range(group_count + 1):
+            total = 0
+            if spring != WORKING:
+                # This spring is broken, so the groups all fit in the rest
+                total += ways[i + 1, j]
+            if spring != BROKEN and j < group_count:
+                # The next group starts here, and must be followed by a broken spring
+                end = i + groups[j]
+                if run[i] >= groups[j] and (end == length or springs[end] != WORKING):
+                    total += ways[min(end + 1, length), j + 1]
+            ways[i, j] = total
+    return ways[0, 0]
+
+
+def line_combinations(line: str) -> int:
+    springs, expected_groups = parse_line(line)
+    logger.debug("--------------")
+    logger.info("%s %s", springs, expected_groups)
+    working_combinations = int(count_arrangements(springs, expected_groups))
+    logger.info("Working combinations: %s", working_combinations)
+    return working_combinations
+
+
+def unfolded_line_combinations(line: str) -> int:
+    # The actual layout is [springs]?[springs]?[springs]?[springs]?[springs]
+    # and the expected count is [count] * 5.
+    springs, expected_groups = parse_line(line)
+    springs = (springs + [Condition.UNKNOWN]) * 4 + springs
+    expected_groups = expected_groups * 5
+    logger.debug("--------------")
+    logger.info("%s %s", springs, expected_groups)
+    working_combinations = int(count_arrangements(springs, expected_groups))
+    logger.info("Working combinations: %s", working_combinations)
+    return working_combinations
 
 
-def part_two():
-    total_working_combinations = 0
-    # For each line in the report,
-    # the actual layout is [springs]?[springs]?[springs]?[springs]?[springs]
-    # and the expected count is [count] * 5.
-    for springs, expected_groups in parse_report(sys.stdin):
-        springs = (springs + [Condition.UNKNOWN]) * 4 + springs
-        expected_groups = expected_groups * 5
-        logger.debug("--------------")
-        logger.info("%s %s", springs, expected_groups)
-        working_combinations = count_combinations(springs, expected_groups)
-        logger.info("Working combinations: %s", working_combinations)
-        total_working_combinations += working_combinations
-    print(total_working_combinations)
-
-
-if __name__ == '__main__':
-    logging.basicConfig(level=logging.WARNING)
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
-
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+def part_one(stream: io.TextIOBase):
+    return sum_lines(stream, line_combinations)
 
 
+def part_two(stream: io.TextIOBase):
+    return sum_lines(stream, unfolded_line_combinations)
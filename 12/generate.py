@@ -0,0 +1,38 @@
+"""
+Spring condition records.
+
+A valid arrangement is laid out first, then parts of it are hidden behind `?`.
+Some rows hide long runs, which is where the combination counting gets expensive.
+"""
+import io
+import random
+
+LINES = 1000
+MAX_GROUPS = 6
+MAX_GROUP_SIZE = 5
+
+
+def generate_line(rng: random.Random) -> str:
+    groups = [rng.randint(1, MAX_GROUP_SIZE) for _ in range(rng.randint(1, MAX_GROUPS))]
+    springs = ['.'] * rng.randint(0, 3)
+    for group in groups:
+        springs.extend('#' * group)
+        springs.extend('.' * rng.randint(1, 3))
+    if rng.random() < 0.5:
+        springs.pop()
+
+    if rng.random() < 0.3:
+        # Hide one long run entirely
+        start = rng.randrange(len(springs))
+        stop = rng.randint(start + 1, len(springs))
+        springs[start:stop] = '?' * (stop - start)
+    for i in range(len(springs)):
+        if rng.random() < 0.4:
+            springs[i] = '?'
+
+    return ''.join(springs) + ' ' + ','.join(map(str, groups))
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    for _ in range(round(LINES * scale)):
+        out.write(generate_line(rng) + '\n')
@@ -1,29 +1,17 @@
 import logging
 import collections
 import io
-import math
 import numpy
-import re
-import operator
-import sys
-from functools import reduce
-from typing import Optional, Tuple, List, Set, Iterable
+from typing import Iterable
+
+from aoc.grid import Grid
 
 logger = logging.getLogger(__name__)
 
 
 def parse_terrain(stream: io.TextIOBase) -> Iterable[numpy.ndarray]:
-    block = []
-    while True:
-        line = stream.readline()
-        if line == '\n' or line == '':
-            yield (numpy.array(block) == '#').astype(int)
-            if line == '\n':
-                block = []
-            else:
-                break
-        else:
-            block.append(list(line.strip()))
+    for grid in Grid.load_all(stream):
+        yield grid.mask(ord('#')).astype(int)
 
 
 def mirror_points_for_line(line: numpy.ndarray) -> set[int]:
@@ -54,29 +42,44 @@ def mirror_counts_for_block(
     return all_mirror_points, counts
 
 
-def mirror_points_for_block(block: numpy.ndarray) -> set[int]:
-    sets, counts = mirror_counts_for_block(block)
+MirrorCounts = tuple[list[set[int]], collections.Counter[int]]
+
+
+def mirror_points_for_block(
+    block: numpy.ndarray,
+    mirror_counts: MirrorCounts | None = None,
+) -> set[int]:
+    sets, _ = mirror_counts or mirror_counts_for_block(block)
     return set.intersection(*sets)
 
 
-def score_for_block(block: numpy.ndarray) -> int:
-    vertical = mirror_points_for_block(block)
+def score_for_block(
+    block: numpy.ndarray,
+    vertical: MirrorCounts | None = None,
+    horizontal: MirrorCounts | None = None,
+) -> int:
+    """
+    Pass in `mirror_counts_for_block` of the block and its transpose
+    to reuse them, otherwise they are worked out as needed.
+    """
+    vertical = mirror_points_for_block(block, vertical)
     if vertical:
         column = vertical.pop()
-        print(f"Mirrorred vertically around column {column}")
+        logger.info("Mirrorred vertically around column %s", column)
         return column
-    horizontal = mirror_points_for_block(block.T)
+    horizontal = mirror_points_for_block(block.T, horizontal)
     if horizontal:
         row = horizontal.pop()
-        print(f"Mirrorred horizontal around row {row}")
+        logger.info("Mirrorred horizontal around row %s", row)
         return row * 100
     raise ValueError(f"Could not find mirror for block\n{block}")
 
 
 def find_smudge_for_block(
     block: numpy.ndarray,
+    mirror_counts: MirrorCounts | None = None,
 ) -> tuple[int, tuple[int, int]] | None:
-    sets, counts = mirror_counts_for_block(block)
+    sets, counts = mirror_counts or mirror_counts_for_block(block)
 
     # Looking for a count of one less than the size.
     # This indicates a position where the mirror _almost_ worked.
@@ -95,13 +98,17 @@ def find_smudge_for_block(
                     return position, (smudged_row, i)
 
 
-def score_for_smudged_block(block: numpy.ndarray) -> int:
-    results = find_smudge_for_block(block)
+def score_for_smudged_block(
+    block: numpy.ndarray,
+    vertical: MirrorCounts | None = None,
+    horizontal: MirrorCounts | None = None,
+) -> int:
+    results = find_smudge_for_block(block, vertical)
     if results is not None:
         column, smudge = results
         return column
 
-    results = find_smudge_for_block(block.T)
+    results = find_smudge_for_block(block.T, horizontal)
     if results is not None:
         row, smudge = results
         return row * 100
@@ -109,32 +116,29 @@ def score_for_smudged_block(block: numpy.ndarray) -> int:
     raise ValueError("Could not find smudge for block!")
 
 
-def part_one():
+def part_one(stream: io.TextIOBase):
     total_score = 0
-    for block in parse_terrain(sys.stdin):
-        print(block)
+    for block in parse_terrain(stream):
+        logger.debug("%s", block)
         score = score_for_block(block)
         total_score += score
-    print(total_score)
+    return total_score
 
 
-def part_two():
+def part_two(stream: io.TextIOBase):
     total_score = 0
-    for block in parse_terrain(sys.stdin):
+    for block in parse_terrain(stream):
         score = score_for_smudged_block(block)
         total_score += score
-    print(total_score)
-
-
-if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
-
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+    return total_score
+
+
+def solve_both(stream: io.TextIOBase):
+    # Both parts start from the mirror points of every line of each block
+    total_score = total_smudged_score = 0
+    for block in parse_terrain(stream):
+        vertical = mirror_counts_for_block(block)
+        horizontal = mirror_counts_for_block(block.T)
+        total_score += score_for_block(block, vertical, horizontal)
+        total_smudged_score += score_for_smudged_block(block, vertical, horizontal)
+    return total_score, total_smudged_score
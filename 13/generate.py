@@ -0,0 +1,74 @@
+"""
+Blocks of ash and rocks with one perfect mirror line and one smudged mirror line.
+
+Each block is built symmetric about a row line and a column line.
+One cell in a row that the row line does not reflect is then flipped,
+which leaves the row line perfect and the column line off by one smudge.
+Blocks are randomly transposed, and any block that happens to have
+other perfect or smudged lines is thrown away and drawn again.
+"""
+import io
+import random
+
+import numpy
+
+BLOCKS = 100
+MIN_SIZE = 5
+MAX_SIZE = 17
+
+
+def mismatches(block: numpy.ndarray) -> list[int]:
+    """Mismatched cell count for every vertical mirror line in a block."""
+    counts = []
+    width = block.shape[1]
+    for line in range(1, width):
+        length = min(line, width - line)
+        left = block[:, line - length:line]
+        right = block[:, line:line + length][:, ::-1]
+        counts.append(int(numpy.count_nonzero(left != right)))
+    return counts
+
+
+def is_valid(block: numpy.ndarray) -> bool:
+    counts = mismatches(block) + mismatches(block.T)
+    return counts.count(0) == 1 and counts.count(1) == 1
+
+
+def generate_block(rng: numpy.random.Generator) -> numpy.ndarray:
+    while True:
+        height, width = rng.integers(MIN_SIZE, MAX_SIZE + 1, size=2)
+        row_line = int(rng.integers(1, height))
+        if row_line * 2 == height:
+            continue
+        column_line = int(rng.integers(1, width))
+
+        block = rng.random((height, width)) < 0.5
+        length = min(column_line, width - column_line)
+        block[:, column_line:column_line + length] = \
+            block[:, column_line - length:column_line][:, ::-1]
+        length = min(row_line, height - row_line)
+        block[row_line:row_line + length] = block[row_line - length:row_line][::-1]
+
+        if row_line * 2 < height:
+            smudge_row = int(rng.integers(row_line * 2, height))
+        else:
+            smudge_row = int(rng.integers(0, height - (height - row_line) * 2))
+        length = min(column_line, width - column_line)
+        smudge_column = int(rng.integers(column_line - length, column_line + length))
+        block[smudge_row, smudge_column] = ~block[smudge_row, smudge_column]
+
+        if rng.random() < 0.5:
+            block = block.T
+        if is_valid(block):
+            return block
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    np_rng = numpy.random.default_rng(rng.getrandbits(64))
+    blocks = max(1, round(BLOCKS * scale))
+    for index in range(blocks):
+        block = generate_block(np_rng)
+        if index:
+            out.write('\n')
+        for row in numpy.where(block, ord('#'), ord('.')).astype(numpy.uint8):
+            out.write(row.tobytes().decode() + '\n')
@@ -1,48 +1,60 @@
 import logging
-import dataclasses
 import io
-import itertools
-import math
 import numpy
-import re
-import operator
-import sys
-from functools import reduce
-from typing import Optional, Tuple, List, Set, Callable
 
-logger = logging.getLogger(__name__)
+from aoc.cycles import find_cycle, fingerprint, state_at
+from aoc.grid import Grid
+from aoc.kernel import kernel
 
+logger = logging.getLogger(__name__)
 
-def parse_rocks(stream: io.TextIOBase) -> numpy.ndarray:
-    return numpy.array([
-        list(line.strip())
-        for line in stream
-    ])
+ROUND = ord('O')
+CUBE = ord('#')
+EMPTY = ord('.')
 
 
+def parse_rocks(stream: io.TextIOBase) -> numpy.ndarray:
+    """
+    The rocks, surrounded by a border of cube rocks.
+    Rocks tilted any direction stop at the border, so the edges need no special handling.
+    """
+    return Grid.load(stream, border=CUBE).padded
+
+
+def tilt_north_lists(rocks: numpy.ndarray) -> numpy.ndarray:
+    columns = rocks.T.tolist()
+    for column in columns:
+        # The border guarantees a cube rock at the top of every column
+        free = 0
+        for y, cell in enumerate(column):
+            if cell == CUBE:
+                free = y + 1
+            elif cell == ROUND:
+                column[y] = EMPTY
+                column[free] = ROUND
+                free += 1
+    return numpy.array(columns, dtype=rocks.dtype).T
+
+
+@kernel(python=tilt_north_lists)
 def tilt_north(rocks: numpy.ndarray) -> numpy.ndarray:
-    columns = []
-    rocks = numpy.concatenate([
-        [['#'] * rocks.shape[1]],
-        rocks,
-    ])
-
-    columns = []
-    for x in range(rocks.shape[1]):
-        column = rocks[:, x]
-        square_rocks = numpy.concatenate([
-            numpy.flatnonzero(column == '#'),
-            [rocks.shape[0] + 1],
-        ])
-        new_column = numpy.full(column.shape, fill_value='.')
-        for top, bottom in itertools.pairwise(square_rocks):
-            round_rock_count = numpy.count_nonzero(column[top:bottom] == 'O')
-            new_column[top] = '#'
-            new_column[top + 1:top + 1 + round_rock_count] = 'O'
-        columns.append(new_column)
-
-    rocks = numpy.c_[*columns]
-    return rocks[1:]
+    """
+    Roll every round rock up to the next free space,
+    scanning down each column once.
+    """
+    tilted = rocks.copy()
+    height, width = tilted.shape
+    for x in range(width):
+        free = 0
+        for y in range(height):
+            cell = tilted[y, x]
+            if cell == CUBE:
+                free = y + 1
+            elif cell == ROUND:
+                tilted[y, x] = EMPTY
+                tilted[free, x] = ROUND
+                free += 1
+    return tilted
 
 
 def tilt_east(rocks: numpy.ndarray) -> numpy.ndarray:
@@ -62,61 +74,31 @@ def iterate_rocks(rocks: numpy.ndarray) -> numpy.ndarray:
 
 
 def score_rocks(rocks: numpy.ndarray) -> int:
+    rocks = rocks[1:-1, 1:-1]
     row_scores = numpy.arange(rocks.shape[0], 0, -1)
-    row_counts = (rocks == 'O').astype(int).sum(axis=1)
+    row_counts = (rocks == ROUND).astype(int).sum(axis=1)
     return (row_scores * row_counts).sum()
 
 
-def part_one():
-    rocks = parse_rocks(sys.stdin)
-    print(rocks)
+def part_one(stream: io.TextIOBase):
+    rocks = parse_rocks(stream)
+    logger.debug("Initial rocks:\n%s", rocks_str(rocks))
     rocks = tilt_north(rocks)
-    print(rocks)
-    print(score_rocks(rocks))
+    logger.debug("Tilted rocks:\n%s", rocks_str(rocks))
+    return score_rocks(rocks)
 
 
 def rocks_str(rocks: numpy.ndarray) -> str:
-    return '\n'.join(''.join(row) for row in rocks)
+    return '\n'.join(row.tobytes().decode() for row in rocks[1:-1, 1:-1])
 
 
-def part_two():
-    rocks = parse_rocks(sys.stdin)
-    seen = {}
+def part_two(stream: io.TextIOBase):
+    rocks = parse_rocks(stream)
     total_iterations = 1000000000
-    for i in range(total_iterations):
-        key = rocks_str(rocks)
-        if key in seen:
-            previous_num, previous_next = seen[key]
-            cycle_length = i - previous_num
-            print(f"Got identical rocks on iterations {previous_num} and {i}")
-            print(f"Cycle length of {cycle_length}")
-
-            remaining_iterations = total_iterations - i
-            mod_iterations = remaining_iterations % cycle_length
-            print(
-                f"Remaining iterations: {remaining_iterations} "
-                f"or {mod_iterations} really")
-            for i in range(mod_iterations):
-                rocks = iterate_rocks(rocks)
-            print(score_rocks(rocks))
-            return
-
-        rocks = iterate_rocks(rocks)
-        seen[key] = (i, rocks)
-
-    print(rocks)
-    print(score_rocks(rocks))
-
-
-if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
-
-    if sys.argv[1] == 'one':
-        part_one()
-    elif sys.argv[1] == 'two':
-        part_two()
-    else:
-        print(f"usage: {sys.argv[0]} (one|two)")
-        sys.exit(1)
+    cycle = find_cycle(rocks, iterate_rocks, key=fingerprint)
+    logger.info(
+        "Got identical rocks on iterations %s and %s",
+        cycle.start, cycle.start + cycle.length)
+    logger.info("Cycle length of %s", cycle.length)
+    rocks = state_at(rocks, iterate_rocks, total_iterations, cycle=cycle)
+    return score_rocks(rocks)
@@ -0,0 +1,23 @@
+"""
+Reflector dishes covered in round `O` and cube `#` rocks.
+"""
+import io
+import math
+import random
+
+import numpy
+
+SIZE = 100
+ROUND_DENSITY = 0.25
+CUBE_DENSITY = 0.2
+
+
+def generate(rng: random.Random, scale: float, out: io.TextIOBase) -> None:
+    np_rng = numpy.random.default_rng(rng.getrandbits(64))
+    size = max(1, round(SIZE * math.sqrt(scale)))
+    roll = np_rng.random((size, size))
+    dish = numpy.full((size, size), ord('.'), dtype=numpy.uint8)
+    dish[roll < ROUND_DENSITY + CUBE_DENSITY] = ord('#')
+    dish[roll < ROUND_DENSITY] = ord('O')
+    for row in dish:
+        out.write(row.tobytes().decode() + '\n')
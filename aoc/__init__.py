@@ -0,0 +1,5 @@
+"""
+Shared tooling for running the daily solutions.
+
+Run `python -m aoc --help` from the repository root for the available commands.
+"""
@@ -0,0 +1,51 @@
+import argparse
+import importlib
+import logging
+import sys
+
+# Command modules are only imported when used, so that `run` doesn't pay
+# for everything `bench` or `serve` need. Keep the help in sync with the
+# first line of each module docstring.
+COMMANDS = {
+    'run': "Solve any number of days and parts in a single process.",
+    'bench': "Benchmark parts with warmup runs and repeated timings.",
+    'generate': "Generate large, reproducible inputs for a day.",
+    'serve': "Run a solver daemon that keeps numpy and every day module imported.",
+    'imports': "Measure how long each day takes to import, against a time budget.",
+    'batch': "Solve one day for many inputs, with the day imported once per worker.",
+    'gate': "Fail when parts get slower or use more memory than a committed baseline.",
+    'complexity': "Fit how each part's time and peak memory grow with the size of its input.",
+    'kernels': "Check every compiled kernel gives the same answers as its pure Python fallback.",
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    # The first argument naming a command picks the only module to import
+    command = next((arg for arg in argv if arg in COMMANDS), None)
+
+    parser = argparse.ArgumentParser(prog='python -m aoc')
+    parser.add_argument(
+        '-v', '--verbose', action='count', default=0,
+        help="Log more. Repeat for debug logging.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    modules = {}
+    for name, help in COMMANDS.items():
+        if name != command:
+            subparsers.add_parser(name, help=help)
+            continue
+        module = modules[name] = importlib.import_module(f'aoc.{name}')
+        subparser = subparsers.add_parser(
+            name, help=help, description=module.__doc__,
+            formatter_class=argparse.RawDescriptionHelpFormatter)
+        module.configure(subparser)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=[logging.WARNING, logging.INFO, logging.DEBUG][min(args.verbose, 2)])
+    return modules[args.command].main(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
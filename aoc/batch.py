@@ -0,0 +1,203 @@
+"""
+Solve one day for many inputs, with the day imported once per worker.
+
+    $ python -m aoc batch 12 inputs/12/
+    $ python -m aoc batch 5 'fuzz/05-*.txt' --part two -j 4
+
+Inputs are files, directories of files, or glob patterns.
+Each worker process imports the day, and numpy, once and then solves many inputs.
+Files are read ahead on a few threads while earlier inputs are being solved,
+with at most `--in-flight` inputs read but not yet solved,
+so memory use stays bounded however many inputs there are.
+The parse cache is off unless `--parse-cache` is given,
+as most inputs are only ever solved once.
+
+Answers and timings are printed as a table once every input is done,
+in the order the inputs were given.
+"""
+import argparse
+import concurrent.futures
+import dataclasses
+import glob
+import logging
+import multiprocessing
+import os
+import pathlib
+import time
+import traceback
+from typing import Any, Iterable
+
+from aoc import cache, parallel
+from aoc.days import PARTS, load_module, parse_day
+from aoc.inputs import Input
+from aoc.run import format_bytes, format_duration, solve
+
+logger = logging.getLogger(__name__)
+
+READ_THREADS = 4
+
+
+@dataclasses.dataclass
+class BatchResult:
+    path: pathlib.Path
+    size: int = 0
+    answers: dict[str, Any] = dataclasses.field(default_factory=dict)
+    elapsed: dict[str, float] = dataclasses.field(default_factory=dict)
+    error: str | None = None
+
+
+def find_inputs(patterns: Iterable[str]) -> list[pathlib.Path]:
+    """Expand directories and glob patterns in to files, keeping them in order."""
+    paths = []
+    for pattern in patterns:
+        path = pathlib.Path(pattern)
+        if path.is_dir():
+            paths.extend(sorted(child for child in path.iterdir() if child.is_file()))
+        elif any(character in pattern for character in '*?['):
+            paths.extend(sorted(
+                pathlib.Path(match) for match in glob.glob(pattern, recursive=True)
+                if os.path.isfile(match)))
+        else:
+            paths.append(path)
+    # Each input only needs solving once
+    return list(dict.fromkeys(paths))
+
+
+def prepare_worker(day: int) -> None:
+    # The batch is already spread over every worker, so don't nest pools
+    parallel.workers = 1
+    load_module(day)
+
+
+def solve_input(day: int, parts: list[str], name: str, data: bytes) -> dict[str, tuple[Any, float]]:
+    puzzle_input = Input.from_bytes(data, name=name)
+    results = {}
+    for part in parts:
+        result = solve(day, part, puzzle_input)
+        results[part] = (result.answer, result.elapsed)
+    return results
+
+
+def describe_error(error: BaseException) -> str:
+    return ''.join(traceback.format_exception_only(error)).strip()
+
+
+def run_batch(
+    day: int,
+    parts: list[str],
+    paths: list[pathlib.Path],
+    workers: int,
+    in_flight: int,
+) -> list[BatchResult]:
+    results = {path: BatchResult(path) for path in paths}
+    context = multiprocessing.get_context('fork')
+    with (
+        concurrent.futures.ThreadPoolExecutor(max_workers=READ_THREADS) as readers,
+        concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=context,
+            initializer=prepare_worker, initargs=(day,)) as solvers,
+    ):
+        unread = iter(paths)
+        futures = {}
+
+        def read_next() -> None:
+            path = next(unread, None)
+            if path is not None:
+                futures[readers.submit(path.read_bytes)] = ('read', path)
+
+        for _ in range(in_flight):
+            read_next()
+
+        while futures:
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                stage, path = futures.pop(future)
+                result = results[path]
+                if future.exception() is not None:
+                    result.error = describe_error(future.exception())
+                    logger.error("%s failed: %s", path, result.error)
+                    read_next()
+                elif stage == 'read':
+                    data = future.result()
+                    result.size = len(data)
+                    futures[solvers.submit(solve_input, day, parts, str(path), data)] = ('solve', path)
+                else:
+                    for part, (answer, elapsed) in future.result().items():
+                        result.answers[part] = answer
+                        result.elapsed[part] = elapsed
+                    logger.info("Solved %s", path)
+                    read_next()
+    return [results[path] for path in paths]
+
+
+def format_table(results: list[BatchResult], parts: list[str]) -> str:
+    header = ['Input', 'Size'] + [heading for part in parts for heading in (f'Part {part}', 'Time')]
+    rows = []
+    for result in results:
+        row = [str(result.path), format_bytes(result.size)]
+        for part in parts:
+            if part in result.answers:
+                row += [str(result.answers[part]), format_duration(result.elapsed[part])]
+            else:
+                row += ['-', '-']
+        if result.error is not None:
+            row.append(result.error)
+        rows.append(row)
+
+    widths = [
+        max(len(row[column]) for row in [header] + rows)
+        for column in range(len(header))
+    ]
+    lines = []
+    for row in [header] + rows:
+        cells = [
+            # Answers and times line up on the right, the input name on the left
+            cell.ljust(width) if column == 0 else cell.rjust(width)
+            for column, (cell, width) in enumerate(zip(row, widths))
+        ]
+        lines.append('  '.join(cells + row[len(widths):]).rstrip())
+    return '\n'.join(lines)
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        'day', metavar='DAY', type=parse_day,
+        help="Day to solve.")
+    parser.add_argument(
+        'inputs', metavar='INPUT', nargs='+',
+        help="Input files, directories of input files, or glob patterns.")
+    parser.add_argument(
+        '-p', '--part', dest='parts', choices=PARTS, action='append',
+        help="Parts to solve. Can be given more than once. Defaults to both.")
+    parser.add_argument(
+        '-j', '--workers', type=int, default=parallel.workers,
+        help="Worker processes. Defaults to the number of CPUs.")
+    parser.add_argument(
+        '--in-flight', type=int,
+        help="Most inputs to hold in memory at once. Defaults to twice the workers.")
+    parser.add_argument(
+        '--parse-cache', action='store_true',
+        help="Cache parsed inputs, so the second part skips parsing.")
+
+
+def main(args: argparse.Namespace) -> int:
+    parts = args.parts or PARTS
+    cache.enabled = args.parse_cache
+    paths = find_inputs(args.inputs)
+    if not paths:
+        logger.error("No inputs found")
+        return 1
+    in_flight = args.in_flight or 2 * args.workers
+
+    start = time.perf_counter()
+    results = run_batch(args.day, parts, paths, args.workers, in_flight)
+    wall = time.perf_counter() - start
+
+    print(format_table(results, parts))
+    total = sum(sum(result.elapsed.values()) for result in results)
+    failed = sum(result.error is not None for result in results)
+    print(
+        f'{len(results)} inputs, {failed} failed. '
+        f'Total: {format_duration(total)}, {format_duration(wall)} wall time')
+    return 1 if failed else 0
@@ -0,0 +1,278 @@
+"""
+Benchmark parts with warmup runs and repeated timings.
+
+    $ python -m aoc bench 11 12 14 --repeat 20 --json bench.json
+
+Every part is run against every example input by default.
+Generated inputs can be added with `--scale`,
+for example `--scale 10 --scale 100` for inputs ten and one hundred times
+bigger than the real puzzle input.
+Each input gets some untimed warmup runs and then a number of timed runs.
+The median and interquartile range of the timed runs are reported.
+The garbage collector is disabled while timing, as `timeit` does.
+The parse cache is off unless `--parse-cache` is given,
+so the timings include parsing.
+
+With `--variants`, every registered variant of a part is timed on each input
+(see `aoc.variants`), compared against the default,
+and checked to give the same answer.
+"""
+import argparse
+import dataclasses
+import datetime
+import gc
+import json
+import logging
+import pathlib
+import platform
+import statistics
+import subprocess
+import time
+from typing import Any, Iterable
+
+from aoc import cache, memo
+from aoc.days import DAYS, PARTS, ROOT, get_part, parse_day
+from aoc.generate import generated_input, has_generator
+from aoc.inputs import Input, example_inputs
+from aoc.run import format_duration, resolve_input
+from aoc.variants import get_variants
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class Timing:
+    day: int
+    part: str
+    input: str
+    input_bytes: int
+    answer: str
+    warmup: int
+    samples: list[float]
+    variant: str | None = None
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def quartiles(self) -> tuple[float, float]:
+        if len(self.samples) < 2:
+            return self.samples[0], self.samples[0]
+        q1, _, q3 = statistics.quantiles(self.samples, n=4, method='inclusive')
+        return q1, q3
+
+    @property
+    def iqr(self) -> float:
+        q1, q3 = self.quartiles
+        return q3 - q1
+
+    def to_json(self) -> dict[str, Any]:
+        q1, q3 = self.quartiles
+        return {
+            **dataclasses.asdict(self),
+            'median': self.median,
+            'q1': q1,
+            'q3': q3,
+            'iqr': self.iqr,
+        }
+
+
+def time_once(part_fn, puzzle_input: Input) -> tuple[Any, float]:
+    with puzzle_input.open() as stream:
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            with memo.scope(memo.Scope.RUN):
+                answer = part_fn(stream)
+            elapsed = time.perf_counter() - start
+        finally:
+            if gc_enabled:
+                gc.enable()
+    return answer, elapsed
+
+
+def benchmark(
+    day: int,
+    part: str,
+    puzzle_input: Input,
+    warmup: int = 1,
+    repeat: int = 5,
+    variant: str | None = None,
+) -> Timing:
+    if variant is None:
+        part_fn = get_part(day, part)
+    else:
+        part_fn = get_variants(day, part)[variant]
+    answers = set()
+    for _ in range(warmup):
+        answer, _ = time_once(part_fn, puzzle_input)
+        answers.add(str(answer))
+
+    samples = []
+    for _ in range(repeat):
+        answer, elapsed = time_once(part_fn, puzzle_input)
+        answers.add(str(answer))
+        samples.append(elapsed)
+
+    if len(answers) != 1:
+        raise ValueError(f"Day {day} part {part} gave differing answers: {answers}")
+
+    return Timing(
+        day=day, part=part,
+        input=puzzle_input.name,
+        input_bytes=len(puzzle_input),
+        answer=answers.pop(),
+        warmup=warmup,
+        samples=samples,
+        variant=variant,
+    )
+
+
+def format_timing(timing: Timing) -> str:
+    return (
+        f'Day {timing.day:2d} part {timing.part:3s} {timing.input:24s} '
+        f'{format_duration(timing.median):>10s} ± {format_duration(timing.iqr / 2):>10s}'
+        f'  [{len(timing.samples)} runs]  {timing.answer}'
+    )
+
+
+def format_comparison(timings: list[Timing]) -> str:
+    """Variants of one part on one input, relative to the first."""
+    first = timings[0]
+    lines = [f'Day {first.day:2d} part {first.part:3s} {first.input}']
+    for timing in timings:
+        ratio = timing.median / first.median if first.median else float('nan')
+        lines.append(
+            f'    {timing.variant:20s} {format_duration(timing.median):>10s} '
+            f'± {format_duration(timing.iqr / 2):>10s}  {ratio:8.2f}x  {timing.answer}')
+    return '\n'.join(lines)
+
+
+def metadata() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+    }
+
+
+def write_results(path: pathlib.Path, timings: Iterable[Timing]) -> None:
+    with open(path, 'w') as f:
+        json.dump({
+            'metadata': metadata(),
+            'results': [timing.to_json() for timing in timings],
+        }, f, indent=2)
+        f.write('\n')
+
+
+def bench_inputs(args: argparse.Namespace, day: int) -> list[Input]:
+    if args.input is not None:
+        inputs = [resolve_input(template, day) for template in args.input]
+    elif args.scales:
+        inputs = []
+    else:
+        inputs = example_inputs(day)
+
+    if args.scales and has_generator(day):
+        inputs.extend(
+            generated_input(day, scale, args.seed)
+            for scale in args.scales)
+    return inputs
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        'days', metavar='DAY', type=parse_day, nargs='*', default=list(DAYS),
+        help="Days to benchmark. Defaults to every day.")
+    parser.add_argument(
+        '-p', '--part', dest='parts', choices=PARTS, action='append',
+        help="Parts to benchmark. Can be given more than once. Defaults to both.")
+    parser.add_argument(
+        '-i', '--input', action='append',
+        help=(
+            "Input file, formatted with the day number. "
+            "Can be given more than once. "
+            "Defaults to the example inputs, unless --scale is given."))
+    parser.add_argument(
+        '-s', '--scale', dest='scales', type=float, action='append',
+        help=(
+            "Also benchmark a generated input this many times bigger "
+            "than a real puzzle input. Can be given more than once."))
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help="Random seed for generated inputs. Defaults to 0.")
+    parser.add_argument(
+        '-w', '--warmup', type=int, default=1,
+        help="Untimed runs before timing starts. Defaults to 1.")
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=5,
+        help="Timed runs per input. Defaults to 5.")
+    parser.add_argument(
+        '--parse-cache', action='store_true',
+        help="Use the parse cache, so only the first run parses each input.")
+    parser.add_argument(
+        '--variants', action='store_true',
+        help="Compare every variant of each part, and check their answers agree.")
+    parser.add_argument(
+        '--json', type=pathlib.Path,
+        help="Write the results to this file as JSON.")
+
+
+def main(args: argparse.Namespace) -> int:
+    if args.repeat < 1:
+        raise SystemExit("--repeat must be at least 1")
+    parts = args.parts or PARTS
+    cache.enabled = args.parse_cache
+
+    timings = []
+    failed = False
+    for day in args.days:
+        for puzzle_input in bench_inputs(args, day):
+            if not puzzle_input.exists():
+                logger.info("Skipping day %d, %s does not exist", day, puzzle_input.name)
+                continue
+            for part in parts:
+                variants = list(get_variants(day, part)) if args.variants else [None]
+                part_timings = []
+                for variant in variants:
+                    try:
+                        timing = benchmark(
+                            day, part, puzzle_input,
+                            warmup=args.warmup, repeat=args.repeat, variant=variant)
+                    except Exception:
+                        logger.exception(
+                            "Day %d part %s%s failed on %s", day, part,
+                            '' if variant is None else f' variant {variant}',
+                            puzzle_input.name)
+                        failed = True
+                        continue
+                    part_timings.append(timing)
+                    if not args.variants:
+                        print(format_timing(timing), flush=True)
+                timings.extend(part_timings)
+
+                if args.variants and part_timings:
+                    print(format_comparison(part_timings), flush=True)
+                    answers = {timing.variant: timing.answer for timing in part_timings}
+                    if len(set(answers.values())) > 1:
+                        logger.error(
+                            "Day %d part %s variants disagree on %s: %s",
+                            day, part, puzzle_input.name,
+                            ', '.join(f'{name}={answer}' for name, answer in answers.items()))
+                        failed = True
+
+    if args.json is not None:
+        write_results(args.json, timings)
+    return 1 if failed else 0
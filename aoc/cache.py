@@ -0,0 +1,123 @@
+"""
+Cache parsed inputs on disk so repeat runs and later parts skip parsing.
+
+Decorate a parse function with `cached_parse(version=N)`
+and bump the version whenever the parser output changes.
+Results are keyed by the parser name, its version, and a hash of the input.
+
+Results are pickled, except for large numpy arrays,
+which are saved alongside as `.npy` files and memory mapped when reloaded.
+The maps are copy-on-write, so callers can modify the arrays they get back
+without touching the cache.
+Parsers that yield their results have them collected in to a list.
+
+Caching is off unless `enabled` is set, which `python -m aoc run` does.
+"""
+import functools
+import hashlib
+import io
+import logging
+import os
+import pathlib
+import pickle
+import sys
+import types
+from typing import Any, Callable
+
+from aoc.days import ROOT
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRECTORY = ROOT / '.cache' / 'parsed'
+# Arrays smaller than this are cheaper to pickle than to map
+MMAP_THRESHOLD = 64 * 1024
+RESULT_FILE = 'result.pickle'
+
+enabled = False
+
+
+class ArrayPickler(pickle.Pickler):
+    def __init__(self, file, directory: pathlib.Path):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.directory = directory
+        self.array_count = 0
+
+    def persistent_id(self, obj: Any) -> str | None:
+        # No need to import numpy if nothing has used it yet
+        numpy = sys.modules.get('numpy')
+        if (
+            numpy is not None
+            and isinstance(obj, numpy.ndarray)
+            and not obj.dtype.hasobject
+            and obj.nbytes >= MMAP_THRESHOLD
+        ):
+            name = f'{self.array_count}.npy'
+            self.array_count += 1
+            numpy.save(self.directory / name, obj, allow_pickle=False)
+            return name
+        return None
+
+
+class ArrayUnpickler(pickle.Unpickler):
+    def __init__(self, file, directory: pathlib.Path):
+        super().__init__(file)
+        self.directory = directory
+
+    def persistent_load(self, pid: str) -> Any:
+        import numpy
+        # A plain view avoids the pure Python indexing of `numpy.memmap`,
+        # while still keeping the map open through its base
+        array = numpy.load(self.directory / pid, mmap_mode='c')
+        return array.view(numpy.ndarray)
+
+
+def store(directory: pathlib.Path, result: Any) -> None:
+    import shutil
+    import tempfile
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    temporary = pathlib.Path(tempfile.mkdtemp(dir=directory.parent, suffix='.tmp'))
+    try:
+        with open(temporary / RESULT_FILE, 'wb') as f:
+            ArrayPickler(f, temporary).dump(result)
+        os.rename(temporary, directory)
+    except OSError:
+        # Most likely another process stored the same result first
+        shutil.rmtree(temporary, ignore_errors=True)
+        if not (directory / RESULT_FILE).exists():
+            raise
+
+
+def load(directory: pathlib.Path) -> Any:
+    with open(directory / RESULT_FILE, 'rb') as f:
+        return ArrayUnpickler(f, directory).load()
+
+
+def cache_directory(fn: Callable, version: int, data: bytes) -> pathlib.Path:
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return CACHE_DIRECTORY / f'{fn.__module__}.{fn.__qualname__}-v{version}-{digest}'
+
+
+def cached_parse(version: int) -> Callable[[Callable], Callable]:
+    def decorator(fn: Callable[[io.TextIOBase], Any]) -> Callable[[io.TextIOBase], Any]:
+        @functools.wraps(fn)
+        def wrapper(stream: io.TextIOBase) -> Any:
+            if not enabled:
+                return fn(stream)
+
+            text = stream.read()
+            directory = cache_directory(fn, version, text.encode())
+            try:
+                result = load(directory)
+                logger.debug("Loaded %s from %s", fn.__qualname__, directory)
+                return result
+            except FileNotFoundError:
+                pass
+
+            result = fn(io.StringIO(text))
+            if isinstance(result, types.GeneratorType):
+                result = list(result)
+            store(directory, result)
+            logger.debug("Stored %s in %s", fn.__qualname__, directory)
+            return result
+        return wrapper
+    return decorator
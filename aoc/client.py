@@ -0,0 +1,92 @@
+"""
+Thin client for the solver daemon started with `python -m aoc serve`.
+
+    $ python -m aoc.client 12 two < 12/input.txt
+
+A drop-in for running a day directly: prints the answer and nothing else.
+This module only imports the standard library modules it needs,
+so a request costs little more than interpreter start up.
+
+Messages in both directions are a four byte big-endian length,
+a JSON header of that length, and then any payload the header declares
+with a `size` key.
+"""
+import json
+import os
+import socket
+import struct
+import sys
+
+HEADER_LENGTH = struct.Struct('>I')
+
+
+def default_socket_path() -> str:
+    if 'AOC_SOCKET' in os.environ:
+        return os.environ['AOC_SOCKET']
+    directory = os.environ.get('XDG_RUNTIME_DIR') or '/tmp'
+    return os.path.join(directory, f'aoc-{os.getuid()}.sock')
+
+
+def recv_exactly(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(min(size - len(data), 1024 * 1024))
+        if not chunk:
+            raise ConnectionError("Connection closed mid message")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def send_message(sock: socket.socket, header: dict, payload: bytes = b'') -> None:
+    header = dict(header, size=len(payload))
+    encoded = json.dumps(header).encode()
+    sock.sendall(HEADER_LENGTH.pack(len(encoded)) + encoded)
+    if payload:
+        sock.sendall(payload)
+
+
+def recv_message(sock: socket.socket) -> tuple[dict, bytes]:
+    (length,) = HEADER_LENGTH.unpack(recv_exactly(sock, HEADER_LENGTH.size))
+    header = json.loads(recv_exactly(sock, length))
+    payload = recv_exactly(sock, header.get('size', 0))
+    return header, payload
+
+
+def request(header: dict, payload: bytes = b'', path: str | None = None) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path or default_socket_path())
+        send_message(sock, header, payload)
+        response, _ = recv_message(sock)
+    return response
+
+
+def main(argv: list[str]) -> int:
+    usage = "usage: python -m aoc.client (DAY (one|two) | --stop) < input"
+    if argv == ['--stop']:
+        header, payload = {'command': 'stop'}, b''
+    elif len(argv) == 2 and argv[0].isdigit() and argv[1] in ('one', 'two'):
+        header = {'command': 'solve', 'day': int(argv[0]), 'part': argv[1]}
+        payload = sys.stdin.buffer.read()
+    else:
+        print(usage, file=sys.stderr)
+        return 1
+
+    try:
+        response = request(header, payload)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(
+            f"No solver daemon at {default_socket_path()}, "
+            "start one with `python -m aoc serve`",
+            file=sys.stderr)
+        return 2
+
+    if 'error' in response:
+        print(response['error'], file=sys.stderr, end='')
+        return 1
+    if 'answer' in response:
+        print(response['answer'])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
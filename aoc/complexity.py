@@ -0,0 +1,202 @@
+"""
+Fit how each part's time and peak memory grow with the size of its input.
+
+    $ python -m aoc complexity 11
+    $ python -m aoc complexity 3 --part two --budget 10
+
+Each part is run against generated inputs of a geometric series of scales:
+`--start`, then twice that, four times that and so on,
+until the next size looks like it would take longer than `--budget` seconds to run,
+going by how much the last doubling slowed down,
+or the scale passes `--max-scale`.
+Each size is timed like `bench` does, taking the median,
+then run once more under tracemalloc to find its peak memory.
+
+If time grows as `size ** k`, then `log(time)` is a straight line
+against `log(size)` with slope `k`,
+so the exponent is the slope of a least squares fit of one against the other.
+A linear part has an exponent near 1 and a quadratic part near 2.
+Fixed costs flatten the curve for small inputs,
+so only the largest `FIT_POINTS` sizes are fitted,
+and sizes that run in under `MIN_FIT_TIME` or use less than `MIN_FIT_MEMORY`
+are left out if enough larger sizes remain.
+Parts whose time exponent is over `--threshold` are flagged,
+and the command fails if any were.
+
+Sizes are input bytes, so only what a day's generator makes bigger is measured.
+Generators mostly add more lines, so work that is quadratic in the length
+of a single line won't show up here.
+"""
+import argparse
+import dataclasses
+import logging
+
+import numpy
+
+from aoc import bench, parallel
+from aoc.days import PARTS, parse_day
+from aoc.gate import peak_memory
+from aoc.generate import generated_input, generator_days
+from aoc.run import format_bytes, format_duration
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_START = 0.25
+DEFAULT_BUDGET = 2.0
+DEFAULT_MAX_SCALE = 256.0
+DEFAULT_THRESHOLD = 1.5
+# Sizes that run quicker or smaller than this are mostly fixed costs
+MIN_FIT_TIME = 5e-3
+MIN_FIT_MEMORY = 256 * 1024
+# Fit the largest few sizes, where growth is closest to how it carries on
+FIT_POINTS = 4
+
+
+@dataclasses.dataclass
+class Sample:
+    scale: float
+    size: int
+    median: float
+    peak_memory: int
+
+
+@dataclasses.dataclass
+class Scaling:
+    day: int
+    part: str
+    samples: list[Sample]
+    time_exponent: float | None
+    memory_exponent: float | None
+
+
+def fit_exponent(sizes: list[int], values: list[float], minimum: float) -> float | None:
+    """
+    The slope of log(value) against log(size) for the largest sizes,
+    ignoring values under the minimum if enough sizes are left without them.
+    """
+    points = [(size, value) for size, value in zip(sizes, values) if value > 0]
+    large = [(size, value) for size, value in points if value >= minimum]
+    if len(large) >= 3:
+        points = large
+    points = sorted(points)[-FIT_POINTS:]
+    if len(points) < 2 or len({size for size, _ in points}) < 2:
+        return None
+    log_sizes, log_values = numpy.log(numpy.array(points, dtype=float)).T
+    slope, _ = numpy.polyfit(log_sizes, log_values, 1)
+    return float(slope)
+
+
+def measure_scaling(
+    day: int,
+    part: str,
+    start: float,
+    budget: float,
+    max_scale: float,
+    seed: int,
+    repeat: int,
+) -> Scaling:
+    samples = []
+    scale = start
+    while scale <= max_scale:
+        puzzle_input = generated_input(day, scale, seed)
+        timing = bench.benchmark(day, part, puzzle_input, warmup=0, repeat=repeat)
+        sample = Sample(
+            scale=scale,
+            size=timing.input_bytes,
+            median=timing.median,
+            peak_memory=peak_memory(day, part, puzzle_input),
+        )
+        samples.append(sample)
+        logger.info(
+            "Day %d part %s at scale %s: %s, %s, %s", day, part, scale,
+            format_bytes(sample.size), format_duration(sample.median),
+            format_bytes(sample.peak_memory))
+        # Assume the next doubling slows down as much as the last one did
+        growth = sample.median / samples[-2].median if len(samples) > 1 else 2
+        if sample.median * max(growth, 1) > budget:
+            break
+        scale *= 2
+
+    sizes = [sample.size for sample in samples]
+    return Scaling(
+        day=day, part=part, samples=samples,
+        time_exponent=fit_exponent(sizes, [sample.median for sample in samples], MIN_FIT_TIME),
+        memory_exponent=fit_exponent(
+            sizes, [sample.peak_memory for sample in samples], MIN_FIT_MEMORY),
+    )
+
+
+def describe_exponent(exponent: float | None) -> str:
+    if exponent is None:
+        return '?'
+    return f'n^{exponent:.2f}'
+
+
+def format_scaling(scaling: Scaling, threshold: float) -> str:
+    lines = [
+        f'  scale {sample.scale:8g}  {format_bytes(sample.size):>10s}  '
+        f'{format_duration(sample.median):>10s}  {format_bytes(sample.peak_memory):>10s}'
+        for sample in scaling.samples
+    ]
+    summary = (
+        f'Day {scaling.day:2d} part {scaling.part:3s} '
+        f'time ~ {describe_exponent(scaling.time_exponent)}, '
+        f'memory ~ {describe_exponent(scaling.memory_exponent)}')
+    if is_superlinear(scaling, threshold):
+        summary += f'  FLAG: time grows faster than n^{threshold:g}'
+    return '\n'.join(lines + [summary])
+
+
+def is_superlinear(scaling: Scaling, threshold: float) -> bool:
+    return scaling.time_exponent is not None and scaling.time_exponent > threshold
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        'days', metavar='DAY', type=parse_day, nargs='*',
+        help="Days to analyse. Defaults to every day with a generator.")
+    parser.add_argument(
+        '-p', '--part', dest='parts', choices=PARTS, action='append',
+        help="Parts to analyse. Can be given more than once. Defaults to both.")
+    parser.add_argument(
+        '--start', type=float, default=DEFAULT_START,
+        help="Smallest scale, relative to a real input. Defaults to %(default)s.")
+    parser.add_argument(
+        '-b', '--budget', type=float, default=DEFAULT_BUDGET,
+        help="Stop doubling before a run would take longer than this many seconds. Defaults to %(default)s.")
+    parser.add_argument(
+        '--max-scale', type=float, default=DEFAULT_MAX_SCALE,
+        help="Largest scale to try. Defaults to %(default)s.")
+    parser.add_argument(
+        '-t', '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help="Flag parts whose time grows faster than size to this power. Defaults to %(default)s.")
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help="Random seed for generated inputs. Defaults to 0.")
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=3,
+        help="Timed runs per size. Defaults to 3.")
+
+
+def main(args: argparse.Namespace) -> int:
+    parts = args.parts or PARTS
+    # Worker pools would hide how much work is being done
+    parallel.workers = 1
+    flagged = []
+    failed = False
+    for day in args.days or generator_days():
+        for part in parts:
+            try:
+                scaling = measure_scaling(
+                    day, part, args.start, args.budget, args.max_scale, args.seed, args.repeat)
+            except Exception:
+                logger.exception("Day %d part %s failed", day, part)
+                failed = True
+                continue
+            print(format_scaling(scaling, args.threshold), flush=True)
+            if is_superlinear(scaling, args.threshold):
+                flagged.append(f'{day} part {part}')
+
+    if flagged:
+        print(f'Superlinear: day {", day ".join(flagged)}')
+    return 1 if flagged or failed else 0
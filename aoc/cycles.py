@@ -0,0 +1,178 @@
+"""
+Find where a sequence of states starts repeating, and skip ahead through it.
+
+A sequence is an initial state and a `step` function that makes the next state.
+Once any state repeats, every state after it repeats too,
+so the sequence is some steps leading in to a cycle that goes on forever.
+`find_cycle` returns where the cycle starts and how long it is,
+and `state_at` uses that to find the state after any number of steps
+without taking them all.
+
+States are compared by `key(state)`, which defaults to the state itself.
+Pass `key=fingerprint` to compare large states, such as numpy arrays,
+by a 128-bit digest of their bytes instead.
+
+There are three methods of finding a cycle:
+
+* `table` remembers the key of every state seen until one repeats.
+  This takes the fewest steps, and needs memory for one key per step.
+* `brent` and `floyd` only ever hold a couple of states,
+  but take more steps to find the cycle.
+  Brent's method takes fewer steps than Floyd's.
+
+Use `table` when stepping is slow, and `brent` when there are a lot of steps.
+"""
+import dataclasses
+import hashlib
+import itertools
+import pickle
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+State = TypeVar('State')
+Step = Callable[[State], State]
+Key = Callable[[State], Hashable]
+
+
+@dataclasses.dataclass
+class Cycle(Generic[State]):
+    # Steps taken before entering the cycle
+    start: int
+    # Steps to go once around the cycle
+    length: int
+    # The state after `start` steps, which repeats every `length` steps
+    state: State
+
+    def equivalent_step(self, n: int) -> int:
+        """The earliest step with the same state as step `n`."""
+        if n < self.start:
+            return n
+        return self.start + (n - self.start) % self.length
+
+
+def fingerprint(state: Any) -> bytes:
+    """
+    A 128-bit digest standing in for a state.
+    Numpy arrays are digested with their shape, other objects are pickled.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(state, str):
+        digest.update(state.encode())
+    elif isinstance(state, (bytes, bytearray, memoryview)):
+        digest.update(state)
+    elif hasattr(state, 'tobytes') and hasattr(state, 'shape'):
+        digest.update(repr(state.shape).encode())
+        digest.update(state.tobytes())
+    else:
+        digest.update(pickle.dumps(state))
+    return digest.digest()
+
+
+def identity(state: State) -> State:
+    return state
+
+
+def advance(state: State, step: Step, count: int) -> State:
+    for _ in range(count):
+        state = step(state)
+    return state
+
+
+def find_cycle_table(initial: State, step: Step, key: Key) -> Cycle[State]:
+    seen = {}
+    state = initial
+    for index in itertools.count():
+        state_key = key(state)
+        if state_key in seen:
+            start = seen[state_key]
+            return Cycle(start, index - start, state)
+        seen[state_key] = index
+        state = step(state)
+
+
+def find_cycle_brent(initial: State, step: Step, key: Key) -> Cycle[State]:
+    # Find the cycle length, by comparing against checkpoints
+    # that are moved up to the hare at doubling intervals
+    power = length = 1
+    tortoise_key = key(initial)
+    hare = step(initial)
+    while tortoise_key != key(hare):
+        if power == length:
+            tortoise_key = key(hare)
+            power *= 2
+            length = 0
+        hare = step(hare)
+        length += 1
+
+    # Walk two states `length` apart from the start until they meet
+    # at the start of the cycle
+    start = 0
+    tortoise = initial
+    hare = advance(initial, step, length)
+    while key(tortoise) != key(hare):
+        tortoise = step(tortoise)
+        hare = step(hare)
+        start += 1
+    return Cycle(start, length, tortoise)
+
+
+def find_cycle_floyd(initial: State, step: Step, key: Key) -> Cycle[State]:
+    # The hare moves twice as fast as the tortoise, so they meet in the cycle
+    tortoise = step(initial)
+    hare = step(step(initial))
+    while key(tortoise) != key(hare):
+        tortoise = step(tortoise)
+        hare = step(step(hare))
+
+    # The meeting point is as far from the cycle start as the start is from
+    # the initial state
+    start = 0
+    tortoise = initial
+    while key(tortoise) != key(hare):
+        tortoise = step(tortoise)
+        hare = step(hare)
+        start += 1
+
+    tortoise_key = key(tortoise)
+    length = 1
+    hare = step(tortoise)
+    while tortoise_key != key(hare):
+        hare = step(hare)
+        length += 1
+    return Cycle(start, length, tortoise)
+
+
+METHODS = {
+    'table': find_cycle_table,
+    'brent': find_cycle_brent,
+    'floyd': find_cycle_floyd,
+}
+
+
+def find_cycle(
+    initial: State,
+    step: Step,
+    key: Key | None = None,
+    method: str = 'table',
+) -> Cycle[State]:
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {list(METHODS)}")
+    return METHODS[method](initial, step, key or identity)
+
+
+def state_at(
+    initial: State,
+    step: Step,
+    n: int,
+    key: Key | None = None,
+    method: str = 'table',
+    cycle: Cycle[State] | None = None,
+) -> State:
+    """
+    The state after `n` steps, skipping over whole trips around the cycle.
+    Pass in a `cycle` already found to avoid finding it again.
+    """
+    if cycle is None:
+        cycle = find_cycle(initial, step, key=key, method=method)
+    if n < cycle.start:
+        return advance(initial, step, n)
+    return advance(cycle.state, step, (n - cycle.start) % cycle.length)
@@ -0,0 +1,90 @@
+"""
+Locate and import the per-day solution modules.
+
+Each day lives in its own two-digit directory, e.g. `12/12.py`.
+These directories are not importable packages,
+so modules are loaded by path and registered in `sys.modules` as `dayNN`.
+"""
+import importlib
+import importlib.util
+import io
+import pathlib
+import re
+import sys
+from types import ModuleType
+from typing import Any, Callable
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+DAYS = range(1, 26)
+PARTS = ('one', 'two')
+
+Part = Callable[[io.TextIOBase], Any]
+# Solves both parts at once, returning both answers
+Both = Callable[[io.TextIOBase], tuple[Any, Any]]
+
+
+def day_directory(day: int) -> pathlib.Path:
+    return ROOT / f'{day:02d}'
+
+
+def module_name(day: int, name: str | None = None) -> str:
+    if name is None:
+        return f'day{day:02d}'
+    return f'day{day:02d}_' + name.replace('-', '_')
+
+
+def load_module(day: int, name: str | None = None) -> ModuleType:
+    """
+    Import `NN/<name>.py` for a day.
+    Defaults to the solution module `NN/NN.py`.
+    Modules are only imported once.
+    """
+    qualified_name = module_name(day, name)
+    if qualified_name in sys.modules:
+        return sys.modules[qualified_name]
+
+    path = day_directory(day) / f'{name or f"{day:02d}"}.py'
+    if not path.exists():
+        raise LookupError(f"Day {day} has no module {path.relative_to(ROOT)}")
+
+    spec = importlib.util.spec_from_file_location(qualified_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[qualified_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[qualified_name]
+        raise
+    return module
+
+
+def import_module(name: str) -> ModuleType:
+    """
+    Import a module by name, loading solution modules such as `day12` by path.
+    Used to find functions again in worker processes.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    match = re.fullmatch(r'day(\d\d)', name)
+    if match is not None:
+        return load_module(int(match[1]))
+    return importlib.import_module(name)
+
+
+def get_part(day: int, part: str) -> Part:
+    if part not in PARTS:
+        raise ValueError(f"Unknown part {part!r}, expected one of {PARTS}")
+    return getattr(load_module(day), f'part_{part}')
+
+
+def get_both(day: int) -> Both | None:
+    """A day's `solve_both`, if it can share work between the two parts."""
+    return getattr(load_module(day), 'solve_both', None)
+
+
+def parse_day(value: str) -> int:
+    """Argument type for day numbers on the command line."""
+    day = int(value)
+    if day not in DAYS:
+        raise ValueError(f"Day {day} is out of range")
+    return day
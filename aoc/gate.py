@@ -0,0 +1,248 @@
+"""
+Fail when parts get slower or use more memory than a committed baseline.
+
+    $ python -m aoc gate
+    $ python -m aoc gate 5 12 --update
+
+Every solved day is run against a generated input,
+as real puzzle inputs can not be committed.
+Each part is timed like `bench` does,
+then run once more under tracemalloc to find its peak memory.
+Parts run in a single process, so worker processes don't muddy the numbers.
+
+A part has regressed when its median time is more than `--threshold` slower
+than the baseline median, plus the noise seen in both sets of runs
+(the sum of their interquartile ranges).
+Memory is compared the same way against `--memory-threshold`.
+Tiny differences are never counted, as timings of a millisecond or so
+and allocations of a few KiB are mostly noise.
+A part that looks slower is measured again up to `--retries` times,
+keeping its fastest measurement, so a passing blip of load on the machine
+doesn't fail the gate.
+A part that gives a different answer to the baseline always fails.
+
+`--update` runs the parts and saves the results as the new baseline,
+keeping the baseline of any days not run.
+Timings only compare well on the machine the baseline was recorded on.
+"""
+import argparse
+import dataclasses
+import json
+import logging
+import pathlib
+import platform
+import tracemalloc
+from typing import Any
+
+from aoc import bench, memo, parallel
+from aoc.days import PARTS, ROOT, get_part, parse_day
+from aoc.generate import generated_input
+from aoc.inputs import Input
+from aoc.run import format_bytes, format_duration
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = ROOT / 'baseline.json'
+GATED_DAYS = range(1, 15)
+DEFAULT_SCALE = 1.0
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_MEMORY_THRESHOLD = 0.25
+# Differences smaller than these are noise, whatever the thresholds say
+MIN_TIME_DIFFERENCE = 1e-3
+MIN_MEMORY_DIFFERENCE = 256 * 1024
+
+
+@dataclasses.dataclass
+class Measurement:
+    day: int
+    part: str
+    input: str
+    answer: str
+    median: float
+    iqr: float
+    peak_memory: int
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> 'Measurement':
+        return cls(**{field.name: data[field.name] for field in dataclasses.fields(cls)})
+
+
+def peak_memory(day: int, part: str, puzzle_input: Input) -> int:
+    part_fn = get_part(day, part)
+    with puzzle_input.open() as stream:
+        tracemalloc.start()
+        try:
+            with memo.scope(memo.Scope.RUN):
+                part_fn(stream)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+
+def measure(
+    day: int, part: str, puzzle_input: Input, warmup: int, repeat: int,
+) -> Measurement:
+    timing = bench.benchmark(day, part, puzzle_input, warmup=warmup, repeat=repeat)
+    return Measurement(
+        day=day, part=part,
+        input=timing.input,
+        answer=timing.answer,
+        median=timing.median,
+        iqr=timing.iqr,
+        peak_memory=peak_memory(day, part, puzzle_input),
+    )
+
+
+def check(
+    baseline: Measurement,
+    current: Measurement,
+    threshold: float,
+    memory_threshold: float,
+) -> list[str]:
+    """Every way the current measurement is worse than the baseline."""
+    problems = []
+    if current.answer != baseline.answer:
+        problems.append(f"answer changed from {baseline.answer}")
+
+    allowed = max(baseline.median * threshold, MIN_TIME_DIFFERENCE) + baseline.iqr + current.iqr
+    if current.median - baseline.median > allowed:
+        problems.append("slower")
+
+    allowed = max(baseline.peak_memory * memory_threshold, MIN_MEMORY_DIFFERENCE)
+    if current.peak_memory - baseline.peak_memory > allowed:
+        problems.append("more memory")
+    return problems
+
+
+def format_change(current: float, baseline: float) -> str:
+    if not baseline:
+        return 'new'
+    return f'{(current - baseline) / baseline:+.0%}'
+
+
+def format_measurement(current: Measurement, baseline: Measurement | None) -> str:
+    line = (
+        f'Day {current.day:2d} part {current.part:3s} '
+        f'{format_duration(current.median):>10s} ± {format_duration(current.iqr / 2):>10s} '
+        f'{format_bytes(current.peak_memory):>10s}'
+    )
+    if baseline is not None:
+        line += (
+            f'  (baseline {format_duration(baseline.median)} '
+            f'{format_change(current.median, baseline.median)}, '
+            f'{format_bytes(baseline.peak_memory)} '
+            f'{format_change(current.peak_memory, baseline.peak_memory)})'
+        )
+    return line
+
+
+def load_baseline(path: pathlib.Path) -> tuple[dict[str, Any], dict[tuple[int, str], Measurement]]:
+    if not path.exists():
+        return {}, {}
+    with open(path) as f:
+        data = json.load(f)
+    measurements = {}
+    for result in data['results']:
+        measurement = Measurement.from_json(result)
+        measurements[measurement.day, measurement.part] = measurement
+    return data['metadata'], measurements
+
+
+def write_baseline(path: pathlib.Path, measurements: dict[tuple[int, str], Measurement]) -> None:
+    with open(path, 'w') as f:
+        json.dump({
+            'metadata': bench.metadata(),
+            'results': [
+                dataclasses.asdict(measurements[key]) for key in sorted(measurements)
+            ],
+        }, f, indent=2)
+        f.write('\n')
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        'days', metavar='DAY', type=parse_day, nargs='*', default=list(GATED_DAYS),
+        help="Days to check. Defaults to days 1 to 14.")
+    parser.add_argument(
+        '-p', '--part', dest='parts', choices=PARTS, action='append',
+        help="Parts to check. Can be given more than once. Defaults to both.")
+    parser.add_argument(
+        '--baseline', type=pathlib.Path, default=DEFAULT_BASELINE,
+        help="Baseline file. Defaults to baseline.json in the repository.")
+    parser.add_argument(
+        '--update', action='store_true',
+        help="Save the results as the new baseline instead of checking them.")
+    parser.add_argument(
+        '-t', '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help="Fraction slower than the baseline a part may get. Defaults to %(default)s.")
+    parser.add_argument(
+        '-m', '--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+        help="Fraction more peak memory than the baseline a part may use. Defaults to %(default)s.")
+    parser.add_argument(
+        '--retries', type=int, default=2,
+        help="Times to measure a part again before calling it slower. Defaults to %(default)s.")
+    parser.add_argument(
+        '-s', '--scale', type=float, default=DEFAULT_SCALE,
+        help="Size of the generated inputs, relative to a real input. Defaults to %(default)s.")
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help="Random seed for generated inputs. Defaults to 0.")
+    parser.add_argument(
+        '-w', '--warmup', type=int, default=1,
+        help="Untimed runs before timing starts. Defaults to 1.")
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=5,
+        help="Timed runs per part. Defaults to 5.")
+
+
+def main(args: argparse.Namespace) -> int:
+    parts = args.parts or PARTS
+    parallel.workers = 1
+    metadata, baseline = load_baseline(args.baseline)
+    if not args.update and metadata.get('machine') not in {None, platform.machine()}:
+        logger.warning(
+            "Baseline was recorded on a %s machine, timings may not compare",
+            metadata['machine'])
+
+    measurements = {}
+    failed = False
+    for day in args.days:
+        puzzle_input = generated_input(day, args.scale, args.seed)
+        for part in parts:
+            try:
+                current = measure(day, part, puzzle_input, args.warmup, args.repeat)
+            except Exception:
+                logger.exception("Day %d part %s failed on %s", day, part, puzzle_input.name)
+                failed = True
+                continue
+            measurements[day, part] = current
+
+            previous = baseline.get((day, part))
+            if previous is not None and previous.input != current.input:
+                logger.warning(
+                    "Day %d part %s baseline is for %s, not %s. Run with --update.",
+                    day, part, previous.input, current.input)
+                previous = None
+
+            problems = []
+            if not args.update and previous is not None:
+                problems = check(previous, current, args.threshold, args.memory_threshold)
+                for _ in range(args.retries):
+                    if 'slower' not in problems:
+                        break
+                    logger.info("Day %d part %s looks slower, measuring again", day, part)
+                    again = measure(day, part, puzzle_input, args.warmup, args.repeat)
+                    if again.median < current.median:
+                        current = measurements[day, part] = again
+                    problems = check(previous, current, args.threshold, args.memory_threshold)
+
+            line = format_measurement(current, previous)
+            if problems:
+                line += '  FAIL: ' + ', '.join(problems)
+                failed = True
+            print(line, flush=True)
+
+    if args.update:
+        write_baseline(args.baseline, {**baseline, **measurements})
+        print(f"Saved {len(measurements)} parts to {args.baseline}")
+    return 1 if failed else 0
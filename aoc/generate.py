@@ -0,0 +1,91 @@
+"""
+Generate large, reproducible inputs for a day.
+
+    $ python -m aoc generate 12 --scale 100 --seed 3 -o big.txt
+
+Each day with a generator has a `NN/generate.py` module
+with a `generate(rng, scale, out)` function.
+The scale is relative to the size of a real puzzle input,
+so `--scale 100` writes an input around one hundred times bigger.
+Grids grow in both directions, so their sides grow by the square root of the scale.
+The same day, scale and seed always give the same input.
+"""
+import argparse
+import hashlib
+import io
+import logging
+import os
+import pathlib
+import random
+import sys
+import tempfile
+
+from aoc.days import DAYS, ROOT, day_directory, load_module, parse_day
+from aoc.inputs import Input
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRECTORY = ROOT / '.cache' / 'generated'
+
+
+def has_generator(day: int) -> bool:
+    return (day_directory(day) / 'generate.py').exists()
+
+
+def generator_days() -> list[int]:
+    return [day for day in DAYS if has_generator(day)]
+
+
+def generate(day: int, scale: float, seed: int, out: io.TextIOBase) -> None:
+    module = load_module(day, 'generate')
+    module.generate(random.Random(seed), scale, out)
+
+
+def generated_input(day: int, scale: float, seed: int = 0) -> Input:
+    """
+    A generated input, written to the cache directory the first time it is asked for.
+    The file name includes a hash of the generator so edits to it take effect.
+    """
+    source = (day_directory(day) / 'generate.py').read_bytes()
+    digest = hashlib.sha256(source).hexdigest()[:12]
+    path = CACHE_DIRECTORY / f'{day:02d}-x{scale:g}-s{seed}-{digest}.txt'
+    if not path.exists():
+        logger.info("Generating day %d at scale %g with seed %d", day, scale, seed)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            'w', dir=path.parent, suffix='.tmp', delete=False,
+        ) as f:
+            try:
+                generate(day, scale, seed, f)
+            except BaseException:
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, path)
+
+    puzzle_input = Input.from_path(path)
+    puzzle_input.name = f'{day:02d} x{scale:g} seed {seed}'
+    return puzzle_input
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('day', metavar='DAY', type=parse_day)
+    parser.add_argument(
+        '-s', '--scale', type=float, default=1,
+        help="Size relative to a real puzzle input. Defaults to 1.")
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help="Random seed. Defaults to 0.")
+    parser.add_argument(
+        '-o', '--output', type=pathlib.Path,
+        help="Write to this file instead of stdout.")
+
+
+def main(args: argparse.Namespace) -> int:
+    if not has_generator(args.day):
+        raise SystemExit(f"Day {args.day} has no input generator")
+    if args.output is None:
+        generate(args.day, args.scale, args.seed, sys.stdout)
+    else:
+        with open(args.output, 'w') as f:
+            generate(args.day, args.scale, args.seed, f)
+    return 0
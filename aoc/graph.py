@@ -0,0 +1,274 @@
+"""
+Search graphs stored as compressed sparse row arrays.
+
+Nodes are integer ids from 0 up to `graph.size`.
+The edges leaving node `n` go to `graph.targets[graph.offsets[n]:graph.offsets[n + 1]]`,
+with the same slice of `graph.weights` holding their weights, if any.
+`Graph.from_grid` builds a graph from a `Grid`,
+using the flat index of each cell as its node id,
+so search results line up with `grid.cells` and `grid.data`.
+`Graph.from_edges` builds a graph from arrays of sources and targets,
+for searches over states that are not just cells.
+
+Searches return arrays of distances indexed by node id,
+with `UNREACHED` for nodes that can not be reached:
+
+* `bfs` counts steps, ignoring any weights.
+* `dijkstra` adds up weights, which must not be negative.
+  The default `heap` queue works for any weights.
+  The `bucket` queue keeps one bucket per distance,
+  which is faster when the weights are small integers.
+* `astar` finds the distance to a single target,
+  guided by a heuristic that must never overestimate the distance left.
+  `manhattan(grid, target)` is a heuristic for grids with unit steps.
+
+The searches loop in Python over plain lists taken from the arrays once,
+as indexing numpy arrays one element at a time is slow.
+"""
+import dataclasses
+import heapq
+from typing import Callable, Iterable
+
+import numpy
+
+from aoc.grid import Grid
+
+UNREACHED = -1
+
+# Decides which edges exist from an array of cell values towards the cells
+# `offset` away, given the values in those cells
+Rule = Callable[[numpy.ndarray, numpy.ndarray, int], numpy.ndarray]
+# The weights of those edges, given the same arguments
+WeightRule = Callable[[numpy.ndarray, numpy.ndarray, int], numpy.ndarray]
+Heuristic = Callable[[int], int]
+
+
+@dataclasses.dataclass
+class Graph:
+    offsets: numpy.ndarray
+    targets: numpy.ndarray
+    weights: numpy.ndarray | None = None
+
+    @property
+    def size(self) -> int:
+        return len(self.offsets) - 1
+
+    def neighbours(self, node: int) -> numpy.ndarray:
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def degrees(self) -> numpy.ndarray:
+        return numpy.diff(self.offsets)
+
+    @classmethod
+    def from_edges(
+        cls,
+        size: int,
+        sources: numpy.ndarray,
+        targets: numpy.ndarray,
+        weights: numpy.ndarray | None = None,
+    ) -> 'Graph':
+        sources = numpy.asarray(sources, dtype=numpy.intp)
+        order = numpy.argsort(sources, kind='stable')
+        offsets = numpy.zeros(size + 1, dtype=numpy.intp)
+        numpy.cumsum(numpy.bincount(sources, minlength=size), out=offsets[1:])
+        return cls(
+            offsets=offsets,
+            targets=numpy.asarray(targets, dtype=numpy.intp)[order],
+            weights=None if weights is None else numpy.asarray(weights)[order],
+        )
+
+    @classmethod
+    def from_grid(
+        cls,
+        grid: Grid,
+        rule: Rule,
+        offsets: Iterable[int] | None = None,
+        weight: WeightRule | None = None,
+    ) -> 'Graph':
+        """
+        A graph over the cells of a grid.
+        For every offset, `rule` is called once with the values of every cell
+        inside the border, the values of the cells that offset away, and the offset,
+        and returns a boolean array of which of those steps are edges.
+        Steps on to the border are never edges.
+        Offsets default to the four orthogonal neighbours.
+        """
+        if offsets is None:
+            offsets = grid.neighbours4
+        inside = numpy.zeros(grid.data.shape, dtype=bool)
+        grid.unflatten(inside)[...] = True
+        cells = numpy.flatnonzero(inside)
+
+        all_sources, all_targets, all_weights = [], [], []
+        for offset in offsets:
+            targets = cells + offset
+            edges = inside[targets] & rule(grid.data[cells], grid.data[targets], offset)
+            all_sources.append(cells[edges])
+            all_targets.append(targets[edges])
+            if weight is not None:
+                all_weights.append(weight(grid.data[cells[edges]], grid.data[targets[edges]], offset))
+
+        return cls.from_edges(
+            len(grid.data),
+            numpy.concatenate(all_sources),
+            numpy.concatenate(all_targets),
+            numpy.concatenate(all_weights) if weight is not None else None,
+        )
+
+
+def passable(*blocked: int) -> Rule:
+    """A rule allowing steps between any cells not holding a blocked value."""
+    def rule(sources: numpy.ndarray, targets: numpy.ndarray, offset: int) -> numpy.ndarray:
+        return ~numpy.isin(sources, blocked) & ~numpy.isin(targets, blocked)
+    return rule
+
+
+def bfs(graph: Graph, sources: Iterable[int], limit: int | None = None) -> numpy.ndarray:
+    """Steps from the nearest source to every node, searching at most `limit` steps out."""
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    distances = [UNREACHED] * graph.size
+    frontier = list(sources)
+    for node in frontier:
+        distances[node] = 0
+
+    steps = 0
+    while frontier and (limit is None or steps < limit):
+        steps += 1
+        next_frontier = []
+        for node in frontier:
+            for target in targets[offsets[node]:offsets[node + 1]]:
+                if distances[target] == UNREACHED:
+                    distances[target] = steps
+                    next_frontier.append(target)
+        frontier = next_frontier
+    return numpy.array(distances)
+
+
+def edge_weights(graph: Graph) -> list:
+    if graph.weights is None:
+        return [1] * len(graph.targets)
+    return graph.weights.tolist()
+
+
+def dijkstra_heap(graph: Graph, sources: Iterable[int], target: int | None) -> list[int]:
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    weights = edge_weights(graph)
+    distances = [UNREACHED] * graph.size
+    queue = [(0, node) for node in sources]
+    heapq.heapify(queue)
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if distances[node] != UNREACHED:
+            continue
+        distances[node] = distance
+        if node == target:
+            break
+        for edge in range(offsets[node], offsets[node + 1]):
+            if distances[targets[edge]] == UNREACHED:
+                heapq.heappush(queue, (distance + weights[edge], targets[edge]))
+    return distances
+
+
+def dijkstra_bucket(graph: Graph, sources: Iterable[int], target: int | None) -> list[int]:
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    weights = edge_weights(graph)
+    distances = [UNREACHED] * graph.size
+    # Nodes are never queued more than the largest weight ahead,
+    # so the buckets can be reused in a circle
+    bucket_count = max(weights, default=0) + 1
+    buckets = [[] for _ in range(bucket_count)]
+    buckets[0].extend(sources)
+    queued = len(buckets[0])
+    distance = 0
+    while queued:
+        bucket = buckets[distance % bucket_count]
+        while bucket:
+            node = bucket.pop()
+            queued -= 1
+            if distances[node] != UNREACHED:
+                continue
+            distances[node] = distance
+            if node == target:
+                return distances
+            for edge in range(offsets[node], offsets[node + 1]):
+                if distances[targets[edge]] == UNREACHED:
+                    buckets[(distance + weights[edge]) % bucket_count].append(targets[edge])
+                    queued += 1
+        distance += 1
+    return distances
+
+
+QUEUES = {
+    'heap': dijkstra_heap,
+    'bucket': dijkstra_bucket,
+}
+
+
+def dijkstra(
+    graph: Graph,
+    sources: Iterable[int],
+    target: int | None = None,
+    queue: str = 'heap',
+) -> numpy.ndarray:
+    """
+    Weighted distance from the nearest source to every node.
+    With a `target` the search stops once the target's distance is known,
+    and nodes further away than the target may be left `UNREACHED`.
+    """
+    if queue not in QUEUES:
+        raise ValueError(f"Unknown queue {queue!r}, expected one of {list(QUEUES)}")
+    if queue == 'bucket' and graph.weights is not None and (
+        graph.weights.dtype.kind not in 'iub' or (graph.weights.size and graph.weights.min() < 0)
+    ):
+        raise ValueError("The bucket queue needs non-negative integer weights")
+    return numpy.array(QUEUES[queue](graph, sources, target))
+
+
+def zero(node: int) -> int:
+    return 0
+
+
+def manhattan(grid: Grid, target: int) -> Heuristic:
+    """Steps from a cell to the target, ignoring anything in the way."""
+    target_row, target_column = divmod(target, grid.stride)
+    stride = grid.stride
+
+    def heuristic(node: int) -> int:
+        row, column = divmod(node, stride)
+        return abs(row - target_row) + abs(column - target_column)
+    return heuristic
+
+
+def astar(
+    graph: Graph,
+    source: int,
+    target: int,
+    heuristic: Heuristic = zero,
+) -> int:
+    """The weighted distance from the source to the target, or `UNREACHED`."""
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    weights = edge_weights(graph)
+    distances = [UNREACHED] * graph.size
+    distances[source] = 0
+    done = [False] * graph.size
+    queue = [(heuristic(source), 0, source)]
+    while queue:
+        _, distance, node = heapq.heappop(queue)
+        if done[node]:
+            continue
+        if node == target:
+            return distance
+        done[node] = True
+        for edge in range(offsets[node], offsets[node + 1]):
+            neighbour = targets[edge]
+            new_distance = distance + weights[edge]
+            if not done[neighbour] and (
+                distances[neighbour] == UNREACHED or new_distance < distances[neighbour]
+            ):
+                distances[neighbour] = new_distance
+                heapq.heappush(queue, (new_distance + heuristic(neighbour), new_distance, neighbour))
+    return UNREACHED
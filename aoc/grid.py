@@ -0,0 +1,210 @@
+"""
+Load character grids straight from the input bytes.
+
+`load_grid` returns a 2-D `uint8` array with one byte per cell.
+When the input is a file it is memory mapped copy-on-write,
+and the array is a strided view over the map that steps over the newlines,
+so loading creates no per-cell Python objects and copies nothing.
+Other streams are read in to a single buffer and viewed the same way.
+
+Compare cells against byte values, e.g. `grid == ord('#')`.
+Writes to the grid never reach the input file.
+
+`Grid` copies a loaded grid in to a flat buffer with a one cell border,
+for solutions that walk around the grid one cell at a time.
+Cells are addressed by a single flat index,
+so stepping to a neighbour is adding an offset from `grid.neighbours4`
+or `grid.neighbours8`.
+The border means that the neighbours of every cell are in the buffer,
+and walks never need to check the edges of the grid.
+Indexing `grid.cells` gives plain ints,
+while `grid.data` and `grid.array` are numpy views of the same memory
+for vectorised work.
+"""
+import io
+import mmap
+import os
+import stat
+from typing import Iterable
+
+import numpy
+from numpy.lib.stride_tricks import as_strided
+
+NEWLINE = ord('\n')
+
+
+def read_buffer(stream: io.TextIOBase):
+    """
+    The entire contents of the input behind a stream, as a writable buffer.
+    Regular files are memory mapped copy-on-write.
+    """
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fd = None
+    if fd is not None:
+        info = os.fstat(fd)
+        if stat.S_ISREG(info.st_mode) and info.st_size > 0:
+            return mmap.mmap(fd, 0, access=mmap.ACCESS_COPY)
+
+    buffer = getattr(stream, 'buffer', None)
+    if isinstance(buffer, io.BytesIO):
+        # A copy rather than `getbuffer()`, whose export would stop the stream
+        # closing while any views of it are alive, hiding whatever error a part raised
+        return bytearray(buffer.getvalue())
+    if buffer is not None:
+        return bytearray(buffer.read())
+    return bytearray(stream.read().encode())
+
+
+def find_newline(data: numpy.ndarray) -> int:
+    """Index of the first newline, searching in growing chunks."""
+    chunk = 4096
+    while True:
+        hits = numpy.flatnonzero(data[:chunk] == NEWLINE)
+        if hits.size:
+            return int(hits[0])
+        if chunk >= len(data):
+            return len(data)
+        chunk *= 2
+
+
+def grid_view(data: numpy.ndarray) -> numpy.ndarray:
+    """
+    View a run of equal length, newline terminated lines as a 2-D grid.
+    The final newline is optional.
+    """
+    width = find_newline(data)
+    stride = width + 1
+    size = len(data)
+    if size % stride == 0:
+        rows = size // stride
+    elif (size + 1) % stride == 0:
+        rows = (size + 1) // stride
+    else:
+        raise ValueError(f"Lines are not all {width} characters long")
+    if not numpy.all(data[width::stride] == NEWLINE):
+        raise ValueError(f"Lines are not all {width} characters long")
+
+    return as_strided(
+        data, shape=(rows, width), strides=(stride, 1),
+        writeable=data.flags.writeable)
+
+
+def load_grid(stream: io.TextIOBase) -> numpy.ndarray:
+    data = numpy.frombuffer(read_buffer(stream), dtype=numpy.uint8)
+    # Ignore any trailing blank lines
+    while len(data) > 1 and data[-1] == NEWLINE and data[-2] == NEWLINE:
+        data = data[:-1]
+    return grid_view(data)
+
+
+def load_grids(stream: io.TextIOBase) -> list[numpy.ndarray]:
+    """Load several grids separated by blank lines."""
+    data = numpy.frombuffer(read_buffer(stream), dtype=numpy.uint8)
+    newlines = numpy.flatnonzero(data == NEWLINE)
+    # A blank line is a newline straight after another newline
+    blank_lines = newlines[1:][numpy.diff(newlines) == 1]
+    grids = []
+    start = 0
+    for blank_line in blank_lines:
+        if blank_line > start:
+            grids.append(grid_view(data[start:blank_line]))
+        start = blank_line + 1
+    if start < len(data):
+        grids.append(grid_view(data[start:]))
+    return grids
+
+
+class Grid:
+    def __init__(self, array: numpy.ndarray, border: int = 0):
+        height, width = array.shape
+        self.height = height
+        self.width = width
+        self.stride = width + 2
+        self.border = border
+
+        self.cells = bytearray(self.stride * (height + 2))
+        self.data = numpy.frombuffer(self.cells, dtype=numpy.uint8)
+        self.data.fill(border)
+        self.padded[1:-1, 1:-1] = array
+
+        stride = self.stride
+        # Clockwise from up, then the diagonals clockwise from up and right
+        self.neighbours4 = (-stride, 1, stride, -1)
+        self.neighbours8 = self.neighbours4 + (-stride + 1, stride + 1, stride - 1, -stride - 1)
+
+    @classmethod
+    def load(cls, stream: io.TextIOBase, border: int = 0) -> 'Grid':
+        return cls(load_grid(stream), border=border)
+
+    @classmethod
+    def load_all(cls, stream: io.TextIOBase, border: int = 0) -> list['Grid']:
+        return [cls(grid, border=border) for grid in load_grids(stream)]
+
+    @property
+    def padded(self) -> numpy.ndarray:
+        """2-D view of the whole buffer, border included."""
+        return self.data.reshape(self.height + 2, self.stride)
+
+    @property
+    def array(self) -> numpy.ndarray:
+        """2-D view of the cells inside the border."""
+        return self.padded[1:-1, 1:-1]
+
+    def unflatten(self, values: numpy.ndarray) -> numpy.ndarray:
+        """View a flat array laid out like `data` as a 2-D array inside the border."""
+        return values.reshape(self.height + 2, self.stride)[1:-1, 1:-1]
+
+    def index(self, row: int, column: int) -> int:
+        return (row + 1) * self.stride + column + 1
+
+    def offset(self, rows: int, columns: int) -> int:
+        """The change in flat index for a step of some rows and columns."""
+        return rows * self.stride + columns
+
+    def position(self, index: int) -> tuple[int, int]:
+        row, column = divmod(index, self.stride)
+        return row - 1, column - 1
+
+    def positions(self, indices: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """Rows and columns of many flat indices at once."""
+        rows, columns = numpy.divmod(indices, self.stride)
+        return rows - 1, columns - 1
+
+    def mask(self, *values: int) -> numpy.ndarray:
+        """2-D boolean mask of the cells holding any of the values."""
+        if len(values) == 1:
+            return self.array == values[0]
+        return numpy.isin(self.array, values)
+
+    def find(self, *values: int) -> numpy.ndarray:
+        """Flat indices of every cell holding any of the values, in order."""
+        if len(values) == 1:
+            return numpy.flatnonzero(self.data == values[0])
+        return numpy.flatnonzero(numpy.isin(self.data, values))
+
+    def find_first(self, value: int) -> int:
+        index = self.cells.find(value, self.stride)
+        if index == -1:
+            raise ValueError(f"{chr(value)!r} is not in the grid")
+        return index
+
+    def row(self, row: int) -> numpy.ndarray:
+        return self.array[row]
+
+    def column(self, column: int) -> numpy.ndarray:
+        return self.array[:, column]
+
+    def rotated(self, turns: int = 1) -> numpy.ndarray:
+        """View of the grid rotated anticlockwise by some quarter turns."""
+        return numpy.rot90(self.array, turns)
+
+    def neighbours(self, index: int, offsets: Iterable[int] | None = None) -> list[int]:
+        """Flat indices around a cell, defaulting to the four orthogonal neighbours."""
+        if offsets is None:
+            offsets = self.neighbours4
+        return [index + offset for offset in offsets]
+
+    def __str__(self) -> str:
+        return '\n'.join(row.tobytes().decode() for row in self.array)
@@ -0,0 +1,107 @@
+"""
+Measure how long each day takes to import, against a time budget.
+
+Each day is loaded in a fresh interpreter run with `-X importtime`,
+so nothing is shared between days and the numbers match a cold `run`.
+Only imports made while loading the day module are counted,
+not the interpreter or `aoc.days` itself.
+The slowest packages each day pulls in are listed next to its total.
+
+Exits with an error if any day takes longer than the budget to load.
+"""
+import argparse
+import dataclasses
+import os
+import re
+import subprocess
+import sys
+
+from aoc.days import DAYS, ROOT, day_directory, parse_day
+from aoc.run import format_duration
+
+# Loading a day that needs numpy costs around 100ms, most of it numpy
+DEFAULT_BUDGET = 0.25
+MARKER = '-- loading day --'
+SCRIPT = f"""
+import sys, time
+from aoc.days import load_module
+sys.stderr.write({MARKER!r} + '\\n')
+start = time.perf_counter()
+load_module({{day}})
+print(time.perf_counter() - start)
+"""
+
+# import time: self [us] | cumulative | imported package
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$')
+
+
+@dataclasses.dataclass
+class ImportTiming:
+    day: int
+    elapsed: float
+    # Cumulative seconds for each package imported directly by the day
+    packages: dict[str, float]
+
+    def slowest(self, count: int) -> list[tuple[str, float]]:
+        return sorted(self.packages.items(), key=lambda item: -item[1])[:count]
+
+
+def time_import(day: int) -> ImportTiming:
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SCRIPT.format(day=day)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+    packages = {}
+    lines = iter(process.stderr.splitlines())
+    for line in lines:
+        if line == MARKER:
+            break
+    for line in lines:
+        match = IMPORTTIME_RE.match(line)
+        # Nested imports are indented further, and already counted by their parent
+        if match is not None and len(match.group(3)) == 1:
+            packages[match.group(4)] = int(match.group(2)) / 1e6
+
+    return ImportTiming(day, float(process.stdout), packages)
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        'days', nargs='*', type=parse_day,
+        help="Days to time. Defaults to every day.")
+    parser.add_argument(
+        '-b', '--budget', type=float, default=DEFAULT_BUDGET * 1000,
+        help="Longest a day may take to import, in milliseconds. Default %(default)g.")
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=3,
+        help="Import each day this many times and keep the fastest. Default %(default)s.")
+    parser.add_argument(
+        '-n', '--packages', type=int, default=3,
+        help="How many of the slowest packages to show per day. Default %(default)s.")
+
+
+def main(args: argparse.Namespace) -> int:
+    days = args.days or [day for day in DAYS if day_directory(day).exists()]
+    budget = args.budget / 1000
+
+    over_budget = []
+    for day in days:
+        timing = min(
+            (time_import(day) for _ in range(args.repeat)),
+            key=lambda timing: timing.elapsed)
+        slowest = ', '.join(
+            f'{name} {format_duration(elapsed)}'
+            for name, elapsed in timing.slowest(args.packages))
+        flag = ' (over budget)' if timing.elapsed > budget else ''
+        print(f'Day {day:2d}: {format_duration(timing.elapsed)}{flag}  {slowest}')
+        if timing.elapsed > budget:
+            over_budget.append(day)
+
+    if over_budget:
+        print(
+            f"{len(over_budget)} day(s) over the {format_duration(budget)} budget: "
+            + ', '.join(map(str, over_budget)),
+            file=sys.stderr)
+        return 1
+    return 0
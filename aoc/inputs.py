@@ -0,0 +1,77 @@
+"""
+Puzzle inputs, either from a file or held in memory.
+
+Parts are handed a fresh text stream per call,
+so the same input can be solved repeatedly without re-reading stdin.
+`Input.from_stream` is the exception, handing a stream such as stdin
+straight to the one part that solves it, so the part can read it as it arrives.
+"""
+import dataclasses
+import io
+import pathlib
+import sys
+
+from aoc.days import ROOT, day_directory
+
+
+@dataclasses.dataclass
+class Input:
+    name: str
+    path: pathlib.Path | None = None
+    data: bytes | None = None
+    stream: io.TextIOBase | None = None
+
+    @classmethod
+    def from_path(cls, path: pathlib.Path | str) -> "Input":
+        path = pathlib.Path(path)
+        name = path.relative_to(ROOT) if path.is_relative_to(ROOT) else path
+        return cls(name=str(name), path=path)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, name: str = '<bytes>') -> "Input":
+        return cls(name=name, data=data)
+
+    @classmethod
+    def from_stdin(cls) -> "Input":
+        return cls.from_bytes(sys.stdin.buffer.read(), name='<stdin>')
+
+    @classmethod
+    def from_stream(cls, stream: io.TextIOBase, name: str = '<stream>') -> "Input":
+        """An input that can only be opened once, by reading the stream as it is."""
+        return cls(name=name, stream=stream)
+
+    def exists(self) -> bool:
+        return self.data is not None or self.stream is not None or self.path.is_file()
+
+    def read_bytes(self) -> bytes:
+        if self.data is not None:
+            return self.data
+        if self.stream is not None:
+            return self.open().buffer.read()
+        return self.path.read_bytes()
+
+    def open(self) -> io.TextIOBase:
+        if self.data is not None:
+            return io.TextIOWrapper(io.BytesIO(self.data))
+        if self.stream is not None:
+            stream, self.stream = self.stream, None
+            return stream
+        if self.path is None:
+            raise ValueError(f"{self.name} has already been read")
+        return open(self.path)
+
+    def __len__(self) -> int:
+        if self.data is not None:
+            return len(self.data)
+        if self.stream is not None:
+            raise TypeError(f"{self.name} is a stream of unknown length")
+        return self.path.stat().st_size
+
+
+def example_inputs(day: int) -> list[Input]:
+    """All of the `example*.txt` files for a day."""
+    directory = day_directory(day)
+    return [
+        Input.from_path(path)
+        for path in sorted(directory.glob('example*.txt'))
+    ]
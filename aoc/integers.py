@@ -0,0 +1,119 @@
+"""
+Pull every integer out of an input in one pass over its bytes.
+
+`load_integers` finds every run of digits in the input with numpy,
+along with any minus sign right before it,
+and converts them all at once in to one `int64` array.
+`line_starts` records which integers came from which line,
+so days can slice their structure out of the array
+instead of splitting and converting strings line by line.
+
+Only the digits matter, so `Card 1: 41 48 | 83 86` is just `1 41 48 83 86`.
+Use `positions` to find integers relative to other text in the input.
+`rows` is for inputs with as many integers on every line,
+and `row_groups` for lines of differing lengths.
+Integers can be at most 18 digits long.
+"""
+import dataclasses
+import io
+from typing import Iterator
+
+import numpy
+
+from aoc.grid import read_buffer
+
+NEWLINE = ord('\n')
+MINUS = ord('-')
+MAX_DIGITS = 18
+
+
+@dataclasses.dataclass
+class Integers:
+    values: numpy.ndarray
+    # Byte offset in the input of the first digit of each integer
+    positions: numpy.ndarray
+    # Index of the first integer on each line, plus the total at the end
+    line_starts: numpy.ndarray
+
+    def __len__(self) -> int:
+        """The number of lines."""
+        return len(self.line_starts) - 1
+
+    def line(self, index: int) -> numpy.ndarray:
+        return self.values[self.line_starts[index]:self.line_starts[index + 1]]
+
+    def lines(self) -> Iterator[numpy.ndarray]:
+        for start, stop in zip(self.line_starts[:-1].tolist(), self.line_starts[1:].tolist()):
+            yield self.values[start:stop]
+
+    def counts(self) -> numpy.ndarray:
+        """How many integers are on each line."""
+        return numpy.diff(self.line_starts)
+
+    def rows(self) -> numpy.ndarray:
+        """
+        The integers as a 2-D array with one row per line.
+        Lines without integers are skipped, the rest must all be the same length.
+        """
+        counts = self.counts()
+        counts = counts[counts > 0]
+        if len(counts) == 0:
+            return self.values.reshape(0, 0)
+        if not numpy.all(counts == counts[0]):
+            raise ValueError("Lines have differing numbers of integers")
+        return self.values.reshape(-1, counts[0])
+
+    def row_groups(self) -> list[numpy.ndarray]:
+        """
+        The integers as 2-D arrays, one for each number of integers on a line,
+        with one row per line of that length.
+        Lines without integers are skipped.
+        Lines keep their order within each array, but not between arrays.
+        """
+        counts = self.counts()
+        lengths = numpy.unique(counts[counts > 0]).tolist()
+        if len(lengths) == 1:
+            return [self.values.reshape(-1, lengths[0])]
+        starts = self.line_starts[:-1]
+        return [
+            self.values[starts[counts == length, None] + numpy.arange(length)]
+            for length in lengths
+        ]
+
+
+def parse_integers(data: numpy.ndarray, signed: bool = True) -> Integers:
+    """Find all the integers in a `uint8` array of input bytes."""
+    is_digit = (data >= ord('0')) & (data <= ord('9'))
+    # Runs of digits start where the previous byte is not a digit,
+    # and stop where the next byte is not a digit
+    is_first = is_digit.copy()
+    is_first[1:] &= ~is_digit[:-1]
+    is_last = is_digit.copy()
+    is_last[:-1] &= ~is_digit[1:]
+    positions = numpy.flatnonzero(is_first)
+    lengths = numpy.flatnonzero(is_last) - positions + 1
+    if len(lengths) and lengths.max() > MAX_DIGITS:
+        raise ValueError(f"Integers longer than {MAX_DIGITS} digits are not supported")
+
+    # Add one column of digits at a time to the integers that are that long.
+    # Most integers are short, so this soon only touches a few of them.
+    values = data[positions].astype(numpy.int64) - ord('0')
+    longer = numpy.arange(len(positions))
+    for column in range(1, int(lengths.max()) if len(lengths) else 0):
+        longer = longer[lengths[longer] > column]
+        values[longer] = values[longer] * 10 + data[positions[longer] + column] - ord('0')
+
+    if signed:
+        negative = positions > 0
+        negative[negative] = data[positions[negative] - 1] == MINUS
+        values[negative] *= -1
+
+    line_ends = numpy.flatnonzero(data == NEWLINE)
+    if len(data) and data[-1] != NEWLINE:
+        line_ends = numpy.append(line_ends, len(data))
+    line_starts = numpy.concatenate([[0], numpy.searchsorted(positions, line_ends)])
+    return Integers(values, positions, line_starts)
+
+
+def load_integers(stream: io.TextIOBase, signed: bool = True) -> Integers:
+    return parse_integers(numpy.frombuffer(read_buffer(stream), dtype=numpy.uint8), signed)
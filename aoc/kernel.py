@@ -0,0 +1,103 @@
+"""
+Loops that numba compiles when it is installed, with pure Python fallbacks.
+
+A kernel is one of the few loops that stays per-element Python work
+whatever the algorithm, written so that numba can compile it:
+numpy arrays of numbers in and out, plain loops, nothing else.
+
+    @kernel(python=tilt_north_lists)
+    def tilt_north(rocks):
+        ...
+
+Each kernel can run on one of three backends:
+
+* `numba` compiles the kernel, and is used whenever numba is installed.
+* `python` is the pure Python fallback, used when numba is not installed.
+  It gives the same results as the kernel,
+  and is usually the code the kernel replaced.
+  Kernels without a fallback run as they are.
+* `kernel` runs the uncompiled kernel in the interpreter.
+  This is slow, and only for checking the kernel without numba.
+
+`AOC_KERNELS` picks a backend instead, for example `AOC_KERNELS=python`.
+The backend is picked, and numba imported, the first time each kernel is called,
+so days don't pay for importing numba unless they run a kernel.
+Compiled kernels are cached next to the day, so only the first run compiles them.
+
+Fallbacks take the same arguments as the kernel,
+unless the kernel is given `prepare`.
+Callers then pass whatever the fallback takes,
+and `prepare` turns that in to the arrays the kernel takes,
+only when the kernel itself runs.
+
+`python -m aoc kernels` checks every backend gives the same answers.
+"""
+import functools
+import importlib.util
+import logging
+import os
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+ENVIRONMENT_VARIABLE = 'AOC_KERNELS'
+BACKENDS = ('numba', 'python', 'kernel')
+
+
+def numba_available() -> bool:
+    return importlib.util.find_spec('numba') is not None
+
+
+def default_backend() -> str:
+    backend = os.environ.get(ENVIRONMENT_VARIABLE)
+    if backend is None:
+        return 'numba' if numba_available() else 'python'
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown {ENVIRONMENT_VARIABLE} {backend!r}, expected one of {BACKENDS}")
+    return backend
+
+
+class Kernel:
+    def __init__(
+        self,
+        fn: Callable,
+        python: Callable | None = None,
+        prepare: Callable | None = None,
+    ):
+        functools.update_wrapper(self, fn)
+        self.kernel = fn
+        self.python = python or fn
+        self.prepare = prepare
+        self.backend = None
+        self.implementation = None
+
+    def select(self, backend: str) -> Callable:
+        if backend == 'python':
+            return self.python
+        if backend == 'numba':
+            import numba
+            compiled = numba.njit(cache=True)(self.kernel)
+        else:
+            compiled = self.kernel
+        if self.prepare is None:
+            return compiled
+        prepare = self.prepare
+        return lambda *args: compiled(*prepare(*args))
+
+    def __call__(self, *args):
+        if self.implementation is None:
+            self.backend = default_backend()
+            logger.debug("Using the %s backend for %s", self.backend, self.__qualname__)
+            self.implementation = self.select(self.backend)
+        return self.implementation(*args)
+
+
+def kernel(
+    fn: Callable | None = None, /, *,
+    python: Callable | None = None,
+    prepare: Callable | None = None,
+):
+    """Make a function a kernel, with an optional pure Python fallback."""
+    if fn is None:
+        return lambda fn: Kernel(fn, python=python, prepare=prepare)
+    return Kernel(fn, python=python, prepare=prepare)
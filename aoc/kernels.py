@@ -0,0 +1,96 @@
+"""
+Check every compiled kernel gives the same answers as its pure Python fallback.
+
+    $ python -m aoc kernels
+    $ python -m aoc kernels 12 --scale 0.5
+
+Every day with kernels is solved against a generated input
+on each available backend, in a fresh interpreter each,
+and the check fails if any backends disagree.
+Without numba, the fallbacks are checked against the uncompiled kernels.
+See `aoc.kernel` for writing kernels.
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+
+from aoc.days import PARTS, ROOT, parse_day
+from aoc.generate import generated_input
+from aoc.kernel import BACKENDS, ENVIRONMENT_VARIABLE, numba_available
+from aoc.run import format_duration
+
+logger = logging.getLogger(__name__)
+
+KERNEL_DAYS = (8, 10, 12, 14)
+DEFAULT_SCALE = 0.1
+
+SCRIPT = """
+import json, sys
+from aoc.inputs import Input
+from aoc.run import solve
+day, path, parts = int(sys.argv[1]), sys.argv[2], sys.argv[3:]
+results = [solve(day, part, Input.from_path(path)) for part in parts]
+print(json.dumps({result.part: [str(result.answer), result.elapsed] for result in results}))
+"""
+
+
+def solve_with(backend: str, day: int, path: str, parts: list[str]) -> dict[str, list]:
+    env = dict(os.environ, PYTHONPATH=str(ROOT), **{ENVIRONMENT_VARIABLE: backend})
+    process = subprocess.run(
+        [sys.executable, '-c', SCRIPT, str(day), path, *parts],
+        cwd=ROOT, env=env, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+    return json.loads(process.stdout)
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        'days', metavar='DAY', type=parse_day, nargs='*', default=list(KERNEL_DAYS),
+        help="Days to check. Defaults to every day with kernels.")
+    parser.add_argument(
+        '-b', '--backend', dest='backends', choices=BACKENDS, action='append',
+        help="Backends to compare. Can be given more than once. Defaults to every available backend.")
+    parser.add_argument(
+        '-s', '--scale', type=float, default=DEFAULT_SCALE,
+        help=(
+            "Size of the generated inputs, relative to a real input. Defaults to %(default)s, "
+            "as the kernel backend is slow."))
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help="Random seed for generated inputs. Defaults to 0.")
+
+
+def main(args: argparse.Namespace) -> int:
+    backends = args.backends or [
+        backend for backend in BACKENDS if backend != 'numba' or numba_available()]
+    if 'numba' not in backends:
+        logger.warning("numba is not installed, only checking the kernels uncompiled")
+
+    failed = False
+    for day in args.days:
+        puzzle_input = generated_input(day, args.scale, args.seed)
+        answers = {}
+        for backend in backends:
+            try:
+                answers[backend] = solve_with(backend, day, str(puzzle_input.path), list(PARTS))
+            except RuntimeError as error:
+                logger.error("Day %d failed on the %s backend: %s", day, backend, error)
+                failed = True
+
+        for part in PARTS:
+            results = {
+                backend: answers[backend][part] for backend in backends if backend in answers}
+            if not results:
+                continue
+            line = f'Day {day:2d} part {part:3s} ' + ', '.join(
+                f'{backend} {answer} ({format_duration(elapsed)})'
+                for backend, (answer, elapsed) in results.items())
+            if len({answer for answer, _ in results.values()}) > 1:
+                line += '  FAIL: backends disagree'
+                failed = True
+            print(line, flush=True)
+    return 1 if failed else 0
@@ -0,0 +1,174 @@
+"""
+Memoize recursive solutions, with bounded sizes and hit rate stats.
+
+    @memoize(key=lambda chunks, counts: (tuple(chunks), tuple(counts)), scope=Scope.LINE)
+    def count(chunks, counts): ...
+
+Every cache belongs to a scope, which decides when it is emptied:
+
+* `Scope.LINE` caches are emptied at the end of each `with scope(Scope.LINE)`.
+  Use these when each line of input is its own problem.
+* `Scope.RUN` caches are emptied after every part, by the runner.
+* `Scope.GLOBAL` caches are never emptied.
+
+`maxsize` bounds a cache to that many entries,
+evicting the least recently used entry when it is full.
+Caches are unbounded by default.
+
+Hits, misses, and evictions are counted for every cache.
+`log_stats()` logs them with an estimate of each cache's memory use,
+which `python -m aoc -v run` does after every part.
+"""
+import collections
+import contextlib
+import dataclasses
+import enum
+import functools
+import logging
+import sys
+import weakref
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class Scope(str, enum.Enum):
+    LINE = 'line'
+    RUN = 'run'
+    GLOBAL = 'global'
+
+
+@dataclasses.dataclass
+class CacheStats:
+    name: str
+    scope: Scope
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    peak_size: int
+    maxsize: int | None
+    memory: int
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+_missing = object()
+
+# Every cache, so scopes can be emptied and stats collected
+_caches: 'weakref.WeakSet[memoize]' = weakref.WeakSet()
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Size of an object, including the contents of any (nested) containers."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list, frozenset, set)):
+        size += sum(map(deep_sizeof, obj))
+    elif isinstance(obj, dict):
+        size += sum(deep_sizeof(k) + deep_sizeof(v) for k, v in obj.items())
+    return size
+
+
+class memoize:
+    def __new__(cls, fn: Callable | None = None, /, **kwargs):
+        if fn is None:
+            return lambda fn: cls(fn, **kwargs)
+        return super().__new__(cls)
+
+    def __init__(
+        self,
+        fn: Callable,
+        /,
+        *,
+        key: Callable | None = None,
+        maxsize: int | None = None,
+        scope: Scope = Scope.GLOBAL,
+    ):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        functools.update_wrapper(self, fn)
+        self.fn = fn
+        self.key = key
+        self.maxsize = maxsize
+        self.scope = scope
+        # Only bounded caches need to track recency
+        self.cache = {} if maxsize is None else collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.peak_size = 0
+        _caches.add(self)
+
+    def __call__(self, *args):
+        key = args if self.key is None else self.key(*args)
+        value = self.cache.get(key, _missing)
+        if value is not _missing:
+            self.hits += 1
+            if self.maxsize is not None:
+                self.cache.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = self.fn(*args)
+        self.cache[key] = value
+        if self.maxsize is not None and len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+        elif len(self.cache) > self.peak_size:
+            self.peak_size = len(self.cache)
+        return value
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            name=f'{self.__module__}.{self.__qualname__}',
+            scope=self.scope,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self.cache),
+            peak_size=self.peak_size,
+            maxsize=self.maxsize,
+            memory=deep_sizeof(self.cache),
+        )
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = self.peak_size = 0
+
+
+def clear(scope: Scope) -> None:
+    for cache in list(_caches):
+        if cache.scope is scope:
+            cache.clear()
+
+
+@contextlib.contextmanager
+def scope(which: Scope) -> Iterator[None]:
+    """Empty every cache in a scope when the block exits."""
+    try:
+        yield
+    finally:
+        clear(which)
+
+
+def log_stats(reset: bool = True) -> None:
+    """Log stats for every cache used since the last reset."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    for cache in list(_caches):
+        stats = cache.stats()
+        if stats.hits + stats.misses == 0:
+            continue
+        logger.info(
+            "%s (%s scope): %d hits, %d misses (%.1f%% hit rate), %d evictions, "
+            "%d entries (peak %d), about %d bytes",
+            stats.name, stats.scope.value, stats.hits, stats.misses,
+            stats.hit_rate * 100, stats.evictions, stats.size, stats.peak_size,
+            stats.memory)
+        if reset:
+            cache.reset_stats()
@@ -0,0 +1,243 @@
+"""
+Spread line-independent work over a pool of processes.
+
+`sum_lines(stream, fn)` is `sum(map(fn, stream))`,
+for days where each line of input can be solved on its own.
+Large inputs are split at newline boundaries into byte ranges,
+each range is summed in a worker process, and the partial sums are added up.
+Workers read their own ranges from the input file,
+so only file offsets are sent to them.
+Inputs that are not files are split in memory and sent to the workers.
+Pipes are summed in process as they are read, see `aoc.streams`.
+
+`map_ranges(fn, arrays, length)` is `[fn(arrays, 0, length)]`,
+for days that have parsed their input in to numpy arrays
+and can split the work up by index.
+The arrays are copied once in to a block of shared memory,
+and each worker gets `fn(arrays, start, stop)` for its own range of indexes,
+with `arrays` as numpy views of that block.
+Only the name of the block and the shapes of the arrays are sent to the workers,
+so nothing is pickled or copied however large the arrays are.
+Workers must not write to the arrays or return views of them.
+
+`fn` must be a module level function so workers can find it by name.
+Small inputs are summed in process, where a pool would only add overhead.
+"""
+import atexit
+import contextlib
+import io
+import logging
+import os
+import stat
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from aoc.days import import_module
+from aoc.streams import pipelined, read_lines
+
+if TYPE_CHECKING:
+    # Only imported when needed at run time, see get_executor and shared_arrays
+    import concurrent.futures
+
+    import numpy
+
+logger = logging.getLogger(__name__)
+
+# Inputs smaller than this are not worth splitting
+PARALLEL_THRESHOLD = 4 * 1024 * 1024
+# Ranges per worker, so uneven ranges still balance out
+CHUNKS_PER_WORKER = 4
+# Start each array in shared memory on a cache line
+ALIGNMENT = 64
+
+workers = os.cpu_count() or 1
+_executor = None
+
+
+def get_executor() -> 'concurrent.futures.ProcessPoolExecutor':
+    global _executor
+    if _executor is None:
+        # Most runs never need a pool, so don't pay for the import up front
+        import concurrent.futures
+        _executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        atexit.register(_executor.shutdown)
+    return _executor
+
+
+def file_path(stream: io.TextIOBase) -> str | None:
+    """
+    The path workers can open the stream's file by,
+    or None if it isn't a file or its name doesn't lead back to it,
+    as with stdin redirected from a file.
+    """
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+    info = os.fstat(fd)
+    if not stat.S_ISREG(info.st_mode):
+        return None
+    try:
+        if not os.path.samestat(info, os.stat(stream.name)):
+            return None
+    except (OSError, TypeError, ValueError):
+        return None
+    return stream.name
+
+
+def split_file(path: str, chunks: int) -> list[tuple[int, int]]:
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, 'rb') as f:
+        for index in range(1, chunks):
+            offset = max(size * index // chunks, boundaries[-1])
+            f.seek(offset)
+            f.readline()
+            boundaries.append(min(f.tell(), size))
+    boundaries.append(size)
+    return [(start, stop) for start, stop in zip(boundaries, boundaries[1:]) if stop > start]
+
+
+def split_bytes(data: bytes, chunks: int) -> list[bytes]:
+    boundaries = [0]
+    for index in range(1, chunks):
+        offset = max(len(data) * index // chunks, boundaries[-1])
+        newline = data.find(b'\n', offset)
+        boundaries.append(len(data) if newline == -1 else newline + 1)
+    boundaries.append(len(data))
+    return [data[start:stop] for start, stop in zip(boundaries, boundaries[1:]) if stop > start]
+
+
+def sum_chunk(module_name: str, qualname: str, data: bytes) -> int:
+    fn = getattr(import_module(module_name), qualname)
+    with io.TextIOWrapper(io.BytesIO(data)) as stream:
+        return sum(map(fn, stream))
+
+
+def sum_file_range(module_name: str, qualname: str, path: str, start: int, stop: int) -> int:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    return sum_chunk(module_name, qualname, data)
+
+
+def sum_in_process(stream: io.TextIOBase, fn: Callable[[str], int]) -> int:
+    return sum(map(fn, read_lines(stream) if pipelined(stream) else stream))
+
+
+def sum_lines(stream: io.TextIOBase, fn: Callable[[str], int]) -> int:
+    if workers <= 1:
+        return sum_in_process(stream, fn)
+
+    path = file_path(stream)
+    if path is not None:
+        size = os.fstat(stream.fileno()).st_size
+    else:
+        buffer = getattr(stream, 'buffer', None)
+        if isinstance(buffer, io.BytesIO):
+            size = len(buffer.getbuffer())
+        else:
+            size = 0
+
+    if size < PARALLEL_THRESHOLD:
+        return sum_in_process(stream, fn)
+
+    chunks = workers * CHUNKS_PER_WORKER
+    executor = get_executor()
+    name = (fn.__module__, fn.__qualname__)
+    if path is not None:
+        ranges = split_file(path, chunks)
+        logger.info("Summing %d ranges of %s over %d workers", len(ranges), path, workers)
+        futures = [
+            executor.submit(sum_file_range, *name, path, start, stop)
+            for start, stop in ranges
+        ]
+    else:
+        pieces = split_bytes(stream.buffer.getvalue(), chunks)
+        logger.info("Summing %d chunks over %d workers", len(pieces), workers)
+        futures = [executor.submit(sum_chunk, *name, piece) for piece in pieces]
+    return sum(future.result() for future in futures)
+
+
+# Where each array lives in a block of shared memory:
+# the block name, and the name, dtype, shape and offset of each array
+Layout = tuple[str, list[tuple[str, str, tuple[int, ...], int]]]
+
+
+def split_range(length: int, chunks: int) -> list[tuple[int, int]]:
+    boundaries = [length * index // chunks for index in range(chunks + 1)]
+    return [(start, stop) for start, stop in zip(boundaries, boundaries[1:]) if stop > start]
+
+
+@contextlib.contextmanager
+def shared_arrays(arrays: dict[str, 'numpy.ndarray']) -> Iterator[Layout]:
+    """Copy the arrays in to a new block of shared memory, freed on exit."""
+    from multiprocessing import shared_memory
+    import numpy
+
+    entries = []
+    size = 0
+    for name, array in arrays.items():
+        entries.append((name, array.dtype.str, array.shape, size))
+        size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        for (name, dtype, shape, offset), array in zip(entries, arrays.values()):
+            view = numpy.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+            view[...] = array
+            del view
+        yield block.name, entries
+    finally:
+        block.close()
+        block.unlink()
+
+
+@contextlib.contextmanager
+def attach_arrays(layout: Layout) -> Iterator[dict[str, 'numpy.ndarray']]:
+    """Read only views of arrays already in shared memory."""
+    from multiprocessing import shared_memory
+    import numpy
+
+    block_name, entries = layout
+    block = shared_memory.SharedMemory(name=block_name)
+    arrays = {}
+    try:
+        for name, dtype, shape, offset in entries:
+            arrays[name] = numpy.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+            arrays[name].flags.writeable = False
+        yield arrays
+    finally:
+        # The block can't be closed while any views of it exist
+        arrays.clear()
+        block.close()
+
+
+def call_range(module_name: str, qualname: str, layout: Layout, start: int, stop: int) -> Any:
+    fn = getattr(import_module(module_name), qualname)
+    with attach_arrays(layout) as arrays:
+        return fn(arrays, start, stop)
+
+
+def map_ranges(
+    fn: Callable[[dict[str, 'numpy.ndarray'], int, int], Any],
+    arrays: dict[str, 'numpy.ndarray'],
+    length: int,
+    threshold: int = 0,
+) -> list[Any]:
+    """
+    Call `fn(arrays, start, stop)` for ranges covering `range(length)`,
+    returning the results in order.
+    With fewer than `threshold` indexes, or only one worker,
+    there is one range, called in process on the arrays as they are.
+    """
+    if workers <= 1 or length < max(threshold, 2):
+        return [fn(arrays, 0, length)]
+
+    ranges = split_range(length, workers * CHUNKS_PER_WORKER)
+    executor = get_executor()
+    name = (fn.__module__, fn.__qualname__)
+    with shared_arrays(arrays) as layout:
+        logger.info(
+            "Mapping %d ranges of %d items over %d workers, sharing %d bytes",
+            len(ranges), length, workers, sum(array.nbytes for array in arrays.values()))
+        futures = [executor.submit(call_range, *name, layout, start, stop) for start, stop in ranges]
+        return [future.result() for future in futures]
@@ -0,0 +1,243 @@
+"""
+Split a part's time and memory between parsing and solving.
+
+Any `parse_*` function in a day module counts as the parse phase,
+and everything else in the part counts as the solve phase.
+Parsers that yield their results are timed each time they are advanced,
+so lazily parsed input is still counted as parsing.
+
+Each part is solved twice.
+The first run only records wall time, so the split is not skewed by tracing.
+The second run traces memory with `tracemalloc` to find the peak of each phase,
+and optionally captures `cProfile` stats and sampled stacks for the solve phase.
+Sampled stacks are written in the collapsed format flame graph tools read.
+"""
+import collections
+import contextlib
+import cProfile
+import dataclasses
+import functools
+import pstats
+import signal
+import time
+import tracemalloc
+import types
+from typing import Any, Callable, Iterator
+
+from aoc import memo
+from aoc.days import get_part, load_module
+from aoc.inputs import Input
+
+PHASES = ('parse', 'solve')
+
+
+class StackSampler:
+    """Sample the Python stack on a CPU time interval timer."""
+
+    def __init__(self, interval: float, root: types.CodeType):
+        self.interval = interval
+        self.root = root
+        self.active = False
+        self.counts = collections.Counter()
+
+    def sample(self, signum, frame) -> None:
+        if not self.active:
+            return
+        if frame.f_globals.get('__name__') in {__name__, 'contextlib'}:
+            # Caught switching phases, which is not the part's own work
+            return
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            module = frame.f_globals.get('__name__')
+            if module != __name__:
+                stack.append(f"{module}:{code.co_qualname}")
+            if code is self.root:
+                break
+            frame = frame.f_back
+        else:
+            # Not within the part being profiled
+            return
+        self.counts[';'.join(reversed(stack))] += 1
+
+    @contextlib.contextmanager
+    def running(self) -> Iterator[None]:
+        previous = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous)
+
+    def collapsed(self) -> str:
+        return ''.join(f'{stack} {count}\n' for stack, count in sorted(self.counts.items()))
+
+
+class PhaseTracker:
+    def __init__(
+        self,
+        trace_memory: bool = False,
+        profiler: cProfile.Profile | None = None,
+        sampler: StackSampler | None = None,
+    ):
+        self.trace_memory = trace_memory
+        self.profiler = profiler
+        self.sampler = sampler
+        self.wall = dict.fromkeys(PHASES, 0.)
+        self.peak = dict.fromkeys(PHASES, 0)
+        self.phase = None
+        self.started = None
+
+    def switch(self, phase: str | None) -> None:
+        now = time.perf_counter()
+        if self.phase is not None:
+            self.wall[self.phase] += now - self.started
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                self.peak[self.phase] = max(self.peak[self.phase], peak)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+        solving = phase == 'solve'
+        if self.profiler is not None:
+            if solving:
+                self.profiler.enable()
+            else:
+                self.profiler.disable()
+        if self.sampler is not None:
+            self.sampler.active = solving
+
+        self.phase = phase
+        self.started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def parsing(self) -> Iterator[None]:
+        if self.phase == 'parse':
+            # A parser calling another parser
+            yield
+            return
+        self.switch('parse')
+        try:
+            yield
+        finally:
+            self.switch('solve')
+
+    def wrap_parser(self, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.parsing():
+                result = fn(*args, **kwargs)
+            if isinstance(result, types.GeneratorType):
+                return self.track_generator(result)
+            return result
+        return wrapper
+
+    def track_generator(self, generator: types.GeneratorType) -> Iterator[Any]:
+        while True:
+            with self.parsing():
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    return
+            yield item
+
+    def run(self, day: int, part: str, puzzle_input: Input) -> Any:
+        module = load_module(day)
+        part_fn = get_part(day, part)
+        parsers = {
+            name: value for name, value in vars(module).items()
+            if name.startswith('parse_') and callable(value)
+        }
+        with puzzle_input.open() as stream:
+            try:
+                for name, parser in parsers.items():
+                    setattr(module, name, self.wrap_parser(parser))
+                self.switch('solve')
+                try:
+                    with memo.scope(memo.Scope.RUN):
+                        return part_fn(stream)
+                finally:
+                    self.switch(None)
+            finally:
+                for name, parser in parsers.items():
+                    setattr(module, name, parser)
+
+
+@dataclasses.dataclass
+class Profile:
+    day: int
+    part: str
+    input: str
+    answer: Any
+    wall: dict[str, float]
+    peak_memory: dict[str, int]
+    profiler: cProfile.Profile | None = None
+    sampler: StackSampler | None = None
+
+    def top_functions(self, limit: int = 25) -> list[dict[str, Any]]:
+        stats = pstats.Stats(self.profiler).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+        return [
+            {
+                'function': function,
+                'file': filename,
+                'line': line,
+                'calls': calls,
+                'tottime': tottime,
+                'cumtime': cumtime,
+            }
+            for (filename, line, function), (_, calls, tottime, cumtime, _) in rows[:limit]
+        ]
+
+    def to_json(self) -> dict[str, Any]:
+        record = {
+            'day': self.day,
+            'part': self.part,
+            'input': self.input,
+            'answer': str(self.answer),
+            'wall': {**self.wall, 'total': sum(self.wall.values())},
+            'peak_memory': self.peak_memory,
+        }
+        if self.profiler is not None:
+            record['solve_profile'] = self.top_functions()
+        if self.sampler is not None:
+            record['solve_samples'] = sum(self.sampler.counts.values())
+        return record
+
+
+def profile_part(
+    day: int,
+    part: str,
+    puzzle_input: Input,
+    cprofile: bool = False,
+    sample_interval: float | None = None,
+) -> Profile:
+    timing = PhaseTracker()
+    answer = timing.run(day, part, puzzle_input)
+
+    profiler = cProfile.Profile() if cprofile else None
+    sampler = None
+    if sample_interval is not None:
+        sampler = StackSampler(sample_interval, get_part(day, part).__code__)
+    tracing = PhaseTracker(trace_memory=True, profiler=profiler, sampler=sampler)
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        with sampler.running() if sampler is not None else contextlib.nullcontext():
+            traced_answer = tracing.run(day, part, puzzle_input)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    if str(traced_answer) != str(answer):
+        raise ValueError(
+            f"Day {day} part {part} gave {answer} and then {traced_answer}")
+
+    return Profile(
+        day=day, part=part, input=puzzle_input.name, answer=answer,
+        wall=timing.wall, peak_memory=tracing.peak,
+        profiler=profiler, sampler=sampler,
+    )
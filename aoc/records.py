@@ -0,0 +1,71 @@
+"""
+Hold lots of records as one numpy array per field, instead of one object each.
+
+    @dataclasses.dataclass(slots=True)
+    class Number:
+        value: int
+        x: int
+
+    class Numbers(Records[Number]):
+        record = Number
+
+    numbers = Numbers(value=values, x=xs)
+    numbers.value                 # The whole column, for vectorised work
+    numbers[3]                    # Number(value=..., x=...)
+    numbers[numbers.value > 10]   # Another Numbers with only those rows
+
+A record object is only made when a single row is indexed or iterated over,
+so a million rows cost a few arrays rather than a million objects.
+Records themselves should be slotted dataclasses,
+so the ones that are made are small too.
+Columns can have more than one dimension,
+in which case each record gets its row of the column as a list.
+"""
+import dataclasses
+from typing import Any, ClassVar, Generic, Iterator, TypeVar
+
+import numpy
+
+Record = TypeVar('Record')
+
+
+class Records(Generic[Record]):
+    __slots__ = ('columns',)
+    record: ClassVar[type]
+
+    def __init__(self, **columns: Any):
+        names = [field.name for field in dataclasses.fields(self.record)]
+        if set(columns) != set(names):
+            raise TypeError(f"{type(self).__name__} needs columns {names}, got {list(columns)}")
+        arrays = {name: numpy.asarray(columns[name]) for name in names}
+        if len({len(array) for array in arrays.values()}) > 1:
+            raise ValueError("Columns are not all the same length")
+        self.columns = arrays
+
+    def __getattr__(self, name: str) -> numpy.ndarray:
+        if name == 'columns':
+            # Not set yet, don't go looking for it in itself
+            raise AttributeError(name)
+        try:
+            return self.columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, numpy.integer)):
+            return self.record(*(column[key].tolist() for column in self.columns.values()))
+        return type(self)(**{name: column[key] for name, column in self.columns.items()})
+
+    def __iter__(self) -> Iterator[Record]:
+        for values in zip(*(column.tolist() for column in self.columns.values())):
+            yield self.record(*values)
+
+    def __repr__(self) -> str:
+        return f'<{type(self).__name__} of {len(self)}>'
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
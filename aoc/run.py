@@ -0,0 +1,300 @@
+"""
+Solve any number of days and parts in a single process.
+
+    $ python -m aoc run 1 2 12 --part two
+    $ python -m aoc run 7 --input - < 07/example.txt
+
+Inputs are read from `NN/input.txt` unless `--input` says otherwise.
+The input path is formatted with the day number,
+so `--input '{day:02d}/example.txt'` runs every day against its example.
+
+Parsed inputs are cached on disk for the days that support it,
+so the second part and any repeat runs skip parsing. See `aoc.cache`.
+
+`--profile`, `--cprofile` and `--collapsed` split each part's time and peak
+memory between parsing and solving, and profile the solve phase.
+See `aoc.profiling`.
+
+Days with a `solve_both` function solve both parts at once when both are run,
+sharing the parsing and any other work the parts have in common.
+Both answers are printed on one line with a single time.
+`--separately` solves the parts one at a time anyway.
+
+`--stream` hands stdin to the part as it arrives instead of reading it all first,
+so a day reading ahead can solve while the input is still being written.
+Only one part can be solved this way. See `aoc.streams`.
+
+`--jobs` runs the parts at once in that many processes instead,
+longest first, printing results as they finish.
+`--timeout` and `--memory-limit` kill any part that goes over them.
+See `aoc.schedule`.
+"""
+import argparse
+import dataclasses
+import json
+import logging
+import pathlib
+import sys
+import time
+from typing import Any
+
+from aoc import cache, memo, parallel, trace
+from aoc.days import DAYS, PARTS, ROOT, get_both, get_part, parse_day
+from aoc.inputs import Input
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INPUT = '{day:02d}/input.txt'
+BOTH = 'both'
+
+
+@dataclasses.dataclass
+class Result:
+    day: int
+    part: str
+    answer: Any
+    elapsed: float
+
+
+def solve(day: int, part: str, puzzle_input: Input) -> Result:
+    """Solve a part, or both parts with `solve_both` when `part` is `BOTH`."""
+    part_fn = get_both(day) if part == BOTH else get_part(day, part)
+    with puzzle_input.open() as stream:
+        start = time.perf_counter()
+        with memo.scope(memo.Scope.RUN):
+            answer = part_fn(stream)
+        elapsed = time.perf_counter() - start
+    memo.log_stats()
+    return Result(day, part, answer, elapsed)
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.1f} µs'
+    if seconds < 1:
+        return f'{seconds * 1e3:.2f} ms'
+    return f'{seconds:.3f} s'
+
+
+def format_result(result: Result) -> str:
+    if result.part == BOTH:
+        return (
+            f'Day {result.day:2d} both parts: {result.answer[0]}, {result.answer[1]} '
+            f'({format_duration(result.elapsed)})'
+        )
+    return (
+        f'Day {result.day:2d} part {result.part}: {result.answer} '
+        f'({format_duration(result.elapsed)})'
+    )
+
+
+def format_bytes(size: int) -> str:
+    for unit in ['B', 'KiB', 'MiB']:
+        if size < 1024:
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GiB'
+
+
+def format_profile(profile) -> str:
+    return (
+        f'Day {profile.day:2d} part {profile.part}: {profile.answer} '
+        f'(parse {format_duration(profile.wall["parse"])}, '
+        f'solve {format_duration(profile.wall["solve"])}; '
+        f'peak parse {format_bytes(profile.peak_memory["parse"])}, '
+        f'solve {format_bytes(profile.peak_memory["solve"])})'
+    )
+
+
+def profile(args: argparse.Namespace, day: int, part: str, puzzle_input: Input):
+    from aoc import profiling
+
+    result = profiling.profile_part(
+        day, part, puzzle_input,
+        cprofile=args.cprofile is not None,
+        sample_interval=args.sample_interval if args.collapsed is not None else None)
+    name = f'day{day:02d}-{part}'
+    if args.cprofile is not None:
+        args.cprofile.mkdir(parents=True, exist_ok=True)
+        result.profiler.dump_stats(args.cprofile / f'{name}.prof')
+    if args.collapsed is not None:
+        args.collapsed.mkdir(parents=True, exist_ok=True)
+        (args.collapsed / f'{name}.collapsed').write_text(result.sampler.collapsed())
+    return result
+
+
+def day_parts(day: int, parts: list[str], together: bool) -> list[str]:
+    """The parts to solve for a day, with both parts at once where the day can."""
+    if not together or sorted(parts) != sorted(PARTS):
+        return list(parts)
+    try:
+        if get_both(day) is not None:
+            return [BOTH]
+    except Exception:
+        # Any problem loading the day is reported when solving each part
+        pass
+    return list(parts)
+
+
+def resolve_input(template: str, day: int) -> Input:
+    path = template.format(day=day)
+    if not path.startswith('/'):
+        path = ROOT / path
+    return Input.from_path(path)
+
+
+def run_scheduled(args: argparse.Namespace, parts: list[str], stdin: Input | None) -> int:
+    from aoc import schedule
+
+    jobs = []
+    for day in args.days:
+        puzzle_input = stdin if stdin is not None else resolve_input(args.input, day)
+        if not puzzle_input.exists():
+            logger.warning("Skipping day %d, %s does not exist", day, puzzle_input.name)
+            continue
+        jobs.extend(schedule.Job(day, part, puzzle_input) for part in parts)
+
+    memory_limit = None if args.memory_limit is None else args.memory_limit * 1024 * 1024
+    start = time.perf_counter()
+    outcomes = []
+    for outcome in schedule.schedule(
+        schedule.longest_first(jobs), args.jobs,
+        timeout=args.timeout, memory_limit=memory_limit,
+    ):
+        outcomes.append(outcome)
+        if outcome.result is not None:
+            print(format_result(outcome.result), flush=True)
+        else:
+            logger.error(
+                "Day %d part %s %s on %s",
+                outcome.job.day, outcome.job.part, outcome.error, outcome.job.input.name)
+    wall = time.perf_counter() - start
+    schedule.record_timings(outcomes, args.timeout)
+
+    if len(jobs) > 1:
+        total = sum(outcome.result.elapsed for outcome in outcomes if outcome.result is not None)
+        print(f'Total: {format_duration(total)}, {format_duration(wall)} wall time')
+    return 1 if any(outcome.error is not None for outcome in outcomes) else 0
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        'days', metavar='DAY', type=parse_day, nargs='*', default=list(DAYS),
+        help="Days to solve. Defaults to every day.")
+    parser.add_argument(
+        '-p', '--part', dest='parts', choices=PARTS, action='append',
+        help="Parts to solve. Can be given more than once. Defaults to both.")
+    parser.add_argument(
+        '-i', '--input', default=DEFAULT_INPUT,
+        help=(
+            "Input file, formatted with the day number, "
+            f"or '-' to read stdin. Defaults to {DEFAULT_INPUT!r}."))
+    parser.add_argument(
+        '--stream', action='store_true',
+        help="With '--input -', solve stdin as it is read. Only one part can be solved.")
+    parser.add_argument(
+        '--no-cache', dest='cache', action='store_false',
+        help="Always parse inputs instead of using the parse cache.")
+    parser.add_argument(
+        '-j', '--workers', type=int, default=parallel.workers,
+        help=(
+            "Worker processes for days that split their input. "
+            "Defaults to the number of CPUs."))
+    parser.add_argument(
+        '--separately', dest='together', action='store_false',
+        help="Solve each part on its own, even for days that can solve both at once.")
+    parser.add_argument(
+        '--trace', action='store_true',
+        help=(
+            "Count and sample events in days that trace their hot paths, "
+            "in a single process. See `aoc.trace`."))
+    parser.add_argument(
+        '--jobs', type=int, metavar='N',
+        help="Run parts at once in N processes, longest first. See `aoc.schedule`.")
+    parser.add_argument(
+        '--timeout', type=float, metavar='SECONDS',
+        help="With --jobs, kill any part that runs longer than this.")
+    parser.add_argument(
+        '--memory-limit', type=int, metavar='MiB',
+        help="With --jobs, kill any part that uses more memory than this.")
+    parser.add_argument(
+        '--profile', type=pathlib.Path, metavar='JSON',
+        help="Split time and peak memory between parsing and solving, and write them to this file.")
+    parser.add_argument(
+        '--cprofile', type=pathlib.Path, metavar='DIRECTORY',
+        help="Save cProfile stats for the solve phase of each part in this directory.")
+    parser.add_argument(
+        '--collapsed', type=pathlib.Path, metavar='DIRECTORY',
+        help="Save sampled solve phase stacks in collapsed format in this directory.")
+    parser.add_argument(
+        '--sample-interval', type=float, default=0.001, metavar='SECONDS',
+        help="CPU time between stack samples for --collapsed. Defaults to 1 ms.")
+
+
+def main(args: argparse.Namespace) -> int:
+    parts = args.parts or PARTS
+    cache.enabled = args.cache
+    parallel.workers = args.workers
+    if args.trace:
+        trace.enable()
+        # Counters in worker processes are never summarised
+        parallel.workers = 1
+    profiling = any(
+        option is not None
+        for option in [args.profile, args.cprofile, args.collapsed])
+    if args.stream:
+        if args.input != '-' or args.jobs is not None or profiling:
+            logger.error("--stream needs '--input -', and can not be used with --jobs or profiling")
+            return 2
+        if len(args.days) != 1 or len(day_parts(args.days[0], parts, args.together)) != 1:
+            logger.error("--stream can only solve one part of one day")
+            return 2
+        stdin = Input.from_stream(sys.stdin, name='<stdin>')
+    else:
+        stdin = Input.from_stdin() if args.input == '-' else None
+    if args.jobs is None and (args.timeout is not None or args.memory_limit is not None):
+        logger.error("--timeout and --memory-limit need --jobs")
+        return 2
+    if args.jobs is not None:
+        if profiling:
+            logger.error("--jobs can not be used with profiling")
+            return 2
+        return run_scheduled(args, parts, stdin)
+
+    total = 0.
+    failed = False
+    profiles = []
+    for day in args.days:
+        puzzle_input = stdin if stdin is not None else resolve_input(args.input, day)
+        if not puzzle_input.exists():
+            logger.warning("Skipping day %d, %s does not exist", day, puzzle_input.name)
+            continue
+        for part in parts if profiling else day_parts(day, parts, args.together):
+            try:
+                if profiling:
+                    result = profile(args, day, part, puzzle_input)
+                else:
+                    result = solve(day, part, puzzle_input)
+            except Exception:
+                logger.exception("Day %d part %s failed on %s", day, part, puzzle_input.name)
+                failed = True
+                continue
+            if profiling:
+                profiles.append(result)
+                total += sum(result.wall.values())
+                print(format_profile(result), flush=True)
+            else:
+                total += result.elapsed
+                print(format_result(result), flush=True)
+
+    if len(args.days) * len(parts) > 1:
+        print(f'Total: {format_duration(total)}')
+    if args.profile is not None:
+        from aoc.bench import metadata
+        with open(args.profile, 'w') as f:
+            json.dump({
+                'metadata': metadata(),
+                'results': [result.to_json() for result in profiles],
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+    return 1 if failed else 0
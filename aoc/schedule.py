@@ -0,0 +1,246 @@
+"""
+Run many parts at once over a pool of processes, longest first.
+
+    $ python -m aoc run --jobs 4
+    $ python -m aoc run --jobs 4 --timeout 10 --memory-limit 2048
+
+Every part runs in a process of its own, forked from the runner,
+so a part that runs too long or uses too much memory
+is killed without losing any of the others.
+The memory limit is on each process's address space, set with `setrlimit`
+after the day is imported, so a part over the limit fails when it next allocates memory.
+
+Parts are started longest first, so the slowest parts are not left
+running on their own at the end while the other workers sit idle.
+How long a part takes comes from its last scheduled run on the same input,
+which is saved in `.cache/timings.json`,
+or else from its median in `baseline.json`.
+Parts that have never been timed are started before all the others,
+as there is no telling how slow they are.
+
+Results are yielded as each part finishes, not in the order they started.
+"""
+import collections
+import dataclasses
+import errno
+import json
+import logging
+import math
+import multiprocessing
+import multiprocessing.connection
+import resource
+import signal
+import time
+import traceback
+from typing import Iterable, Iterator
+
+from aoc import parallel
+from aoc.days import ROOT, get_part
+from aoc.inputs import Input
+from aoc.run import Result, format_bytes, format_duration, solve
+
+logger = logging.getLogger(__name__)
+
+TIMINGS_FILE = ROOT / '.cache' / 'timings.json'
+BASELINE_FILE = ROOT / 'baseline.json'
+
+
+@dataclasses.dataclass
+class Job:
+    day: int
+    part: str
+    input: Input
+    # Seconds the part is expected to take, if it has been timed before
+    estimate: float | None = None
+
+    @property
+    def key(self) -> str:
+        return f'{self.day} {self.part} {self.input.name}'
+
+
+@dataclasses.dataclass
+class Outcome:
+    job: Job
+    result: Result | None = None
+    error: str | None = None
+    # Seconds from starting the process until it finished or was killed
+    wall: float = 0.
+
+
+@dataclasses.dataclass
+class Running:
+    job: Job
+    process: multiprocessing.Process
+    connection: multiprocessing.connection.Connection
+    started: float
+    deadline: float | None
+
+
+def load_timings() -> dict[str, float]:
+    try:
+        with open(TIMINGS_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_timings(timings: dict[str, float]) -> None:
+    TIMINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(TIMINGS_FILE, 'w') as f:
+        json.dump(timings, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_baseline_timings() -> dict[tuple[int, str], float]:
+    try:
+        with open(BASELINE_FILE) as f:
+            results = json.load(f)['results']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return {}
+    return {(result['day'], result['part']): result['median'] for result in results}
+
+
+def longest_first(jobs: Iterable[Job]) -> list[Job]:
+    """
+    Estimate how long each job will take, and sort the longest to the front.
+    Jobs with no estimate go first of all.
+    """
+    timings = load_timings()
+    baseline = load_baseline_timings()
+    jobs = list(jobs)
+    for job in jobs:
+        job.estimate = timings.get(job.key, baseline.get((job.day, job.part)))
+    return sorted(jobs, key=lambda job: -math.inf if job.estimate is None else -job.estimate)
+
+
+def record_timings(outcomes: Iterable[Outcome], timeout: float | None) -> None:
+    timings = load_timings()
+    for outcome in outcomes:
+        if outcome.result is not None:
+            timings[outcome.job.key] = outcome.result.elapsed
+        elif timeout is not None and outcome.wall >= timeout:
+            # It took at least this long, which is enough to start it early next time
+            timings[outcome.job.key] = timeout
+    save_timings(timings)
+
+
+def run_job(
+    job: Job,
+    connection: multiprocessing.connection.Connection,
+    memory_limit: int | None,
+) -> None:
+    # The parts are already spread over every worker, so don't nest pools
+    parallel.workers = 1
+    try:
+        # Import the day before limiting memory, so the limit is on solving
+        get_part(job.day, job.part)
+        if memory_limit is not None:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        message = ('done', solve(job.day, job.part, job.input))
+    except BaseException as error:
+        # Memory mapped allocations fail with an OSError instead
+        if isinstance(error, MemoryError) or getattr(error, 'errno', None) == errno.ENOMEM:
+            if memory_limit is None:
+                message = ('failed', "ran out of memory")
+            else:
+                message = ('failed', f"went over the memory limit of {format_bytes(memory_limit)}")
+        else:
+            message = ('failed', traceback.format_exc())
+    try:
+        connection.send(message)
+    except Exception:
+        # Most likely an answer that can not be pickled
+        connection.send(('failed', traceback.format_exc()))
+    connection.close()
+
+
+def describe_exit(process: multiprocessing.Process) -> str:
+    if process.exitcode is not None and process.exitcode < 0:
+        return f"was killed by {signal.Signals(-process.exitcode).name}"
+    return f"exited with code {process.exitcode}"
+
+
+def start(
+    context: multiprocessing.context.BaseContext,
+    job: Job,
+    timeout: float | None,
+    memory_limit: int | None,
+) -> Running:
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=run_job, args=(job, sender, memory_limit),
+        name=f'day{job.day:02d}-{job.part}', daemon=True)
+    process.start()
+    # Only the child writes, so the receiver sees EOF if it dies
+    sender.close()
+    started = time.monotonic()
+    deadline = None if timeout is None else started + timeout
+    return Running(job, process, receiver, started, deadline)
+
+
+def finish(running: Running) -> Outcome:
+    try:
+        status, value = running.connection.recv()
+    except EOFError:
+        status, value = None, None
+    running.process.join()
+    running.connection.close()
+    wall = time.monotonic() - running.started
+    if status == 'done':
+        return Outcome(running.job, result=value, wall=wall)
+    if status == 'failed':
+        return Outcome(running.job, error=value, wall=wall)
+    return Outcome(running.job, error=describe_exit(running.process), wall=wall)
+
+
+def kill(running: Running) -> None:
+    running.process.kill()
+    running.process.join()
+    running.connection.close()
+
+
+def schedule(
+    jobs: Iterable[Job],
+    workers: int,
+    timeout: float | None = None,
+    memory_limit: int | None = None,
+) -> Iterator[Outcome]:
+    """
+    Run each job in its own process, at most `workers` at a time,
+    in the order given. Outcomes are yielded as the jobs finish.
+    `memory_limit` is in bytes.
+    """
+    # Forked workers start instantly with everything the runner has imported
+    context = multiprocessing.get_context('fork')
+    pending = collections.deque(jobs)
+    running: list[Running] = []
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                job = pending.popleft()
+                logger.debug("Starting day %d part %s, estimated %s", job.day, job.part, job.estimate)
+                running.append(start(context, job, timeout, memory_limit))
+
+            wait = None
+            if timeout is not None:
+                wait = max(0., min(item.deadline for item in running) - time.monotonic())
+            ready = set(multiprocessing.connection.wait(
+                [item.connection for item in running]
+                + [item.process.sentinel for item in running],
+                timeout=wait))
+
+            now = time.monotonic()
+            for item in list(running):
+                if item.connection in ready or item.process.sentinel in ready:
+                    running.remove(item)
+                    yield finish(item)
+                elif item.deadline is not None and now >= item.deadline:
+                    running.remove(item)
+                    kill(item)
+                    yield Outcome(
+                        item.job, error=f"timed out after {format_duration(timeout)}",
+                        wall=now - item.started)
+    finally:
+        # Don't leave anything running if the caller stops early
+        for item in running:
+            kill(item)
@@ -0,0 +1,103 @@
+"""
+Run a solver daemon that keeps numpy and every day module imported.
+
+    $ python -m aoc serve &
+    $ python -m aoc.client 12 two < 12/input.txt
+
+The daemon listens on a Unix socket and solves one request at a time,
+so repeated solves only cost the solving.
+The socket is `$AOC_SOCKET`, or `aoc-<uid>.sock` in `$XDG_RUNTIME_DIR` or `/tmp`.
+Stop it with `python -m aoc.client --stop` or an interrupt.
+See `aoc.client` for the protocol.
+"""
+import argparse
+import logging
+import os
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+
+from aoc.client import default_socket_path, recv_message, send_message
+from aoc.days import DAYS, PARTS, load_module
+from aoc.inputs import Input
+from aoc.run import solve
+
+logger = logging.getLogger(__name__)
+
+
+class SolveHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        try:
+            header, payload = recv_message(self.request)
+        except (ConnectionError, ValueError):
+            logger.warning("Dropping malformed request")
+            return
+
+        command = header.get('command')
+        if command == 'stop':
+            send_message(self.request, {'stopping': True})
+            # shutdown() waits for serve_forever() to return,
+            # which can not happen while this handler is running
+            threading.Thread(target=self.server.shutdown).start()
+            return
+        if command != 'solve':
+            send_message(self.request, {'error': f"Unknown command {command!r}\n"})
+            return
+
+        day, part = header.get('day'), header.get('part')
+        if day not in DAYS or part not in PARTS:
+            send_message(self.request, {'error': f"Unknown day {day!r} part {part!r}\n"})
+            return
+
+        puzzle_input = Input.from_bytes(payload, name='<client>')
+        try:
+            result = solve(day, part, puzzle_input)
+        except Exception:
+            logger.exception("Day %d part %s failed", day, part)
+            send_message(self.request, {'error': traceback.format_exc()})
+            return
+        logger.info("Day %d part %s: %s (%.6f s)", day, part, result.answer, result.elapsed)
+        send_message(self.request, {'answer': str(result.answer), 'elapsed': result.elapsed})
+
+
+def preload() -> None:
+    import numpy  # noqa: F401
+    for day in DAYS:
+        try:
+            load_module(day)
+        except Exception:
+            logger.exception("Could not import day %d", day)
+
+
+def remove_stale_socket(path: str) -> None:
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise SystemExit(f"A solver daemon is already listening on {path}")
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--socket', default=default_socket_path(),
+        help="Socket path to listen on. Defaults to %(default)s.")
+
+
+def main(args: argparse.Namespace) -> int:
+    preload()
+    remove_stale_socket(args.socket)
+    with socketserver.UnixStreamServer(args.socket, SolveHandler) as server:
+        print(f"Listening on {args.socket}", file=sys.stderr, flush=True)
+        try:
+            server.serve_forever(poll_interval=0.1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(args.socket)
+    return 0
@@ -0,0 +1,107 @@
+"""
+Read pipes ahead on a background thread, so reading and solving overlap.
+
+    $ generate-input | python -m aoc run 9 --input - --part one --stream
+
+Files are memory mapped and in-memory inputs are already read,
+but a pipe only has what its writer has written so far.
+Solving a pipe line by line leaves the CPU idle while waiting for input,
+and reading it all up front leaves the pipe idle while solving.
+
+`read_blocks(stream)` starts a thread that reads `BLOCK_SIZE` bytes at a time
+in to a queue of at most `BUFFERS` blocks, and yields the blocks cut at the last newline,
+carrying any partial line over to the next block.
+The reader waits whenever the queue is full,
+so at most a few blocks are held in memory however long the input is.
+`read_lines(stream)` yields the lines of those blocks.
+
+`buffers(stream)` is for days that parse whole buffers with numpy:
+pipes come in blocks, anything else comes as one buffer of the whole input.
+Days that work a block at a time solve pipes as they are read,
+and everything else exactly as before.
+"""
+import io
+import os
+import queue
+import stat
+import threading
+from typing import BinaryIO, Iterator
+
+BLOCK_SIZE = 1024 * 1024
+BUFFERS = 4
+
+
+def pipelined(stream: io.TextIOBase) -> bool:
+    """Whether a stream is worth reading ahead: anything backed by a file descriptor but not a file."""
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+    return not stat.S_ISREG(os.fstat(fd).st_mode)
+
+
+def read_ahead(source: BinaryIO, blocks: queue.Queue, stop: threading.Event, block_size: int) -> None:
+    try:
+        while not stop.is_set():
+            block = source.read(block_size)
+            blocks.put(block)
+            if not block:
+                return
+    except BaseException as error:
+        blocks.put(error)
+
+
+def read_blocks(
+    stream: io.TextIOBase,
+    block_size: int = BLOCK_SIZE,
+    buffers: int = BUFFERS,
+) -> Iterator[bytes]:
+    """Blocks of whole lines from a stream, read ahead on a background thread."""
+    source = getattr(stream, 'buffer', stream)
+    blocks = queue.Queue(maxsize=buffers)
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=read_ahead, args=(source, blocks, stop, block_size),
+        name='aoc-read-ahead', daemon=True)
+    reader.start()
+
+    carry = b''
+    try:
+        while True:
+            block = blocks.get()
+            if isinstance(block, BaseException):
+                raise block
+            if not block:
+                break
+            end = block.rfind(b'\n') + 1
+            if end == 0:
+                carry += block
+                continue
+            yield carry + block[:end]
+            carry = block[end:]
+        if carry:
+            yield carry
+    finally:
+        # Free up the queue so a reader stuck on a full queue sees it should stop.
+        # A reader waiting on the pipe itself is a daemon, and left to it.
+        stop.set()
+        while not blocks.empty():
+            blocks.get_nowait()
+
+
+def read_lines(stream: io.TextIOBase) -> Iterator[str]:
+    """Lines of a stream, read ahead on a background thread."""
+    for block in read_blocks(stream):
+        # Newlines never appear inside a multi-byte character,
+        # so every block decodes on its own
+        yield from block.decode().splitlines(keepends=True)
+
+
+def buffers(stream: io.TextIOBase) -> Iterator[bytes | memoryview]:
+    """Blocks of whole lines for pipes, or one buffer of the whole input for anything else."""
+    if pipelined(stream):
+        yield from read_blocks(stream)
+    else:
+        # Days reading lines shouldn't need numpy, which aoc.grid imports
+        from aoc.grid import read_buffer
+        yield read_buffer(stream)
@@ -0,0 +1,91 @@
+"""
+Count and sample what hot code is doing, at no cost when tracing is off.
+
+    $ python -m aoc run 12 --trace
+    $ AOC_TRACE=day05 python -m aoc bench 5
+
+Tracing is decided once, when a day is imported.
+Days keep the answer in a module constant and guard every call with it:
+
+    TRACING = trace.active(__name__)
+
+    def recurse(...):
+        if TRACING:
+            trace.count('recursions')
+            trace.event('recurse', "Fitting %s in %s", count, chunk)
+
+When tracing is off the guarded block is never entered,
+so no arguments are built and no functions are called,
+unlike a `logger.debug` call, which does both on every pass.
+
+`count(name)` adds to a named counter.
+`event(name, message, *args)` counts an event,
+and logs the first of every `sample_every` events with that name.
+A summary of every counter and event is logged when the process exits.
+
+`AOC_TRACE` is a comma separated list of module names to trace,
+or `all` to trace everything.
+`run --trace` sets it, so worker processes trace the same modules,
+but only the main process has its counters summarised.
+"""
+import atexit
+import collections
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+ENVIRONMENT_VARIABLE = 'AOC_TRACE'
+
+# Log one in this many events of each name
+sample_every = 1000
+
+counters: collections.Counter[str] = collections.Counter()
+events: collections.Counter[str] = collections.Counter()
+_modules: set[str] = set()
+_summary_registered = False
+
+
+def enable(modules: str = 'all') -> None:
+    """
+    Trace these modules from now on.
+    Only modules imported afterwards see the change.
+    """
+    global _summary_registered
+    _modules.update(name.strip() for name in modules.split(',') if name.strip())
+    os.environ[ENVIRONMENT_VARIABLE] = ','.join(sorted(_modules))
+    # Traces are asked for explicitly, so show them without needing -v
+    logger.setLevel(logging.INFO)
+    if not _summary_registered:
+        atexit.register(log_summary)
+        _summary_registered = True
+
+
+def active(module: str) -> bool:
+    return 'all' in _modules or module in _modules
+
+
+def count(name: str, amount: int = 1) -> None:
+    counters[name] += amount
+
+
+def event(name: str, message: str, *args) -> None:
+    events[name] += 1
+    if events[name] % sample_every == 1 or sample_every == 1:
+        logger.info("%s #%d: " + message, name, events[name], *args)
+
+
+def log_summary() -> None:
+    for name, value in sorted(counters.items()):
+        logger.info("Counter %s: %d", name, value)
+    for name, value in sorted(events.items()):
+        logger.info("Event %s: %d, %d logged", name, value, (value + sample_every - 1) // sample_every)
+
+
+def reset() -> None:
+    counters.clear()
+    events.clear()
+
+
+if os.environ.get(ENVIRONMENT_VARIABLE):
+    enable(os.environ[ENVIRONMENT_VARIABLE])
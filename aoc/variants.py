@@ -0,0 +1,51 @@
+"""
+Register alternative solutions for a part, to compare against the default.
+
+Decorate any function with the same signature as a part:
+
+    @variant('two', 'brute-force')
+    def part_two_brute_force(stream: io.TextIOBase): ...
+
+`part_one` and `part_two` stay the solutions used by `run`.
+They can be decorated too, to give them a name in comparisons.
+Slow but obviously correct variants make good reference answers
+for checking faster solutions against.
+
+    $ python -m aoc bench 5 --variants
+"""
+from typing import Callable
+
+from aoc.days import PARTS, Part, get_part, load_module
+
+DEFAULT = 'default'
+
+# module name -> part -> variant name -> function
+_registry: dict[str, dict[str, dict[str, Part]]] = {}
+
+
+def variant(part: str, name: str) -> Callable[[Part], Part]:
+    if part not in PARTS:
+        raise ValueError(f"Unknown part {part!r}, expected one of {PARTS}")
+
+    def decorator(fn: Part) -> Part:
+        part_variants = _registry.setdefault(fn.__module__, {}).setdefault(part, {})
+        if name in part_variants:
+            raise ValueError(f"Variant {name!r} of part {part} is already registered")
+        part_variants[name] = fn
+        return fn
+    return decorator
+
+
+def get_variants(day: int, part: str) -> dict[str, Part]:
+    """
+    All variants of a part, by name.
+    The default solution is always included, and always first.
+    """
+    default = get_part(day, part)
+    registered = _registry.get(load_module(day).__name__, {}).get(part, {})
+    default_name = next(
+        (name for name, fn in registered.items() if fn is default), DEFAULT)
+    return {
+        default_name: default,
+        **{name: fn for name, fn in registered.items() if fn is not default},
+    }